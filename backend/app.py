@@ -1,30 +1,62 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from pymongo import MongoClient
 from dotenv import load_dotenv
 import os
 
 # 1. Load environment variables from .env file
 load_dotenv()
 
+# Local modules read their settings from the environment, so import them after .env is loaded
+from utils.llm_cache import llm_cache
+from utils.prefetch import question_prefetcher
+from utils.question_bank import question_bank
+from utils.session_store import session_store
+from utils.resume_digest import resume_digest_cache
+from utils.user_store import UserStore, connect
+from utils.judgment import judgment_service
+from utils.behavior import behavior_store, parse_observations
+from ollama_client import ollama_service
+from routes.interview import interview_bp
+from routes.resume_score import resume_bp
+
 app = Flask(__name__)
 CORS(app)
 
+# Interview & resume endpoints are async views (needs `flask[async]`). Each one
+# runs on its own event loop, so Mistral (utils/ai_client.py) and Ollama calls
+# are handed to clients that live on the shared background loop
+# (utils/background_loop.py) for the life of the worker.
+ollama_service.init_app(app)
+app.register_blueprint(interview_bp, url_prefix='/api/interview')
+app.register_blueprint(resume_bp, url_prefix='/api/resume')
+
 # 2. Connect to MongoDB Cloud
 try:
     mongo_uri = os.getenv('MONGO_URI')
-    client = MongoClient(mongo_uri)
-    # Ping the database to check connection
-    client.admin.command('ping')
-    print("✅ Successfully connected to MongoDB!")
+    # Pooled client (MONGO_MAX_POOL_SIZE etc.); `mongomock://` is the in-memory stand-in
+    client = connect(mongo_uri)
+    if mongo_uri and mongo_uri.startswith('mongomock://'):
+        print("🧪 Using in-memory mongomock database")
+    else:
+        # Ping the database to check connection
+        client.admin.command('ping')
+        print("✅ Successfully connected to MongoDB!")
     
     db_name = os.getenv('DB_NAME', 'prep_ai_db')
     db = client[db_name]
-    users_collection = db['users']
+    user_store = UserStore(db['users'])
+    user_store.ensure_indexes()
 
 except Exception as e:
     print("❌ Failed to connect to MongoDB:", e)
 
+# 3. Load the judgment model once per worker (memory-mapped), not on the first request
+try:
+    if judgment_service.available():
+        judgment_service.load()
+except Exception as e:
+    print("❌ Failed to load judgment model:", e)
+
 @app.route('/api/signup', methods=['POST'])
 def signup():
     data = request.json
@@ -34,18 +66,9 @@ def signup():
     if not username or not password:
         return jsonify({"error": "Username and password required"}), 400
 
-    # Check if user already exists in MongoDB
-    if users_collection.find_one({"email": username}):
+    # Insert new user; the unique email index rejects existing users atomically
+    if not user_store.create_user(username, password):
         return jsonify({"error": "User already exists"}), 409
-
-    # Insert new user
-    new_user = {
-        "email": username,
-        "password": password, # In a real app, you should Hash this!
-        "role": "candidate",
-        "createdAt": "today" 
-    }
-    users_collection.insert_one(new_user)
     
     return jsonify({"message": "User created successfully"}), 201
 
@@ -58,10 +81,8 @@ def login():
     if not username or not password:
         return jsonify({"error": "Username and password required"}), 400
 
-    # Find user in MongoDB
-    user = users_collection.find_one({"email": username})
-
-    if user and user['password'] == password:
+    # Check the password against MongoDB (or the login cache)
+    if user_store.verify_login(username, password):
         return jsonify({
             "message": "Login successful",
             "user": {
@@ -72,6 +93,78 @@ def login():
     else:
         return jsonify({"error": "Invalid credentials"}), 401
 
+@app.route('/api/behavior', methods=['POST'])
+def record_behavior():
+    """
+    Feeds a session's rolling aggregates: `observations` is a list of
+    {timestamp, blinking?, posture?, nervousness?}. Returns the current features.
+    """
+    data = request.json or {}
+    session_id = data.get('session_id')
+    if not session_id:
+        return jsonify({"error": "session_id required"}), 400
+    # The whole batch is checked first, so a bad entry records none of it
+    try:
+        observations = parse_observations(data.get('observations', []))
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid observation: {e}"}), 400
+    behavior = behavior_store.get(session_id)
+    for observation in observations:
+        behavior.observe(*observation)
+    return jsonify({"features": behavior.features(), **behavior.snapshot()}), 200
+
+@app.route('/api/judgment', methods=['POST'])
+async def judge_nervousness():
+    """
+    Nervousness probability from session averages; concurrent calls are micro-batched.
+    Send the three features, or just `session_id` to use its rolling aggregates.
+    """
+    data = request.json or {}
+    if 'avg_blinks' not in data and data.get('session_id'):
+        behavior = behavior_store.get(data['session_id'], create=False)
+        if behavior is None:
+            return jsonify({"error": "No behavior recorded for this session"}), 404
+        data = behavior.features()
+    if not judgment_service.available():
+        return jsonify({"error": "Judgment model not available"}), 503
+    try:
+        probability = await judgment_service.predict_async(data)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"error": f"Invalid features: {e}"}), 400
+    return jsonify({"nervous_probability": round(probability, 4), "is_nervous": probability >= 0.5}), 200
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(llm_cache.stats()), 200
+
+@app.route('/api/prefetch/stats', methods=['GET'])
+def prefetch_stats():
+    return jsonify(question_prefetcher.stats()), 200
+
+@app.route('/api/question-bank/stats', methods=['GET'])
+def question_bank_stats():
+    return jsonify(question_bank.stats()), 200
+
+@app.route('/api/users/stats', methods=['GET'])
+def user_store_stats():
+    return jsonify(user_store.stats()), 200
+
+@app.route('/api/sessions/stats', methods=['GET'])
+def session_store_stats():
+    return jsonify(session_store.stats()), 200
+
+@app.route('/api/resume-digest/stats', methods=['GET'])
+def resume_digest_stats():
+    return jsonify(resume_digest_cache.stats()), 200
+
+@app.route('/api/judgment/stats', methods=['GET'])
+def judgment_stats():
+    return jsonify(judgment_service.stats()), 200
+
+@app.route('/api/behavior/stats', methods=['GET'])
+def behavior_stats():
+    return jsonify(behavior_store.stats()), 200
+
 @app.route('/api/test', methods=['GET'])
 def test_connection():
     return jsonify({"message": "Backend is running with MongoDB!"}), 200
@@ -1,20 +1,104 @@
+import asyncio
+import atexit
 import httpx
 import json
 import logging
+import os
+from utils.llm_cache import llm_cache
+from utils.background_loop import background_loop
+from utils.ats_scorer import lexical_response, needs_llm, prescore
+from utils.session_store import render_history
+from utils.resume_digest import condense_resume
 
 # Configure Logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# --- Transport settings (override via environment) ---
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "4"))
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "20"))
+OLLAMA_MAX_KEEPALIVE = int(os.getenv("OLLAMA_MAX_KEEPALIVE", "10"))
+OLLAMA_KEEPALIVE_EXPIRY = float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY", "60"))
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "30"))
+
 class OllamaClient:
-    def __init__(self, base_url="http://localhost:11434", model="llama3"):
+    def __init__(self, base_url=OLLAMA_BASE_URL, model=OLLAMA_MODEL,
+                 max_concurrency=OLLAMA_MAX_CONCURRENCY,
+                 max_connections=OLLAMA_MAX_CONNECTIONS,
+                 max_keepalive=OLLAMA_MAX_KEEPALIVE,
+                 keepalive_expiry=OLLAMA_KEEPALIVE_EXPIRY,
+                 timeout=OLLAMA_TIMEOUT,
+                 transport=None):
         """
         Initialize the Ollama Client.
         Ensure you have Ollama running: `ollama run llama3`
+
+        One pooled, keep-alive `httpx.AsyncClient` and one semaphore serve
+        the whole process. Both live on the shared background event loop
+        (utils/background_loop.py), since Flask runs every async view on a
+        fresh loop and an asyncio client cannot move between loops; the
+        public coroutines can be awaited from any loop.
+        `max_concurrency` caps how many generations are in flight at once.
+        `transport` lets tests plug in a stand-in server (see utils/mock_llm.py).
         """
         self.base_url = f"{base_url}/api/generate"
         self.model = model
         self.headers = {"Content-Type": "application/json"}
+        self.max_concurrency = max_concurrency
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        self.transport = transport
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+    def init_app(self, app):
+        """
+        Ties the pool to the app's process: closed at exit. It opens on the
+        first request rather than here, so workers forked from a preloaded
+        app each get their own.
+        """
+        atexit.register(self.shutdown)
+
+    def startup(self):
+        """Opens the shared connection pool. Safe to call more than once; requests open it on demand."""
+        background_loop.run(self._open())
+
+    def shutdown(self):
+        """Closes the shared connection pool."""
+        if self._client is not None:
+            background_loop.run(self._close())
+
+    async def _open(self):
+        # Runs on the background loop
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._loop = loop  # a forked worker starts a new background loop
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                limits=self.limits,
+                timeout=self.timeout,
+                transport=self.transport,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            logger.info(
+                f"Ollama pool opened (max_connections={self.limits.max_connections}, "
+                f"max_concurrency={self.max_concurrency})"
+            )
+        return self._client, self._semaphore
+
+    async def _close(self):
+        # Runs on the background loop
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Ollama pool closed")
+        self._client = None
 
     async def _send_request(self, prompt: str, json_mode: bool = False):
         """
@@ -29,25 +113,85 @@ class OllamaClient:
         if json_mode:
             payload["format"] = "json"
 
-        async with httpx.AsyncClient() as client:
+        cache_key = llm_cache.make_key(self.model, prompt, payload.get("format"))
+        cached = llm_cache.get(cache_key, "ollama")
+        if cached is not None:
+            return cached
+
+        result = await background_loop.call(self._generate(payload))
+        if result:
+            llm_cache.set(cache_key, result, "ollama")
+        return result
+
+    async def _generate(self, payload):
+        # Runs on the background loop
+        client, semaphore = await self._open()
+        async with semaphore:
             try:
-                response = await client.post(
-                    self.base_url, 
-                    json=payload, 
-                    timeout=30.0
-                )
+                response = await client.post(self.base_url, json=payload)
                 response.raise_for_status()
-                data = response.json()
-                return data.get("response", "")
+                return response.json().get("response", "")
             except Exception as e:
                 logger.error(f"Ollama Connection Error: {e}")
                 return None
 
+    async def _stream_request(self, prompt: str, json_mode: bool = False):
+        """
+        Streaming variant of `_send_request`.
+        Yields response tokens as Ollama produces them.
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+        }
+
+        if json_mode:
+            payload["format"] = "json"
+
+        async for token in background_loop.iterate(self._stream_tokens(payload)):
+            yield token
+
+    async def _stream_tokens(self, payload):
+        # Runs on the background loop
+        client, semaphore = await self._open()
+        async with semaphore:
+            try:
+                async with client.stream("POST", self.base_url, json=payload) as response:
+                    response.raise_for_status()
+                    # Ollama streams one JSON object per line
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        token = chunk.get("response", "")
+                        if token:
+                            yield token
+                        if chunk.get("done"):
+                            break
+            except Exception as e:
+                logger.error(f"Ollama Stream Error: {e}")
+
     async def generate_question(self, role: str, experience: str, history: list):
         """
         Generates the next interview question based on chat history.
         """
-        context_str = "\n".join([f"Q: {h['q']}\nA: {h['a']}" for h in history])
+        prompt = self._question_prompt(role, experience, history)
+        response = await self._send_request(prompt)
+        return response.strip() if response else "Tell me about your experience with this role."
+
+    async def stream_question(self, role: str, experience: str, history: list):
+        """
+        Same as `generate_question`, but yields the question token by token
+        so the voice interview can start speaking before generation ends.
+        """
+        prompt = self._question_prompt(role, experience, history)
+        async for token in self._stream_request(prompt):
+            yield token
+
+    def _question_prompt(self, role: str, experience: str, history: list):
+        # Rolling summary + last few turns, so the prompt stays bounded
+        context_str = render_history(history)
         
         prompt = f"""
         You are a strict technical interviewer engaging in a voice interview.
@@ -62,8 +206,7 @@ class OllamaClient:
         Do not include "Here is a question" or polite filler. Just the question.
         """
         
-        response = await self._send_request(prompt)
-        return response.strip() if response else "Tell me about your experience with this role."
+        return prompt
 
     async def analyze_answer(self, question: str, answer: str):
         """
@@ -101,12 +244,17 @@ class OllamaClient:
     async def parse_resume(self, resume_text: str, job_role: str):
         """
         ATS Logic: Scores a resume against a job role.
+        The lexical pre-score answers directly unless it is ambiguous.
         """
+        pre = prescore(resume_text, job_role)
+        if not needs_llm(pre):
+            return lexical_response(pre)
+
         prompt = f"""
         Act as an ATS (Applicant Tracking System) expert.
         Job Role: {job_role}
         Resume Text:
-        {resume_text[:3000]}  # Truncate to avoid context limit if necessary
+        {condense_resume(resume_text)}
         
         Return ONLY a JSON object with this exact structure:
         {{
@@ -121,7 +269,10 @@ class OllamaClient:
         response = await self._send_request(prompt, json_mode=True)
         
         try:
-            return json.loads(response)
+            result = json.loads(response)
+            result.setdefault("missing_keywords", pre["missing_keywords"])
+            result["lexical_score"] = pre["score"]
+            return result
         except Exception:
             return {
                 "score": 50,
@@ -132,4 +283,8 @@ class OllamaClient:
             }
 
 # Singleton instance for import
-ollama_service = OllamaClient()
\ No newline at end of file
+if os.getenv("LLM_BACKEND") == "mock":
+    from utils.mock_llm import mock_ollama_transport
+    ollama_service = OllamaClient(transport=mock_ollama_transport())
+else:
+    ollama_service = OllamaClient()
\ No newline at end of file
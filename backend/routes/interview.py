@@ -1,15 +1,51 @@
 import os
 import json
-from flask import Blueprint, request, jsonify
-from utils.ai_client import client, MODEL_NAME
+import asyncio
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from utils.ai_client import client, MODEL_NAME, chat_complete, chat_complete_async
+from utils.json_stream import IncrementalJSONParser, sse_event
+from utils.prefetch import question_prefetcher
+from utils.question_bank import question_bank, difficulty_from_intensity
+from utils.session_store import session_store
+from utils.resume_digest import RESUME_FOLLOWUP_TOKENS, condense_resume
 
 # --- 1. INITIALIZE BLUEPRINT ---
 interview_bp = Blueprint('interview', __name__)
 
-# --- 2. DSA QUESTION BANK (Fallback) ---
+# --- 2. QUESTION BANK ---
+# Pre-generated questions (scripts/build_question_bank.py) are served before
+# asking the model. Resume-tailored verbal questions always go to the model.
+def bank_params(data):
+    focus = data.get('focus', 'Technical')
+    if data.get('resume_context') and focus != 'Coding':
+        return None
+    return {
+        'role': data.get('role', 'Software Engineer'),
+        'experience': data.get('experience', '0-2 Years'),
+        'focus': focus,
+        'difficulty': data.get('difficulty') or difficulty_from_intensity(data.get('intensity')),
+    }
+
+def remember_generated_question(data, bank, question):
+    # LLM fallbacks refill the bucket that ran dry and count as seen for the session
+    question_bank.mark_seen(data.get('session_id'), question)
+    if bank and question.get('title'):
+        question_bank.add(question, bank['role'], bank['experience'], bank['focus'], bank['difficulty'] or 'medium')
+
 @interview_bp.route('/dsa', methods=['GET'])
 def get_dsa_question():
     difficulty = request.args.get('difficulty', 'easy').lower()
+    question = question_bank.draw(
+        request.args.get('role', 'Software Engineer'),
+        request.args.get('experience', '0-2 Years'),
+        'Coding',
+        difficulty,
+        session_key=request.args.get('session_id'),
+    )
+    if question:
+        return jsonify(question)
+
+    # Fallback when the bank has nothing for this bucket
     questions = {
         "easy": {"title": "Two Sum", "description": "Given an array of integers, return indices...", "input_format": "nums = [2,7]", "output_format": "[0,1]"},
         "medium": {"title": "Longest Substring", "description": "Find the length...", "input_format": "s = 'abc'", "output_format": "3"},
@@ -18,12 +54,7 @@ def get_dsa_question():
     return jsonify(questions.get(difficulty, questions['easy']))
 
 # --- 3. INITIATE SESSION (Handles both Voice & Coding Setup) ---
-@interview_bp.route('/initiate', methods=['POST'])
-def initiate_session():
-    print("------------------------------------------------")
-    print("🟢 INITIATE SESSION HIT")
-    
-    data = request.json
+def build_initiate_prompt(data):
     role = data.get('role', 'Software Engineer')
     experience = data.get('experience', '0-2 Years')
     focus = data.get('focus', 'Technical') 
@@ -37,7 +68,7 @@ def initiate_session():
         # Prompt for Coding Round
         prompt = f"""
         Act as a Coding Interviewer. Start a coding session for a {role} ({experience}).
-        Resume Context: "{resume_context[:2000]}"
+        Resume Context: "{resume_context}"
         
         Generate the FIRST coding problem.
         It must include clear Input/Output formats.
@@ -54,7 +85,7 @@ def initiate_session():
         # Prompt for Voice/Technical Interview
         prompt = f"""
         Act as a Technical Interviewer. Start a {focus} interview for a {role} with {experience} experience.
-        Resume Context: "{resume_context[:2500]}"
+        Resume Context: "{resume_context}"
         
         Based on the resume, generate the FIRST verbal interview question.
         
@@ -66,28 +97,42 @@ def initiate_session():
             "output_format": "N/A"
         }}
         """
+    return prompt
+
+@interview_bp.route('/initiate', methods=['POST'])
+async def initiate_session():
+    print("------------------------------------------------")
+    print("🟢 INITIATE SESSION HIT")
+    
+    # The session keeps role / experience / focus / resume context from here on
+    data = request_data()
+    data['session_id'] = session_store.start(data)
+    bank = bank_params(data)
+    if bank:
+        question = question_bank.draw(**bank, session_key=data.get('session_id'))
+        if question:
+            print("⚡ QUESTION BANK HIT")
+            prefetch_next_question(data, question.get('title', ''))
+            return jsonify(serve_question(data, question))
+
+    prompt = build_initiate_prompt(data)
     
     try:
-        chat_response = client.chat.complete(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
-        )
-        
-        content = chat_response.choices[0].message.content.replace('```json', '').replace('```', '')
-        return jsonify(json.loads(content))
+        content = await chat_complete_async(prompt, endpoint='initiate')
+        content = content.replace('```json', '').replace('```', '')
+        question = json.loads(content)
+        remember_generated_question(data, bank, question)
+
+        # Start on question 2 while the candidate works on question 1
+        prefetch_next_question(data, question.get('title', ''))
+        return jsonify(serve_question(data, question))
 
     except Exception as e:
         print(f"❌ INIT ERROR: {e}")
         return jsonify({"error": "Failed to start session"}), 500
 
 # --- 4. SUBMIT ANSWER (Handles both Verbal & Code) ---
-@interview_bp.route('/submit', methods=['POST'])
-def submit_code():
-    print("------------------------------------------------")
-    print("🟢 SUBMIT HIT")
-    
-    data = request.json
+def build_submit_prompt(data):
     answer = data.get('code', '')
     question_title = data.get('question_title', 'Unknown Question')
     mode = data.get('mode', 'code') # 'verbal' or 'code'
@@ -140,33 +185,42 @@ def submit_code():
             "feedback": "Short feedback on logic, bugs, and edge cases."
         }}
         """
+    return prompt
+
+@interview_bp.route('/submit', methods=['POST'])
+async def submit_code():
+    print("------------------------------------------------")
+    print("🟢 SUBMIT HIT")
+    
+    # History is resolved before this answer is recorded: the prompt shows it once, as the submission
+    data = request_data()
+    prompt = build_submit_prompt(data)
+
+    # Clients with a session (or that send their config) get the next question prefetched
+    # in parallel with this review
+    if 'role' in data:
+        next_data = dict(data)
+        next_data.setdefault('focus', 'Coding' if data.get('mode', 'code') == 'code' else 'Technical')
+        prefetch_next_question(next_data, data.get('question_title', 'Unknown Question'))
     
     try:
-        chat_response = client.chat.complete(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
-        )
-        
-        content = chat_response.choices[0].message.content.replace('```json', '').replace('```', '')
-        return jsonify({"success": True, "review": json.loads(content)})
+        content = await chat_complete_async(prompt, endpoint='submit')
+        content = content.replace('```json', '').replace('```', '')
+        review = json.loads(content)
+        return jsonify(record_review(data, review))
 
     except Exception as e:
         print(f"❌ SUBMIT ERROR: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 # --- 5. NEXT QUESTION (Dynamic Logic) ---
-@interview_bp.route('/next-question', methods=['POST'])
-def get_next_question():
-    print("------------------------------------------------")
-    print("🟢 NEXT QUESTION HIT")
-    data = request.json
-    
+def build_next_question_prompt(data):
     role = data.get('role', 'Software Engineer')
     experience = data.get('experience', '0-2 Years')
     focus = data.get('focus', 'Technical')
     current_question = data.get('current_question', '')
     resume_context = data.get('resume_context', '')
+    history = history_block(data)
 
     print(f"Generating next for Focus: {focus}")
 
@@ -175,7 +229,7 @@ def get_next_question():
         prompt = f"""
         Act as a Coding Interviewer.
         The candidate just solved: "{current_question}".
-        
+        {history}
         Generate a NEW, DIFFERENT coding problem suitable for {experience} level.
         Do NOT repeat the previous concept.
         
@@ -196,9 +250,9 @@ def get_next_question():
         Experience: {experience}
         
         The candidate just answered: "{current_question}".
-        
+        {history}
         Generate the NEXT distinct verbal interview question based on resume context: 
-        "{resume_context[:1000]}"
+        "{condense_resume(resume_context, RESUME_FOLLOWUP_TOKENS)}"
         
         Return ONLY valid JSON:
         {{
@@ -208,16 +262,333 @@ def get_next_question():
             "output_format": "N/A"
         }}
         """
+    return prompt
+
+@interview_bp.route('/next-question', methods=['POST'])
+async def get_next_question():
+    print("------------------------------------------------")
+    print("🟢 NEXT QUESTION HIT")
     
-    try:
-        chat_response = client.chat.complete(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
+    data = request_data()
+    bank = bank_params(data)
+    if bank:
+        question = question_bank.draw(
+            **bank, session_key=data.get('session_id'), exclude=[data.get('current_question', '')]
         )
-        content = chat_response.choices[0].message.content.replace('```json', '').replace('```', '')
-        return jsonify(json.loads(content))
+        if question:
+            print("⚡ QUESTION BANK HIT")
+            return jsonify(serve_question(data, question))
+
+    prompt = build_next_question_prompt(data)
+    match = prefetch_match(data)
+    prefetched = question_prefetcher.take(prefetch_session_key(data, match), match)
+    
+    try:
+        content = None
+        if prefetched is not None:
+            try:
+                content = await asyncio.wrap_future(prefetched)
+                print("⚡ PREFETCH HIT")
+            except Exception as e:
+                print(f"⚠️ PREFETCH FAILED, generating live: {e}")
+
+        if content is None:
+            content = await chat_complete_async(prompt, endpoint='next_question')
+        content = content.replace('```json', '').replace('```', '')
+        question = json.loads(content)
+        remember_generated_question(data, bank, question)
+        return jsonify(serve_question(data, question))
 
     except Exception as e:
         print(f"❌ NEXT Q ERROR: {e}")
-        return jsonify({"error": "Failed to generate next question"}), 500
\ No newline at end of file
+        return jsonify({"error": "Failed to generate next question"}), 500
+
+# --- 6. COMBINED TURN (Review + Next Question in one call) ---
+# `/submit` and `/next-question` each resend the same context. `/turn` asks for
+# both in one structured response. Sending `turns: [...]` instead scores a
+# finished session in a single batched request.
+VERBAL_REVIEW_SCHEMA = """{
+            "technical_accuracy": "High/Medium/Low",
+            "clarity_score": 8,
+            "confidence_score": 7,
+            "feedback": "2-3 sentences feedback on tone and content."
+        }"""
+
+CODE_REVIEW_SCHEMA = """{
+            "correctness": "Yes/No/Partial",
+            "time_complexity": "e.g. O(n)",
+            "rating": "8",
+            "feedback": "Short feedback on logic, bugs, and edge cases."
+        }"""
+
+def format_answer_block(turn):
+    answer = turn.get('code', '')
+    question_title = turn.get('question_title', 'Unknown Question')
+    if turn.get('mode', 'code') == 'verbal':
+        metrics = turn.get('metrics', {})
+        return f"""
+        Question: '{question_title}'
+        User Answer Transcript: "{answer}"
+        Behavioral Data: Speaking Pace {metrics.get('wpm', 0)} WPM, Filler Words {metrics.get('filler_words', 0)}
+        Evaluate Clarity (structure, pace), Confidence (hesitation, fillers) and Technical Accuracy (content).
+        """
+    return f"""
+        Problem: '{question_title}'
+        Python Code:
+        {answer}
+        Review it for correctness, complexity, bugs and edge cases.
+        """
+
+def build_turn_prompt(data):
+    role = data.get('role', 'Software Engineer')
+    experience = data.get('experience', '0-2 Years')
+    mode = data.get('mode', 'code')
+    focus = data.get('focus', 'Coding' if mode == 'code' else 'Technical')
+    resume_context = data.get('resume_context', '')
+
+    history = history_block(data)
+    review_schema = VERBAL_REVIEW_SCHEMA if mode == 'verbal' else CODE_REVIEW_SCHEMA
+    if focus == 'Coding':
+        next_task = f"Generate a NEW, DIFFERENT coding problem suitable for {experience} level, with clear Input/Output formats."
+    else:
+        next_task = "Generate the NEXT distinct verbal interview question based on the resume context."
+
+    print(f"Turn | Mode: {mode} | Focus: {focus}")
+
+    return f"""
+        Act as a {focus} Interviewer for a {role} with {experience} experience.
+        Resume Context: "{condense_resume(resume_context, RESUME_FOLLOWUP_TOKENS)}"
+        {history}
+        TASK 1 - Review the candidate's answer:
+        {format_answer_block(data)}
+        
+        TASK 2 - {next_task}
+        Do NOT repeat the previous concept.
+        
+        Return ONLY valid JSON (no markdown):
+        {{
+            "review": {review_schema},
+            "next_question": {{
+                "title": "Question Title",
+                "description": "The question text...",
+                "input_format": "e.g. n = 5 (or N/A)",
+                "output_format": "e.g. 120 (or N/A)"
+            }}
+        }}
+        """
+
+def build_session_review_prompt(data):
+    role = data.get('role', 'Software Engineer')
+    experience = data.get('experience', '0-2 Years')
+    turns = data.get('turns', [])
+
+    turn_blocks = "\n".join(
+        f"        TURN {i + 1} ({turn.get('mode', 'code')}):{format_answer_block(turn)}"
+        for i, turn in enumerate(turns)
+    )
+
+    print(f"Session review | Turns: {len(turns)}")
+
+    return f"""
+        Act as a Technical Interviewer. Score this finished interview for a {role} ({experience}).
+        
+{turn_blocks}
+        
+        Return ONLY valid JSON with exactly one review per turn, in order.
+        Verbal turns use {VERBAL_REVIEW_SCHEMA}
+        Code turns use {CODE_REVIEW_SCHEMA}
+        {{
+            "reviews": [<review for turn 1>, <review for turn 2>, ...],
+            "overall": {{ "score": 75, "summary": "2-3 sentences on the whole interview." }}
+        }}
+        """
+
+@interview_bp.route('/turn', methods=['POST'])
+async def evaluate_turn():
+    print("------------------------------------------------")
+    print("🟢 TURN HIT")
+    
+    data = request_data()
+    if 'turns' in data:
+        prompt = build_session_review_prompt(data)
+        endpoint = 'session_review'
+    else:
+        prompt = build_turn_prompt(data)
+        endpoint = 'turn'
+    
+    try:
+        content = await chat_complete_async(prompt, endpoint=endpoint)
+        content = content.replace('```json', '').replace('```', '')
+        result = json.loads(content)
+        if endpoint == 'turn' and data.get('session_id'):
+            session_store.add_turn(data['session_id'], data.get('question_title', ''), data.get('code', ''))
+            session_store.set_verdict(data['session_id'], data.get('question_title', ''), review_verdict(result.get('review')))
+            session_store.set_current_question(data['session_id'], (result.get('next_question') or {}).get('title'))
+        return jsonify({"success": True, **result})
+
+    except Exception as e:
+        print(f"❌ TURN ERROR: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+# --- 7. SPECULATIVE PREFETCH ---
+# The /next-question prompt only needs role, experience, focus, the current
+# question and resume context, so it can be generated as soon as /initiate or
+# /submit arrives. Its history is left out of the match: by the time
+# /next-question comes, /submit has recorded the answer it was reviewing.
+# Slots are keyed by `session_id` when the client sends one, otherwise by the match.
+def prefetch_match(data):
+    return json.dumps([
+        data.get('role', 'Software Engineer'),
+        data.get('experience', '0-2 Years'),
+        data.get('focus', 'Technical'),
+        data.get('current_question', ''),
+        data.get('resume_context', ''),
+    ])
+
+def prefetch_session_key(data, match):
+    return data.get('session_id') or question_prefetcher.prompt_key(match)
+
+def prefetch_next_question(data, current_question):
+    next_data = {
+        'role': data.get('role', 'Software Engineer'),
+        'experience': data.get('experience', '0-2 Years'),
+        'focus': data.get('focus', 'Technical'),
+        'current_question': current_question,
+        'resume_context': data.get('resume_context', ''),
+        'session_id': data.get('session_id'),
+        'history_context': data.get('history_context', ''),
+    }
+    # No model call needed if the bank can serve the next question
+    bank = bank_params(next_data)
+    if bank and question_bank.has_unseen(
+        **bank, session_key=next_data['session_id'], exclude=[current_question]
+    ):
+        return
+
+    match = prefetch_match(next_data)
+    question_prefetcher.start(
+        prefetch_session_key(next_data, match),
+        build_next_question_prompt(next_data),
+        lambda p: chat_complete(p, endpoint='next_question'),
+        match=match
+    )
+
+# --- 8. STREAMING VARIANTS (Server-Sent Events) ---
+# Same prompts and session bookkeeping as above (done in `wrap`, once the
+# full object has arrived), but tokens are forwarded as they arrive.
+# Events: `delta` (partial text of a streamed field), `field` (a finished
+# top-level string), `done` (the full JSON object) and `error`.
+def stream_json_completion(prompt, stream_keys, wrap=None):
+    def generate():
+        parser = IncrementalJSONParser(stream_keys=stream_keys)
+        try:
+            stream = client.chat.stream(
+                model=MODEL_NAME,
+                messages=[{"role": "user", "content": prompt}],
+                response_format={"type": "json_object"}
+            )
+            for chunk in stream:
+                token = chunk.data.choices[0].delta.content
+                if not token:
+                    continue
+                for kind, key, value in parser.feed(token):
+                    if kind == "delta":
+                        yield sse_event("delta", {"field": key, "text": value})
+                    else:
+                        yield sse_event("field", {"field": key, "value": value})
+
+            result = parser.result()
+            yield sse_event("done", wrap(result) if wrap else result)
+
+        except Exception as e:
+            print(f"❌ STREAM ERROR: {e}")
+            yield sse_event("error", {"error": str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@interview_bp.route('/initiate/stream', methods=['POST'])
+def initiate_session_stream():
+    print("🟢 INITIATE STREAM HIT")
+    data = request_data()
+    data['session_id'] = session_store.start(data)
+    prompt = build_initiate_prompt(data)
+    return stream_json_completion(
+        prompt,
+        stream_keys=("description",),
+        wrap=lambda question: serve_question(data, question)
+    )
+
+@interview_bp.route('/submit/stream', methods=['POST'])
+def submit_code_stream():
+    print("🟢 SUBMIT STREAM HIT")
+    data = request_data()
+    prompt = build_submit_prompt(data)
+    return stream_json_completion(
+        prompt,
+        stream_keys=("feedback",),
+        wrap=lambda review: record_review(data, review)
+    )
+
+@interview_bp.route('/next-question/stream', methods=['POST'])
+def get_next_question_stream():
+    print("🟢 NEXT QUESTION STREAM HIT")
+    data = request_data()
+    prompt = build_next_question_prompt(data)
+    return stream_json_completion(
+        prompt,
+        stream_keys=("description",),
+        wrap=lambda question: serve_question(data, question)
+    )
+
+# --- 9. SERVER-SIDE SESSIONS & RESUME DIGEST ---
+# After /initiate the client only needs to send `session_id`: the stored config
+# fills in the rest (see utils/session_store.py). Prompts carry a bounded
+# history, a rolling summary plus the last few turns, never the full transcript.
+def history_block(data):
+    history = data.get('history_context')
+    if not history:
+        return ""
+    return f"""
+        Interview so far:
+        {history}
+        """
+
+def review_verdict(review):
+    review = review or {}
+    if 'technical_accuracy' in review:
+        return f"accuracy {review['technical_accuracy']}"
+    if 'correctness' in review:
+        return f"correct: {review['correctness']}, rating {review.get('rating', '?')}"
+    return ""
+
+def request_data():
+    """
+    Request payload merged over its session, with `resume_context` replaced
+    by the token-budgeted digest (utils/resume_digest.py). The digest is
+    cached by content hash, so a resume is condensed once per session and
+    clients resending the raw text hit the cache.
+    """
+    data = session_store.resolve(request.json)
+    if data.get('resume_context'):
+        data['resume_context'] = condense_resume(data['resume_context'])
+    return data
+
+def record_review(data, review):
+    # Recorded only once reviewed, so a failed call can be retried without a duplicate turn
+    session_id = data.get('session_id')
+    if session_id:
+        question_title = data.get('question_title', 'Unknown Question')
+        session_store.add_turn(session_id, question_title, data.get('code', ''))
+        session_store.set_verdict(session_id, question_title, review_verdict(review))
+    return {"success": True, "review": review}
+
+def serve_question(data, question):
+    session_id = data.get('session_id')
+    if session_id:
+        session_store.set_current_question(session_id, question.get('title'))
+        question = {**question, 'session_id': session_id}
+    return question
@@ -1,14 +1,20 @@
 import os
 import json
+import shutil
 import tempfile
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from werkzeug.utils import secure_filename
 from utils.resume_parser import extract_text_from_file
-from utils.ai_client import client, MODEL_NAME 
+from utils.resume_digest import condense_resume
+from utils.resume_scoring import RESUME_MAX_CHARS, Throughput, score_resume_text, score_resumes
 
 resume_bp = Blueprint('resume', __name__)
 
+# Page-parallel extraction for long PDFs; 0 keeps it in-process
+PDF_EXTRACT_WORKERS = int(os.getenv('PDF_EXTRACT_WORKERS', '0'))
+
 @resume_bp.route('/score', methods=['POST'])
-def score_resume():
+async def score_resume():
     if 'resume' not in request.files:
         return jsonify({"error": "No resume uploaded"}), 400
 
@@ -23,25 +29,17 @@ def score_resume():
             file.save(tmp)
         
         # 1. Extract Text
-        resume_text = extract_text_from_file(temp_path)
+        resume_text = extract_text_from_file(
+            temp_path, max_chars=RESUME_MAX_CHARS, workers=PDF_EXTRACT_WORKERS
+        )
         
         # 2. Score with Mistral
-        prompt = f"""
-        Act as an ATS. Resume Text: "{resume_text[:2000]}". Job: "{job_desc}".
-        Return JSON: {{ "score": 85, "improvement_tips": ["Tip 1"], "summary": "Short summary" }}
-        """
-        
-        chat_response = client.chat.complete(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"}
-        )
-
-        content = chat_response.choices[0].message.content.replace('```json', '').replace('```', '')
-        response_data = json.loads(content)
+        response_data = await score_resume_text(resume_text, job_desc)
         
         # --- CRITICAL: Return the raw text so frontend can use it for Interview ---
         response_data['extracted_text'] = resume_text 
+        # Condensed once here from the full text; interview prompts reuse it from the digest cache
+        response_data['resume_digest'] = condense_resume(resume_text)
         
         return jsonify(response_data)
 
@@ -50,4 +48,43 @@ def score_resume():
         return jsonify({"error": str(e)}), 500
     finally:
         if os.path.exists(temp_path):
-            os.remove(temp_path)
\ No newline at end of file
+            os.remove(temp_path)
+
+@resume_bp.route('/score/bulk', methods=['POST'])
+def score_resumes_bulk():
+    """
+    Scores every uploaded `resumes` file against one job description.
+    Streams JSONL: one line per resume as it finishes, then a summary line.
+    """
+    files = request.files.getlist('resumes')
+    if not files:
+        return jsonify({"error": "No resumes uploaded"}), 400
+
+    job_desc = request.form.get('job_description', 'General')
+    print(f"🟢 BULK SCORE HIT: {len(files)} resumes")
+
+    # Uploads only live for the request, so park them on disk for the extraction workers
+    workdir = tempfile.mkdtemp(prefix="bulk_resumes_")
+    names, paths = [], []
+    for i, file in enumerate(files):
+        name = file.filename or f"resume_{i}.pdf"
+        path = os.path.join(workdir, f"{i}_{secure_filename(name) or 'resume.pdf'}")
+        file.save(path)
+        names.append(name)
+        paths.append(path)
+
+    def generate():
+        meter = Throughput()
+        try:
+            for result in score_resumes(paths, job_desc, names=names):
+                meter.add(result)
+                yield json.dumps(result) + "\n"
+            yield json.dumps({"summary": meter.summary()}) + "\n"
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
@@ -0,0 +1,40 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from utils.json_stream import IncrementalJSONParser
+
+# json.dumps escapes the emoji as the surrogate pair 🚀
+DOC = json.dumps({"title": "Rockets", "description": "Launch \U0001F680 now é \"quoted\" \\ done"})
+
+def streamed(chunks):
+    parser = IncrementalJSONParser()
+    deltas, fields = [], {}
+    for chunk in chunks:
+        for kind, key, value in parser.feed(chunk):
+            if kind == "delta":
+                deltas.append(value)
+            else:
+                fields[key] = value
+    return "".join(deltas), fields, parser.result()
+
+def test_deltas_match_value_for_every_two_chunk_split():
+    expected = json.loads(DOC)["description"]
+    for cut in range(1, len(DOC)):
+        text, fields, result = streamed([DOC[:cut], DOC[cut:]])
+        assert text == expected, cut
+        assert fields["description"] == expected
+        assert result == json.loads(DOC)
+
+def test_split_inside_surrogate_pair_holds_back_high_half():
+    start = DOC.index("\\ud83d")
+    for cut in range(start + 1, start + 12):  # inside the high escape, between the halves, inside the low one
+        text, _, _ = streamed([DOC[:cut], DOC[cut:]])
+        assert "\U0001F680" in text
+        assert not any("\ud800" <= ch <= "\udfff" for ch in text)
+
+def test_single_character_chunks():
+    text, _, _ = streamed(list(DOC))
+    assert text == json.loads(DOC)["description"]
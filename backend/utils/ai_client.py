@@ -1,5 +1,8 @@
 import os
+import asyncio
 from mistralai import Mistral
+from utils.llm_cache import llm_cache
+from utils.background_loop import background_loop
 
 # --- CONFIGURATION ---
 # Your API Key is set correctly here
@@ -10,7 +13,73 @@ if not API_KEY or API_KEY == "YOUR_MISTRAL_API_KEY_HERE":
     print("⚠️ WARNING: Mistral API Key is missing in utils/ai_client.py")
 
 # Initialize the client
-client = Mistral(api_key=API_KEY)
+# LLM_BACKEND=mock swaps in a deterministic local stand-in (load tests, offline dev)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "mistral")
+if LLM_BACKEND == "mock":
+    from utils.mock_llm import MockMistral
+    client = MockMistral()
+else:
+    client = Mistral(api_key=API_KEY)
 
 # Centralize model name
-MODEL_NAME = "mistral-large-latest"
\ No newline at end of file
+MODEL_NAME = "mistral-large-latest"
+
+JSON_RESPONSE = {"type": "json_object"}
+
+# Async views await the SDK's async client on the shared background loop
+# (utils/background_loop.py): it is bound to the loop it first ran on, and Flask
+# runs every async view on a fresh one. One loop means one connection pool and
+# one semaphore for the whole worker, and no thread is parked per LLM call.
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+_llm_semaphore = None
+_llm_loop = None
+
+def _complete(prompt, response_format):
+    chat_response = client.chat.complete(
+        model=MODEL_NAME,
+        messages=[{"role": "user", "content": prompt}],
+        response_format=response_format
+    )
+    return chat_response.choices[0].message.content
+
+async def _complete_async(prompt, response_format):
+    """Runs on the background loop, at most LLM_MAX_CONCURRENCY at once."""
+    global _llm_semaphore, _llm_loop
+    loop = asyncio.get_running_loop()
+    if _llm_loop is not loop:  # first call, or a new loop in a forked worker
+        _llm_semaphore, _llm_loop = asyncio.Semaphore(LLM_MAX_CONCURRENCY), loop
+    async with _llm_semaphore:
+        chat_response = await client.chat.complete_async(
+            model=MODEL_NAME,
+            messages=[{"role": "user", "content": prompt}],
+            response_format=response_format
+        )
+    return chat_response.choices[0].message.content
+
+def chat_complete(prompt, endpoint="default", response_format=JSON_RESPONSE):
+    """
+    Single-prompt completion through the shared LLM cache.
+    Returns the raw message content.
+    """
+    key = llm_cache.make_key(MODEL_NAME, prompt, response_format)
+    content = llm_cache.get(key, endpoint)
+    if content is not None:
+        return content
+
+    content = _complete(prompt, response_format)
+    llm_cache.set(key, content, endpoint)
+    return content
+
+async def chat_complete_async(prompt, endpoint="default", response_format=JSON_RESPONSE):
+    """
+    Async variant of `chat_complete` for async views.
+    Cache hits return directly; the model call runs on the background loop.
+    """
+    key = llm_cache.make_key(MODEL_NAME, prompt, response_format)
+    content = llm_cache.get(key, endpoint)
+    if content is not None:
+        return content
+
+    content = await background_loop.call(_complete_async(prompt, response_format))
+    llm_cache.set(key, content, endpoint)
+    return content
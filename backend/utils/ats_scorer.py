@@ -0,0 +1,296 @@
+import os
+import re
+import math
+import time
+from collections import Counter
+
+# --- CONFIGURATION ---
+# "band": the LLM is only asked when the lexical score is ambiguous
+# "off": always ask the LLM (the pre-score is still attached to the response)
+ATS_PRESCORE_MODE = os.getenv("ATS_PRESCORE_MODE", "band")
+# Scores at or below HIGH go to the LLM; only clear matches skip it. Raise LOW
+# (answer weak matches lexically too) only after checking it against LLM
+# scores with scripts/calibrate_ats.py
+ATS_AMBIGUOUS_LOW = float(os.getenv("ATS_AMBIGUOUS_LOW", "0"))
+ATS_AMBIGUOUS_HIGH = float(os.getenv("ATS_AMBIGUOUS_HIGH", "75"))
+MAX_JOB_TERMS = 30
+# Shorter postings ("Backend Engineer", "General") say too little to score lexically
+MIN_JOB_TERMS = 5
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Section length (in terms) at which one mention is full credit; longer
+# sections need more mentions. Fixed rather than the resume's own average,
+# which would always discount the (long) experience section
+BM25_REFERENCE_LENGTH = 100
+# Two-word phrases add context but are noisier than single terms
+BIGRAM_WEIGHT = 0.5
+# How much a mention counts by where it is: used in a job beats listed
+SECTION_WEIGHTS = {
+    "experience": 1.0, "projects": 1.0, "summary": 0.8, "skills": 0.8, "header": 0.8,
+    "certifications": 0.7, "education": 0.6,
+}
+
+# Spelling variants mapped to one term before matching
+SYNONYMS = {
+    "postgres": "postgresql", "psql": "postgresql", "k8s": "kubernetes", "golang": "go",
+    "js": "javascript", "ecmascript": "javascript", "ts": "typescript", "py": "python",
+    "nodejs": "node.js", "node": "node.js", "reactjs": "react", "react.js": "react",
+    "vuejs": "vue", "vue.js": "vue", "angularjs": "angular", "expressjs": "express", "express.js": "express",
+    "mongo": "mongodb", "elastic": "elasticsearch", "sklearn": "scikit-learn", "tf": "tensorflow",
+    "gcloud": "gcp", "ml": "machine-learning", "ai": "artificial-intelligence", "nlp": "natural-language-processing",
+    "ci": "ci/cd", "cicd": "ci/cd", "dotnet": ".net", "csharp": "c#", "cpp": "c++",
+}
+# Multi-word names collapsed into one term ("Amazon Web Services" -> aws)
+PHRASE_SYNONYMS = [
+    (re.compile(r"\bamazon web services\b"), "aws"),
+    (re.compile(r"\bgoogle cloud(?: platform)?\b"), "gcp"),
+    (re.compile(r"\bmicrosoft azure\b"), "azure"),
+    (re.compile(r"\bmachine learning\b"), "machine-learning"),
+    (re.compile(r"\bartificial intelligence\b"), "artificial-intelligence"),
+    (re.compile(r"\bnatural language processing\b"), "natural-language-processing"),
+    (re.compile(r"\bcontinuous (?:integration|delivery|deployment)\b"), "ci/cd"),
+    (re.compile(r"\brest(?:ful)? apis?\b"), "rest-api"),
+]
+
+# Keeps tech tokens whole: c++, c#, node.js, ci/cd, s3, .net
+TOKEN_RE = re.compile(r"[a-z0-9.+#/-]*[a-z0-9+#]")
+
+STOPWORDS = frozenset("""
+a about above across after all also an and any are as at be been being both but by can could do does
+etc for from has have having he her his how i if in into is it its just may me more most must my no
+nor not of on or our out over own per same she should so such than that the their them then there
+these they this those through to too under up us using via was we were what when where which while
+who whom why will with within would you your
+ability able candidate candidates company day degree environment excellent experience experienced
+familiar familiarity good great ideal including job join knowledge least looking plus preferred
+proficiency proficient related required requirements responsibilities role skills strong team
+understanding work working year years need needs senior junior help new drive
+""".split())
+
+# Lines that open a resume section, e.g. "EXPERIENCE", "Technical Skills:"
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "objective", "about"),
+    "experience": ("experience", "employment", "work history", "professional experience"),
+    "projects": ("projects", "project"),
+    "skills": ("skills", "technical skills", "technologies", "tools"),
+    "education": ("education", "academics", "qualifications"),
+    "certifications": ("certifications", "certificates", "courses", "achievements", "awards"),
+}
+_HEADING_LOOKUP = {alias: name for name, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Bigrams never span these: "Python, Django" is not the phrase "python django"
+PHRASE_BREAK_RE = re.compile(r"[,;:|()\[\]\n•]|\.\s|\s(?:and|or)\s", re.IGNORECASE)
+
+def tokenize(text):
+    tokens = TOKEN_RE.findall(text.lower())
+    return [t.lstrip(".-/") if not t.startswith(".net") else t for t in tokens]
+
+def stem(token):
+    """
+    Light suffix stripping so "deploying", "deployed" and "deployments"
+    meet at "deploy", and "service" / "services" at "servic". Tech tokens
+    (digits, dots, symbols) are left alone.
+    """
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    if token.endswith("ies") and len(token) > 5:
+        return token[:-3] + "y"
+    for suffix in ("ments", "ment", "ings", "ing", "ed", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token.endswith(("ss", "us", "is")):
+                break  # "process", "status", "analysis"
+            token = token[: -len(suffix)]
+            break
+    return token[:-1] if token.endswith("e") and len(token) > 3 else token
+
+def normalize(token):
+    """Matching form of a token: synonyms resolved, then stemmed."""
+    token = SYNONYMS.get(token, token)
+    return token if token in SYNONYMS.values() else stem(token)
+
+def _terms(text):
+    # Unigrams plus bigrams of adjacent content words within a phrase
+    # ("data pipelines"); each with the surface form it was first seen as,
+    # "rest apis" rather than the collapsed "rest-api"
+    text = original = text.lower()
+    collapsed = {}
+    for pattern, replacement in PHRASE_SYNONYMS:
+        def collapse(match, replacement=replacement):
+            # A posting that also writes "AWS" keeps that as the label
+            if not re.search(rf"(?<![\w-]){re.escape(replacement)}(?![\w-])", original):
+                collapsed.setdefault(replacement, match.group(0))
+            return replacement
+        text = pattern.sub(collapse, text)
+    words, bigrams, surface = [], [], {}
+    for phrase in PHRASE_BREAK_RE.split(text):
+        tokens = tokenize(phrase)
+        for token in tokens:
+            if token not in STOPWORDS and (len(token) > 1 or token in ("c", "r")):
+                term = normalize(token)
+                words.append(term)
+                surface.setdefault(term, collapsed.get(token, token))
+        for a, b in zip(tokens, tokens[1:]):
+            if a in STOPWORDS or b in STOPWORDS:
+                continue
+            term = f"{normalize(a)} {normalize(b)}"
+            bigrams.append(term)
+            surface.setdefault(term, f"{collapsed.get(a, a)} {collapsed.get(b, b)}")
+    return words, bigrams, surface
+
+def extract_job_terms(job_desc, limit=MAX_JOB_TERMS):
+    """
+    Weighted keywords of a job description.
+    Returns: list of (term, weight, label), heaviest first; `term` is the
+    normalized matching form, `label` the wording the posting used. A bigram
+    weighs more than BIGRAM_WEIGHT only if the posting repeats it.
+    """
+    words, bigrams, surface = _terms(job_desc)
+    weights = Counter()
+    for word in words:
+        weights[word] += 1.0
+    for bigram in bigrams:
+        weights[bigram] += BIGRAM_WEIGHT
+    # Diminishing returns for terms repeated all over the posting; a bigram
+    # seen once stays below any unigram
+    ranked = sorted(
+        ((t, w if w < 1.0 else 1.0 + math.log(w), surface[t]) for t, w in weights.items()),
+        key=lambda item: (-item[1], item[0]),
+    )
+    return ranked[:limit]
+
+def split_sections(text):
+    """Splits resume text on known headings. Returns: {section name: text}."""
+    sections = {}
+    current = "header"
+    for line in text.splitlines():
+        key = re.sub(r"[^a-z ]", "", line.lower()).strip()
+        if key in _HEADING_LOOKUP and len(line) < 40:
+            current = _HEADING_LOOKUP[key]
+            continue
+        sections.setdefault(current, []).append(line)
+    return {name: "\n".join(lines) for name, lines in sections.items() if any(l.strip() for l in lines)}
+
+class ResumeIndex:
+    """
+    BM25 index over one resume's sections (each section is a document).
+    Built once per resume, then every job term is a dict lookup.
+    """
+
+    def __init__(self, text, k1=BM25_K1, b=BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.sections = {}
+        for name, body in (split_sections(text) or {"header": text}).items():
+            words, bigrams, _ = _terms(body)
+            self.sections[name] = Counter(words + bigrams)
+        self.lengths = {name: sum(counts.values()) for name, counts in self.sections.items()}
+        self.avg_length = (sum(self.lengths.values()) / len(self.lengths)) if self.lengths else 0.0
+        self.doc_freq = Counter(term for counts in self.sections.values() for term in counts)
+        self.total = Counter()
+        for counts in self.sections.values():
+            self.total.update(counts)
+
+    def contains(self, term):
+        return term in self.total
+
+    def idf(self, term):
+        n, df = len(self.sections), self.doc_freq.get(term, 0)
+        return math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+
+    def _norm(self, name, avg_length=None):
+        avg_length = avg_length or self.avg_length or 1
+        return self.k1 * (1 - self.b + self.b * self.lengths[name] / avg_length)
+
+    def credit(self, term):
+        """
+        How well the resume covers one term, 0..1: BM25 term-frequency
+        saturation in its best section, times that section's weight. One
+        mention in an experience section of BM25_REFERENCE_LENGTH terms is
+        full credit.
+        """
+        best = 0.0
+        for name, counts in self.sections.items():
+            tf = counts.get(term, 0)
+            if tf:
+                # BM25's tf term: 1.0 for one mention at the reference length
+                saturation = tf * (self.k1 + 1) / (tf + self._norm(name, BM25_REFERENCE_LENGTH))
+                best = max(best, min(saturation, 1.0) * SECTION_WEIGHTS.get(name, 0.8))
+        return best
+
+    def section_scores(self, terms):
+        """BM25 of the weighted job terms against each section."""
+        scores = {}
+        for name, counts in self.sections.items():
+            norm = self._norm(name)
+            score = 0.0
+            for term, weight, _ in terms:
+                tf = counts.get(term, 0)
+                if tf:
+                    score += weight * self.idf(term) * tf * (self.k1 + 1) / (tf + norm)
+            scores[name] = round(score, 3)
+        return scores
+
+def prescore(resume_text, job_desc, job_terms=None):
+    """
+    Deterministic keyword score in a few milliseconds.
+    Score = weighted mean of each job term's BM25 credit (`ResumeIndex.credit`);
+    `coverage` is the plain share of term weight mentioned anywhere.
+    Pass precomputed `job_terms` when scoring many resumes for one posting.
+    """
+    start = time.perf_counter()
+    job_terms = job_terms if job_terms is not None else extract_job_terms(job_desc)
+    index = ResumeIndex(resume_text)
+
+    matched, missing = [], []
+    credited = found_weight = total_weight = 0.0
+    for term, weight, label in job_terms:
+        total_weight += weight
+        credit = index.credit(term)
+        credited += weight * credit
+        if credit:
+            found_weight += weight
+        # A bigram seen once may just be two neighbours in a list ("Docker
+        # Kubernetes AWS"); it still scores, but only repeated phrases are shown
+        if " " in term and weight <= BIGRAM_WEIGHT:
+            continue
+        if credit:
+            matched.append(label)
+        elif " " not in term or not all(index.contains(word) for word in term.split()):
+            # A phrase whose words both appear is not worth reporting as missing
+            missing.append(label)
+
+    score = round(100 * credited / total_weight) if total_weight else 50
+    return {
+        "score": score,
+        "coverage": round(100 * found_weight / total_weight) if total_weight else 50,
+        "matched_keywords": matched,
+        "missing_keywords": missing,
+        "job_terms": len(job_terms),
+        "section_scores": index.section_scores(job_terms),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+def is_ambiguous(score, low=ATS_AMBIGUOUS_LOW, high=ATS_AMBIGUOUS_HIGH):
+    return low <= score <= high
+
+def needs_llm(pre, mode=ATS_PRESCORE_MODE):
+    return mode != "band" or pre["job_terms"] < MIN_JOB_TERMS or is_ambiguous(pre["score"])
+
+def lexical_response(pre):
+    """The /score response shape built from the pre-score alone (no LLM call)."""
+    missing = pre["missing_keywords"][:5]
+    matched = pre["matched_keywords"][:5]
+    if pre["score"] > ATS_AMBIGUOUS_HIGH:
+        summary = f"Strong keyword match for this job ({pre['score']}%)."
+    else:
+        summary = f"Weak keyword match for this job ({pre['score']}%): key requirements are not mentioned."
+    return {
+        "score": pre["score"],
+        "improvement_tips": [f"Show concrete experience with {term}" for term in missing]
+                            or ["Quantify the impact of your work"],
+        "summary": summary,
+        "missing_keywords": pre["missing_keywords"],
+        "strengths": matched,
+        "weaknesses": missing,
+        "source": "lexical",
+    }
@@ -0,0 +1,82 @@
+import os
+import asyncio
+import threading
+
+class BackgroundLoop:
+    """
+    One long-lived event loop on a daemon thread, shared by the whole process.
+
+    Flask runs every async view on a fresh event loop, and asyncio clients
+    (httpx.AsyncClient, the Mistral SDK's async client) are bound to the
+    loop that first used them. Coroutines that touch such clients are
+    submitted here instead, so the clients, their keep-alive connections and
+    any asyncio.Semaphore around them live as long as the process and are
+    shared by every request. Callers on any loop just `await call(...)`.
+    """
+
+    def __init__(self, name="background-loop"):
+        self.name = name
+        self._loop = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self):
+        """The running loop; the thread is started on first use (and again in a forked child)."""
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name=self.name, daemon=True)
+                thread.start()
+                self._loop, self._pid = loop, os.getpid()
+            return self._loop
+
+    def submit(self, coro):
+        """Schedules `coro` on the background loop. Returns: concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Blocking form of `submit`, for sync code (startup / shutdown hooks)."""
+        return self.submit(coro).result(timeout)
+
+    async def call(self, coro):
+        """
+        Awaits `coro` on the background loop from any other loop. Cancelling
+        the caller cancels the background task too.
+        """
+        return await asyncio.wrap_future(self.submit(coro))
+
+    async def iterate(self, agen):
+        """Async-iterates `agen`, which runs on the background loop, from any other loop."""
+        caller = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+
+        def put(item):
+            try:
+                caller.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                pass  # the caller's loop is gone
+
+        async def pump():
+            try:
+                async for item in agen:
+                    put((False, item))
+            except Exception as e:
+                put((True, e))
+                return
+            put((True, None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                done, item = await queue.get()
+                if done:
+                    if item is not None:
+                        raise item
+                    return
+                yield item
+        finally:
+            future.cancel()
+
+# Singleton instance for import
+background_loop = BackgroundLoop()
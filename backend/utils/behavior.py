@@ -0,0 +1,285 @@
+import os
+import math
+import time
+import threading
+from collections import OrderedDict
+
+# --- CONFIGURATION ---
+# Window behind the "recent" averages and the blinks-per-minute rate (seconds)
+BEHAVIOR_WINDOW = float(os.getenv("BEHAVIOR_WINDOW", "60"))
+BEHAVIOR_BUCKETS = int(os.getenv("BEHAVIOR_BUCKETS", "60"))
+# Time constant of the exponentially weighted means (seconds)
+BEHAVIOR_EWM_TAU = float(os.getenv("BEHAVIOR_EWM_TAU", "20"))
+# Which average feeds the judgment model: "window", "ewm" or "session"
+BEHAVIOR_FEATURES = os.getenv("BEHAVIOR_FEATURES", "window")
+BEHAVIOR_MAX_SESSIONS = int(os.getenv("BEHAVIOR_MAX_SESSIONS", "5000"))
+BEHAVIOR_SESSION_TTL = float(os.getenv("BEHAVIOR_SESSION_TTL", "7200"))
+
+# A real blink closes the eyes for ~50-400 ms
+BLINK_MIN_CLOSED = 0.05
+BLINK_MAX_CLOSED = 0.5
+# Eyes must stay open this long to end a closure; shorter gaps are detector flicker
+BLINK_REOPEN = 0.05
+
+# Neutral values (what the per-frame / per-clip functions return without a signal)
+NEUTRAL = {"avg_blinks": 20.0, "avg_audio_nervousness": 0.5, "avg_posture": 0.5}
+
+def parse_observations(observations):
+    """
+    Validates a whole batch of {timestamp, blinking?, posture?, nervousness?}
+    before any of it is recorded. Returns: list of observe() argument tuples.
+    Raises: ValueError / TypeError / KeyError on the first bad observation.
+    """
+    if not isinstance(observations, list):
+        raise TypeError("observations must be a list")
+    parsed = []
+    for obs in observations:
+        timestamp = float(obs['timestamp'])
+        posture, nervousness = obs.get('posture'), obs.get('nervousness')
+        posture = None if posture is None else float(posture)
+        nervousness = None if nervousness is None else float(nervousness)
+        if not all(math.isfinite(v) for v in (timestamp, posture, nervousness) if v is not None):
+            raise ValueError("values must be finite numbers")
+        parsed.append((timestamp, obs.get('blinking'), posture, nervousness))
+    return parsed
+
+class BlinkCounter:
+    """
+    Debounced blink counting from per-frame `is_blinking` flags.
+
+    States: open -> closed -> reopening -> open. A closure counts as a blink
+    when it lasts BLINK_MIN_CLOSED..BLINK_MAX_CLOSED seconds; longer ones
+    (looking down, eyes shut) do not. Open frames shorter than BLINK_REOPEN
+    inside a closure are merged into it, so one flickering blink counts once.
+    Timestamps, not frame counts, so dropped frames do not skew durations.
+    """
+
+    def __init__(self):
+        self.state = "open"
+        self.blinks = 0
+        self._closed_at = None
+        self._opened_at = None
+
+    def update(self, timestamp, blinking):
+        """Returns True when this frame completes a blink."""
+        if self.state == "open":
+            if blinking:
+                self.state, self._closed_at = "closed", timestamp
+            return False
+        if self.state == "closed":
+            if not blinking:
+                self.state, self._opened_at = "reopening", timestamp
+            return False
+        # reopening
+        if blinking:
+            self.state = "closed"  # flicker: same closure continues
+            return False
+        if timestamp - self._opened_at < BLINK_REOPEN:
+            return False
+        self.state = "open"
+        duration = self._opened_at - self._closed_at
+        if BLINK_MIN_CLOSED <= duration <= BLINK_MAX_CLOSED:
+            self.blinks += 1
+            return True
+        return False
+
+class EWMean:
+    """Exponentially weighted mean for irregularly spaced samples (time constant `tau`)."""
+
+    def __init__(self, tau=BEHAVIOR_EWM_TAU):
+        self.tau = tau
+        self.value = None
+        self._last = None
+
+    def add(self, timestamp, value):
+        if self.value is None:
+            self.value = value
+        else:
+            alpha = 1.0 - math.exp(-max(timestamp - self._last, 0.0) / self.tau)
+            self.value += alpha * (value - self.value)
+        self._last = timestamp
+
+class WindowedSum:
+    """
+    Sum and count of the samples from the last `window` seconds, kept in a
+    fixed ring of time buckets: O(1) per sample, O(buckets) per read, and
+    the same memory at minute one and hour two.
+    """
+
+    def __init__(self, window=BEHAVIOR_WINDOW, buckets=BEHAVIOR_BUCKETS):
+        self.width = window / buckets
+        self.buckets = buckets
+        self._ids = [-1] * buckets
+        self._sums = [0.0] * buckets
+        self._counts = [0] * buckets
+
+    def add(self, timestamp, value=1.0):
+        bucket = int(timestamp // self.width)
+        slot = bucket % self.buckets
+        if self._ids[slot] != bucket:
+            self._ids[slot], self._sums[slot], self._counts[slot] = bucket, 0.0, 0
+        self._sums[slot] += value
+        self._counts[slot] += 1
+
+    def totals(self, now):
+        oldest = int(now // self.width) - self.buckets + 1
+        total, count = 0.0, 0
+        for bucket, s, c in zip(self._ids, self._sums, self._counts):
+            if bucket >= oldest:
+                total += s
+                count += c
+        return total, count
+
+class RunningFeature:
+    """Session, windowed and exponentially weighted mean of one signal."""
+
+    def __init__(self, window=BEHAVIOR_WINDOW, buckets=BEHAVIOR_BUCKETS, tau=BEHAVIOR_EWM_TAU):
+        self.total = 0.0
+        self.count = 0
+        self.windowed = WindowedSum(window, buckets)
+        self.ewm = EWMean(tau)
+
+    def add(self, timestamp, value):
+        value = float(value)
+        self.total += value
+        self.count += 1
+        self.windowed.add(timestamp, value)
+        self.ewm.add(timestamp, value)
+
+    def means(self, now):
+        total, count = self.windowed.totals(now)
+        return {
+            "session": self.total / self.count if self.count else None,
+            "window": total / count if count else None,
+            "ewm": self.ewm.value,
+        }
+
+class SessionBehavior:
+    """
+    Rolling behavioral aggregates of one interview session, in constant
+    memory: a blink state machine fed by `is_blinking` per frame, and
+    running means of posture (per pose update) and audio nervousness (per
+    clip or streaming update). `features()` returns the judgment model's
+    input row at any moment, without keeping any frame history.
+    """
+
+    def __init__(self, window=BEHAVIOR_WINDOW, buckets=BEHAVIOR_BUCKETS, tau=BEHAVIOR_EWM_TAU):
+        self.window = window
+        self.blinks = BlinkCounter()
+        self.recent_blinks = WindowedSum(window, buckets)
+        self.posture = RunningFeature(window, buckets, tau)
+        self.nervousness = RunningFeature(window, buckets, tau)
+        self.started = None
+        self.last_seen = None
+        self.frames = 0
+        self._lock = threading.Lock()  # video and audio updates arrive on different requests
+
+    def _seen(self, timestamp):
+        if self.started is None:
+            self.started = timestamp
+        self.last_seen = max(self.last_seen or timestamp, timestamp)
+
+    def observe(self, timestamp, blinking=None, posture=None, nervousness=None):
+        """Any subset of signals for one moment; timestamps in seconds, non-decreasing per signal."""
+        with self._lock:
+            self._seen(timestamp)
+            if blinking is not None:
+                self.frames += 1
+                if self.blinks.update(timestamp, bool(blinking)):
+                    self.recent_blinks.add(timestamp)
+            if posture is not None:
+                self.posture.add(timestamp, posture)
+            if nervousness is not None:
+                self.nervousness.add(timestamp, nervousness)
+
+    def observe_frame(self, result):
+        """A `FramePipeline.process()` result; the posture counts only when it was re-measured."""
+        if result is None:
+            return  # dropped or undecodable frame
+        self.observe(
+            result["timestamp"],
+            blinking=result.get("blinking", False),
+            posture=result.get("posture") if result.get("posture_fresh") else None,
+        )
+
+    def observe_audio(self, timestamp, scores):
+        """An `analyze_audio_features` / `StreamingAudioAnalyzer.scores()` result."""
+        self.observe(timestamp, nervousness=scores.get("nervousness"))
+
+    def blink_rate(self, now=None, kind="window"):
+        """Blinks per minute over the window (or the whole session while it is shorter)."""
+        if self.started is None:
+            return None
+        now = self.last_seen if now is None else now
+        elapsed = now - self.started
+        if elapsed <= 0:
+            return None
+        if kind == "session" or elapsed < self.window:
+            return self.blinks.blinks / elapsed * 60.0
+        count, _ = self.recent_blinks.totals(now)
+        return count / self.window * 60.0
+
+    def features(self, now=None, kind=BEHAVIOR_FEATURES):
+        """
+        {avg_blinks, avg_audio_nervousness, avg_posture} for the judgment model.
+        `kind`: "window" (last BEHAVIOR_WINDOW s), "ewm" or "session" averages.
+        Signals not seen yet fall back to neutral values.
+        """
+        with self._lock:
+            now = self.last_seen if now is None else now
+            blink_kind = "session" if kind == "session" else "window"
+            values = {
+                "avg_blinks": self.blink_rate(now, blink_kind),
+                "avg_audio_nervousness": self.nervousness.means(now)[kind] if now is not None else None,
+                "avg_posture": self.posture.means(now)[kind] if now is not None else None,
+            }
+        return {name: NEUTRAL[name] if value is None else value for name, value in values.items()}
+
+    def snapshot(self):
+        with self._lock:
+            now = self.last_seen
+            return {
+                "frames": self.frames,
+                "blinks": self.blinks.blinks,
+                "elapsed_s": round(now - self.started, 1) if self.started is not None else 0.0,
+                "blink_rate": self.blink_rate(now),
+                "posture": self.posture.means(now) if now is not None else None,
+                "nervousness": self.nervousness.means(now) if now is not None else None,
+            }
+
+class BehaviorStore:
+    """SessionBehavior per session id, LRU-bounded with an idle TTL."""
+
+    def __init__(self, max_sessions=BEHAVIOR_MAX_SESSIONS, ttl=BEHAVIOR_SESSION_TTL):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()  # session_id -> (SessionBehavior, last_used)
+        self._lock = threading.Lock()
+
+    def get(self, session_id, create=True):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None and entry[1] + self.ttl <= now:
+                entry = None
+            if entry is None:
+                if not create:
+                    self._sessions.pop(session_id, None)
+                    return None
+                entry = (SessionBehavior(), now)
+            self._sessions[session_id] = (entry[0], now)
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return entry[0]
+
+    def drop(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {"sessions": len(self._sessions)}
+
+# Singleton instance for import
+behavior_store = BehaviorStore()
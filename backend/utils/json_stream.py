@@ -0,0 +1,114 @@
+import json
+
+class IncrementalJSONParser:
+    """
+    Parses a JSON object while it is still being generated, token by token.
+
+    Only top-level string values are tracked. `feed()` returns a list of
+    events as soon as they can be known:
+      ("delta", key, text)  -> new characters of a value still being written
+      ("field", key, value) -> a top-level string value has been closed
+    Call `result()` at the end to get the fully parsed object.
+    """
+
+    def __init__(self, stream_keys=("description",)):
+        self.stream_keys = set(stream_keys)
+        self.buffer = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._is_key = False
+        self._expect_key = False
+        self._key = None
+        self._raw = []
+        self._emitted = 0
+
+    def feed(self, chunk: str):
+        events = []
+        for ch in chunk:
+            self.buffer.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    self._raw.append(ch)
+                elif ch == "\\":
+                    self._escape = True
+                    self._raw.append(ch)
+                elif ch == '"':
+                    self._in_string = False
+                    self._close_string(events)
+                else:
+                    self._raw.append(ch)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._is_key = self._depth == 1 and self._expect_key
+                self._raw = []
+                self._emitted = 0
+            elif ch in "{[":
+                self._depth += 1
+                self._expect_key = ch == "{" and self._depth == 1
+            elif ch in "}]":
+                self._depth -= 1
+            elif ch == "," and self._depth == 1:
+                self._expect_key = True
+            elif ch == ":" and self._depth == 1:
+                self._expect_key = False
+
+        # Emit the readable part of an in-progress streamed value
+        if self._in_string and self._is_value_tracked():
+            delta = self._pending_delta()
+            if delta:
+                events.append(("delta", self._key, delta))
+        return events
+
+    def result(self):
+        """Returns the parsed object from everything fed so far."""
+        text = "".join(self.buffer).replace('```json', '').replace('```', '')
+        return json.loads(text)
+
+    # --- internal helpers ---
+
+    def _is_value_tracked(self):
+        return (not self._is_key and self._depth == 1
+                and self._key in self.stream_keys)
+
+    def _close_string(self, events):
+        raw = "".join(self._raw)
+        if self._is_key:
+            self._key = _decode(raw)
+            return
+        if self._depth != 1:
+            return
+        value = _decode(raw)
+        if self._key in self.stream_keys:
+            tail = value[self._emitted:]
+            if tail:
+                events.append(("delta", self._key, tail))
+        events.append(("field", self._key, value))
+
+    def _pending_delta(self):
+        raw = "".join(self._raw)
+        # Hold back a trailing, half-written escape sequence
+        cut = raw.rfind("\\")
+        if cut != -1 and (self._escape or (raw[cut + 1:cut + 2] == "u" and len(raw) - cut < 6)):
+            raw = raw[:cut]
+        try:
+            text = _decode(raw)
+        except ValueError:
+            return ""
+        # A \uD83D escape whose low surrogate has not arrived yet decodes to a
+        # lone high surrogate: hold it back until the pair is complete
+        if text and "\ud800" <= text[-1] <= "\udbff":
+            text = text[:-1]
+        delta = text[self._emitted:]
+        self._emitted = len(text)
+        return delta
+
+def _decode(raw: str) -> str:
+    return json.loads(f'"{raw}"')
+
+def sse_event(event: str, data) -> str:
+    """Formats one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
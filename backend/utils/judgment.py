@@ -0,0 +1,273 @@
+import os
+import time
+import struct
+import asyncio
+import zipfile
+import threading
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+
+# --- CONFIGURATION ---
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+JUDGMENT_MODEL_PATH = os.getenv("JUDGMENT_MODEL_PATH", os.path.join(_BACKEND_DIR, "judgment_model.joblib"))
+# Compact export (scripts/export_judgment_model.py), memory-mapped; written from the
+# joblib file on first load when missing
+JUDGMENT_COMPACT_PATH = os.getenv("JUDGMENT_COMPACT_PATH", os.path.join(_BACKEND_DIR, "judgment_model.npz"))
+# "auto" / "compact": the compact export; "sklearn": the forest itself
+JUDGMENT_BACKEND = os.getenv("JUDGMENT_BACKEND", "auto")
+# Rows arriving within this window share one predict_proba call
+JUDGMENT_BATCH_WINDOW_MS = float(os.getenv("JUDGMENT_BATCH_WINDOW_MS", "2"))
+JUDGMENT_MAX_BATCH = int(os.getenv("JUDGMENT_MAX_BATCH", "256"))
+LATENCY_WINDOW = 1000
+
+# Column order the model was trained on (training/training.py)
+FEATURES = ("avg_blinks", "avg_audio_nervousness", "avg_posture")
+
+def _mmap_npz(path):
+    """
+    Memory-maps every member of an uncompressed .npz. Returns: {name: array}.
+    np.load ignores mmap_mode for archives and reads each member into memory.
+    """
+    arrays = {}
+    with open(path, "rb") as f, zipfile.ZipFile(f) as archive:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"'{path}' is compressed; re-export it with CompactForest.save")
+            # Member data follows its local header: 30 bytes, then name and extra field
+            f.seek(info.header_offset + 26)
+            name_length, extra_length = struct.unpack("<HH", f.read(4))
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else \
+                np.lib.format.read_array_header_2_0
+            shape, fortran_order, dtype = read_header(f)
+            arrays[info.filename[:-len(".npy")]] = np.memmap(
+                path, dtype=dtype, mode="r", shape=shape, offset=f.tell(), order="F" if fortran_order else "C"
+            )
+    return arrays
+
+class CompactForest:
+    """
+    A fitted RandomForestClassifier flattened into a few numpy arrays.
+
+    All trees share one node table; leaves point at themselves, so walking
+    every tree for every row is `max_depth` vectorized steps with no Python
+    per-node work and none of sklearn's per-call validation and dispatch.
+    Gives the same probabilities as `predict_proba`.
+    """
+
+    def __init__(self, feature, threshold, children, proba, roots, depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children  # (nodes, 2): left, right
+        self.proba = proba        # (nodes, classes), leaf class distribution
+        self.roots = roots
+        self.depth = int(depth)
+        self.classes_ = np.asarray(classes)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        features, thresholds, children, probas, roots = [], [], [], [], []
+        offset, depth = 0, 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            ids = np.arange(n) + offset
+            leaf = tree.children_left < 0
+            left = np.where(leaf, ids, tree.children_left + offset)
+            right = np.where(leaf, ids, tree.children_right + offset)
+            value = tree.value[:, 0, :]
+            features.append(np.where(leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(np.where(leaf, np.inf, tree.threshold))
+            children.append(np.stack([left, right], axis=1).astype(np.int32))
+            probas.append(value / value.sum(axis=1, keepdims=True))
+            roots.append(offset)
+            offset += n
+            depth = max(depth, tree.max_depth)
+        return cls(
+            np.concatenate(features), np.concatenate(thresholds), np.concatenate(children),
+            np.concatenate(probas), np.array(roots, dtype=np.int32), depth, forest.classes_,
+        )
+
+    def save(self, path):
+        # Uncompressed so load() can memory-map it
+        np.savez(path, feature=self.feature, threshold=self.threshold, children=self.children,
+                 proba=self.proba, roots=self.roots, depth=np.array(self.depth), classes=self.classes_)
+
+    @classmethod
+    def load(cls, path):
+        arrays = _mmap_npz(path)
+        return cls(arrays["feature"], arrays["threshold"], arrays["children"], arrays["proba"],
+                   arrays["roots"], arrays["depth"], arrays["classes"])
+
+    def predict_proba(self, X):
+        # sklearn compares float32 features against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        rows = np.arange(len(X))
+        nodes = np.repeat(self.roots[:, None], len(X), axis=1)  # (trees, rows)
+        for _ in range(self.depth):
+            go_right = X[rows, self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[nodes, go_right.astype(np.intp)]
+        return self.proba[nodes].mean(axis=0)
+
+class JudgmentService:
+    """
+    Serves the nervousness judgment model (training/training.py).
+
+    The model is loaded once per worker process. The compact export is
+    memory-mapped, so workers share its pages through the page cache; the
+    sklearn forest is unpickled into each worker's own memory. Concurrent requests are gathered for up to
+    `window_ms` (or `max_batch` rows) and scored with one `predict_proba`
+    call on a background thread; each caller gets a Future for its row.
+    """
+
+    def __init__(self, model_path=JUDGMENT_MODEL_PATH, compact_path=JUDGMENT_COMPACT_PATH,
+                 backend=JUDGMENT_BACKEND, window_ms=JUDGMENT_BATCH_WINDOW_MS, max_batch=JUDGMENT_MAX_BATCH):
+        self.model_path = model_path
+        self.compact_path = compact_path
+        self.backend = backend
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.model = None
+        self.loaded_backend = None
+        self._load_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._queue = []  # (row, future, submitted_at)
+        self._thread = None
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._stats = {"requests": 0, "batches": 0, "rows": 0, "failed": 0}
+
+    def available(self):
+        return self.model is not None or os.path.exists(self.model_path) or os.path.exists(self.compact_path)
+
+    def load(self):
+        """Loads the model (idempotent). Call at worker startup to keep it off the first request."""
+        with self._load_lock:
+            if self.model is not None:
+                return self.model
+            if self.backend != "sklearn" and self.compact_path and os.path.exists(self.compact_path):
+                self.model = CompactForest.load(self.compact_path)
+                self.loaded_backend = "compact"
+            else:
+                import joblib
+                forest = joblib.load(self.model_path)
+                forest.set_params(n_jobs=1)  # batches are small; thread fan-out costs more than it saves
+                if self.backend == "sklearn":
+                    self.model = forest
+                    self.loaded_backend = "sklearn"
+                else:
+                    self.model = self._export(forest)
+                    self.loaded_backend = "compact"
+            print(f"🧠 Judgment model loaded ({self.loaded_backend})")
+            return self.model
+
+    def _export(self, forest):
+        # Written once, atomically since workers may race, then mapped like any
+        # other export. Without a writable path this worker keeps its own copy.
+        compact = CompactForest.from_sklearn(forest)
+        if not self.compact_path:
+            return compact
+        tmp_path = f"{self.compact_path}.{os.getpid()}.tmp.npz"
+        try:
+            compact.save(tmp_path)
+            os.replace(tmp_path, self.compact_path)
+        except OSError as e:
+            print(f"⚠️ Could not write '{self.compact_path}': {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return compact
+        return CompactForest.load(self.compact_path)
+
+    def submit(self, features):
+        """
+        Queues one feature row (dict keyed by FEATURES, or a 3-sequence).
+        Returns: Future resolving to the nervous-class probability.
+        """
+        row = [float(features[name]) for name in FEATURES] if isinstance(features, dict) else \
+            [float(v) for v in features]
+        if len(row) != len(FEATURES):
+            raise ValueError(f"expected {len(FEATURES)} features: {', '.join(FEATURES)}")
+        self.load()
+        future = Future()
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="judgment-batcher", daemon=True)
+                self._thread.start()
+            self._queue.append((row, future, time.perf_counter()))
+            self._stats["requests"] += 1
+            self._cond.notify()
+        return future
+
+    def predict(self, features, timeout=5.0):
+        return self.submit(features).result(timeout)
+
+    async def predict_async(self, features):
+        return await asyncio.wrap_future(self.submit(features))
+
+    def predict_batch(self, rows):
+        """Direct scoring of a ready-made batch (scripts, bulk jobs). Returns: nervous probabilities."""
+        X = np.asarray(rows, dtype=np.float32)
+        return self._nervous(self._predict_proba(X))
+
+    def stats(self):
+        with self._cond:
+            latencies = sorted(self._latencies)
+            batches = self._stats["batches"]
+            return {
+                **self._stats,
+                "backend": self.loaded_backend,
+                "mean_batch": round(self._stats["rows"] / batches, 2) if batches else 0.0,
+                "latency_p50_ms": round(latencies[len(latencies) // 2] * 1000, 3) if latencies else None,
+                "latency_p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 3) if latencies else None,
+            }
+
+    def _predict_proba(self, X):
+        if self.loaded_backend == "sklearn":
+            # forest.predict_proba minus its per-call validation and joblib dispatch;
+            # columns are always in FEATURES order
+            X = np.ascontiguousarray(X, dtype=np.float32)
+            return np.mean([tree.predict_proba(X, check_input=False) for tree in self.model.estimators_], axis=0)
+        return self.model.predict_proba(X)
+
+    def _nervous(self, proba):
+        # Column of class 1 ("is_nervous_label" == 1)
+        classes = list(self.model.classes_)
+        return proba[:, classes.index(1)] if 1 in classes else proba[:, -1]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                # First row starts the window; wait for more until it closes or the batch is full
+                deadline = self._queue[0][2] + self.window
+                while len(self._queue) < self.max_batch:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                probs = self.predict_batch([row for row, _, _ in batch])
+            except Exception as e:
+                with self._cond:
+                    self._stats["failed"] += len(batch)
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            done = time.perf_counter()
+            with self._cond:
+                self._stats["batches"] += 1
+                self._stats["rows"] += len(batch)
+                self._latencies.extend(done - submitted for _, _, submitted in batch)
+            for (_, future, _), prob in zip(batch, probs):
+                future.set_result(float(prob))
+
+# Singleton instance for import
+judgment_service = JudgmentService()
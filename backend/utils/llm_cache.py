@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+# --- CONFIGURATION ---
+# Seconds a cached completion stays valid, per endpoint. 0 disables caching.
+DEFAULT_TTLS = {
+    "initiate": 6 * 3600,
+    "next_question": 600,
+    "submit": 3600,
+    "turn": 600,
+    "session_review": 3600,
+    "resume_score": 24 * 3600,
+    "ollama": 3600,
+}
+DEFAULT_TTL = 3600
+
+class LLMCache:
+    """
+    Content-addressed cache for LLM completions.
+
+    Keys are a SHA-256 of (model, exact prompt, response_format), so the
+    same request from any route hits the same entry. A bounded in-memory LRU
+    sits in front of an optional SQLite file that survives restarts.
+    """
+
+    def __init__(self, max_entries=512, ttls=None, disk_path=None):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self._memory = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._endpoint_stats = {}
+        self._db = None
+        if disk_path:
+            self._open_disk(disk_path)
+
+    @classmethod
+    def from_env(cls):
+        ttls = {}
+        for endpoint in DEFAULT_TTLS:
+            value = os.getenv(f"LLM_CACHE_TTL_{endpoint.upper()}")
+            if value is not None:
+                ttls[endpoint] = float(value)
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+            ttls=ttls,
+            disk_path=os.getenv("LLM_CACHE_PATH") or None,
+        )
+
+    @staticmethod
+    def make_key(model, prompt, response_format=None):
+        # The exact prompt: it embeds user content (answers, code, resumes),
+        # where indentation and line breaks change the meaning
+        raw = json.dumps(
+            {"model": model, "prompt": prompt, "format": response_format},
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, endpoint):
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    def get(self, key, endpoint="default"):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count(endpoint, "hits")
+                    return value
+                del self._memory[key]
+
+            row = self._disk_get(key, now)
+            if row is not None:
+                value, expires_at = row
+                self._remember(key, value, expires_at)
+                self._count(endpoint, "hits")
+                self._stats["disk_hits"] += 1
+                return value
+
+            self._count(endpoint, "misses")
+            return None
+
+    def set(self, key, value, endpoint="default"):
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or value is None:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at),
+                )
+                self._db.commit()
+
+    def stats(self):
+        with self._lock:
+            total = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._memory),
+                "hit_rate": (self._stats["hits"] / total) if total else 0.0,
+                "endpoints": {k: dict(v) for k, v in self._endpoint_stats.items()},
+            }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+
+    # --- internal helpers (caller holds the lock) ---
+
+    def _count(self, endpoint, field):
+        self._stats[field] += 1
+        counters = self._endpoint_stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+        counters[field] += 1
+
+    def _remember(self, key, value, expires_at):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _open_disk(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        self._db.commit()
+
+    def _disk_get(self, key, now):
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at <= now:
+            self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._db.commit()
+            return None
+        return value, expires_at
+
+# Singleton instance for import
+llm_cache = LLMCache.from_env()
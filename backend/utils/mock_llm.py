@@ -0,0 +1,227 @@
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import httpx
+
+# --- CONFIGURATION ---
+# Latency spec: "fixed:<ms>", "uniform:<lo_ms>,<hi_ms>" or "lognormal:<median_ms>,<sigma>"
+MOCK_LLM_LATENCY = os.getenv("MOCK_LLM_LATENCY", "lognormal:800,0.4")
+MOCK_LLM_SEED = int(os.getenv("MOCK_LLM_SEED", "0"))
+
+TOPICS = [
+    "Hash Maps", "Binary Search", "Sliding Window", "Graph Traversal", "Caching",
+    "Concurrency", "REST API Design", "Database Indexing", "Dynamic Programming",
+    "System Design", "Testing Strategy", "Memory Management",
+]
+
+class LatencyModel:
+    """Deterministic latency draws: the same prompt always waits the same time."""
+
+    def __init__(self, spec=MOCK_LLM_LATENCY, seed=MOCK_LLM_SEED):
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",") if p]
+        self.seed = seed
+
+    def sample(self, prompt):
+        rng = random.Random(_digest(prompt) ^ self.seed)
+        if self.kind == "fixed":
+            ms = self.params[0]
+        elif self.kind == "uniform":
+            ms = rng.uniform(self.params[0], self.params[1])
+        elif self.kind == "lognormal":
+            median, sigma = self.params
+            ms = rng.lognormvariate(0.0, sigma) * median
+        else:
+            raise ValueError(f"Unknown latency spec: {self.kind}")
+        return ms / 1000.0
+
+def canned_response(prompt):
+    """
+    Picks a canned JSON (or plain text) answer matching the shape the prompt asks for.
+    Values are derived from the prompt hash so they vary but stay reproducible.
+    """
+    rng = random.Random(_digest(prompt))
+    topic = rng.choice(TOPICS)
+    question = {
+        "title": f"{topic} #{rng.randint(1, 999)}",
+        "description": f"Explain how you would apply {topic.lower()} in a production system.",
+        "input_format": "N/A",
+        "output_format": "N/A",
+    }
+    verbal_review = {
+        "technical_accuracy": rng.choice(["High", "Medium", "Low"]),
+        "clarity_score": rng.randint(4, 10),
+        "confidence_score": rng.randint(4, 10),
+        "feedback": "Clear structure; add a concrete example next time.",
+    }
+    code_review = {
+        "correctness": rng.choice(["Yes", "Partial", "No"]),
+        "time_complexity": rng.choice(["O(n)", "O(n log n)", "O(n^2)"]),
+        "rating": str(rng.randint(4, 10)),
+        "feedback": "Logic is sound; handle empty input.",
+    }
+
+    if '"reviews"' in prompt:
+        turns = max(prompt.count("TURN "), 1)
+        body = {
+            "reviews": [verbal_review if i % 2 else code_review for i in range(turns)],
+            "overall": {"score": rng.randint(40, 95), "summary": "Solid fundamentals overall."},
+        }
+    elif '"next_question"' in prompt:
+        review = verbal_review if "Transcript" in prompt else code_review
+        body = {"review": review, "next_question": question}
+    elif '"clarity_score"' in prompt:
+        body = verbal_review
+    elif '"correctness"' in prompt:
+        body = code_review
+    elif '"improvement_tips"' in prompt:
+        body = {"score": rng.randint(40, 95), "improvement_tips": ["Quantify impact"], "summary": "Reasonable fit."}
+    elif '"missing_keywords"' in prompt:
+        body = {
+            "score": rng.randint(40, 95), "missing_keywords": [topic], "strengths": ["Python"],
+            "weaknesses": ["Cloud"], "summary": "Reasonable fit.",
+        }
+    elif '"clarity"' in prompt:
+        body = {"clarity": rng.randint(40, 95), "confidence": rng.randint(40, 95),
+                "feedback": "Good answer.", "suggestions": ["Be concise"]}
+    elif '"questions"' in prompt:
+        body = {"questions": [
+            {**question, "title": f"{rng.choice(TOPICS)} #{rng.randint(1, 999)}",
+             "description": f"Walk through {rng.choice(TOPICS).lower()} trade-offs for case {rng.randint(1, 10**6)}."}
+            for _ in range(10)
+        ]}
+    elif '"title"' in prompt:
+        body = question
+    else:
+        return question["description"]
+    return json.dumps(body)
+
+# --- Mistral SDK stand-in (`utils.ai_client.client`) ---
+
+MOCK_MISTRAL_URL = "https://api.mistral.ai/v1/chat/completions"
+
+class LoopBoundTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps a mock transport so it fails like a real connection pool when
+    reused from another event loop: httpx/httpcore connections belong to the
+    loop that opened them, and using them from a later loop raises
+    "Event loop is closed". Keeps mocked runs honest about client lifecycle.
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.loop = None
+
+    async def handle_async_request(self, request):
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            if self.loop.is_closed():
+                raise RuntimeError("Event loop is closed")
+            raise RuntimeError("Transport is bound to a different event loop")
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+def _chat_payload(prompt):
+    return {"choices": [{"index": 0, "message": {"role": "assistant", "content": canned_response(prompt)}}]}
+
+def mock_mistral_transport(latency=None, sync=False):
+    """
+    httpx transport that answers chat completions like the Mistral API.
+    `sync=True` builds the one for an `httpx.Client` (blocking sleep).
+    """
+    latency = latency or LatencyModel()
+
+    if sync:
+        def handler(request):
+            prompt = json.loads(request.content)["messages"][-1]["content"]
+            time.sleep(latency.sample(prompt))
+            return httpx.Response(200, json=_chat_payload(prompt))
+        return httpx.MockTransport(handler)
+
+    async def async_handler(request):
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        await asyncio.sleep(latency.sample(prompt))
+        return httpx.Response(200, json=_chat_payload(prompt))
+
+    return LoopBoundTransport(httpx.MockTransport(async_handler))
+
+class _Obj:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+def _completion(response):
+    response.raise_for_status()
+    content = response.json()["choices"][0]["message"]["content"]
+    return _Obj(choices=[_Obj(message=_Obj(content=content))])
+
+def _stream_events(content):
+    for i in range(0, len(content), 8):
+        yield _Obj(data=_Obj(choices=[_Obj(delta=_Obj(content=content[i:i + 8]))]))
+
+class _MockChat:
+    def __init__(self, sdk):
+        self.sdk = sdk
+
+    def complete(self, model, messages, **kwargs):
+        response = self.sdk.client.post(MOCK_MISTRAL_URL, json={"model": model, "messages": messages})
+        return _completion(response)
+
+    async def complete_async(self, model, messages, **kwargs):
+        response = await self.sdk.async_client.post(MOCK_MISTRAL_URL, json={"model": model, "messages": messages})
+        return _completion(response)
+
+    def stream(self, model, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        content = canned_response(prompt)
+        delay = self.sdk.latency.sample(prompt) / max(len(content) / 8, 1)
+        for event in _stream_events(content):
+            time.sleep(delay)
+            yield event
+
+class MockMistral:
+    """
+    Drop-in for `mistralai.Mistral` exposing `chat.complete`, `complete_async`
+    and `stream`. Like the SDK, it holds one `httpx.Client` and one
+    `httpx.AsyncClient` for its lifetime (or uses the `client` /
+    `async_client` passed in), so requests go through real httpx clients
+    over a mock transport, and the async one is bound to its first event loop.
+    """
+
+    def __init__(self, latency=None, client=None, async_client=None, **kwargs):
+        self.latency = latency or LatencyModel()
+        self.client = client or httpx.Client(transport=mock_mistral_transport(self.latency, sync=True))
+        self.async_client = async_client or httpx.AsyncClient(transport=mock_mistral_transport(self.latency))
+        self.chat = _MockChat(self)
+
+# --- Ollama stand-in (transport for `OllamaClient`) ---
+
+def mock_ollama_transport(latency=None):
+    """
+    httpx transport that answers `/api/generate` like a local Ollama server,
+    so OllamaClient keeps its real pooling, semaphore and cache code paths.
+    """
+    latency = latency or LatencyModel()
+
+    async def handler(request):
+        payload = json.loads(request.content)
+        prompt = payload["prompt"]
+        await asyncio.sleep(latency.sample(prompt))
+        content = canned_response(prompt)
+        if not payload.get("stream"):
+            return httpx.Response(200, json={"response": content, "done": True})
+        lines = [json.dumps({"response": content[i:i + 8], "done": False}) for i in range(0, len(content), 8)]
+        lines.append(json.dumps({"response": "", "done": True}))
+        return httpx.Response(200, text="\n".join(lines) + "\n")
+
+    return httpx.MockTransport(handler)
+
+def _digest(text):
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "big")
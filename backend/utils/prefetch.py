@@ -0,0 +1,81 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# --- CONFIGURATION ---
+PREFETCH_TTL = float(os.getenv("PREFETCH_TTL", "300"))
+PREFETCH_WORKERS = int(os.getenv("PREFETCH_WORKERS", "4"))
+PREFETCH_MAX_SLOTS = int(os.getenv("PREFETCH_MAX_SLOTS", "1000"))
+
+class QuestionPrefetcher:
+    """
+    Generates the next interview question in the background while the
+    candidate is still reading feedback.
+
+    Each session owns one slot holding the in-flight (or finished) future
+    for exactly one prompt. A later `take()` with the same prompt (or the
+    same `match` text it was started with) gets that future; anything else,
+    or an expired slot, is a miss.
+    """
+
+    def __init__(self, ttl=PREFETCH_TTL, max_workers=PREFETCH_WORKERS, max_slots=PREFETCH_MAX_SLOTS):
+        self.ttl = ttl
+        self.max_slots = max_slots
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._slots = {}  # session_key -> (prompt_key, future, expires_at)
+        self._lock = threading.Lock()
+        self._stats = {"started": 0, "hits": 0, "misses": 0, "expired": 0}
+
+    @staticmethod
+    def prompt_key(prompt):
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def start(self, session_key, prompt, fn, match=None):
+        """
+        Runs `fn(prompt)` in the background and parks the future in the session's slot.
+        `match` is what `take()` compares against, when that is not the prompt itself.
+        """
+        prompt_key = self.prompt_key(prompt if match is None else match)
+        now = time.time()
+        with self._lock:
+            slot = self._slots.get(session_key)
+            if slot and slot[0] == prompt_key and slot[2] > now:
+                return  # already prefetching this exact question
+            self._purge(now)
+            future = self._executor.submit(fn, prompt)
+            self._slots[session_key] = (prompt_key, future, now + self.ttl)
+            self._stats["started"] += 1
+
+    def take(self, session_key, match):
+        """Pops the session's slot. Returns the future on a hit, None on a miss."""
+        prompt_key = self.prompt_key(match)
+        with self._lock:
+            slot = self._slots.pop(session_key, None)
+            if slot is None or slot[0] != prompt_key:
+                self._stats["misses"] += 1
+                return None
+            if slot[2] <= time.time():
+                slot[1].cancel()
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            return slot[1]
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "slots": len(self._slots)}
+
+    def _purge(self, now):
+        # Caller holds the lock
+        for key in [k for k, slot in self._slots.items() if slot[2] <= now]:
+            self._slots.pop(key)[1].cancel()
+            self._stats["expired"] += 1
+        while len(self._slots) >= self.max_slots:
+            oldest = min(self._slots, key=lambda k: self._slots[k][2])
+            self._slots.pop(oldest)[1].cancel()
+
+# Singleton instance for import
+question_prefetcher = QuestionPrefetcher()
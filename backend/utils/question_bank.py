@@ -0,0 +1,180 @@
+import os
+import re
+import json
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# --- CONFIGURATION ---
+QUESTION_BANK_PATH = os.getenv(
+    "QUESTION_BANK_PATH", os.path.join(os.path.dirname(os.path.dirname(__file__)), "question_bank.db")
+)
+# Jaccard similarity (word 3-gram shingles) above which two questions count as the same
+DUPLICATE_THRESHOLD = float(os.getenv("QUESTION_DUPLICATE_THRESHOLD", "0.5"))
+MAX_TRACKED_SESSIONS = 5000
+SHINGLE_SIZE = 3
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+def normalize(value):
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
+
+def shingles(text):
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def difficulty_from_intensity(intensity):
+    """Maps the 1-5 `intensity` slider from /initiate onto a bank difficulty."""
+    try:
+        intensity = int(intensity)
+    except (TypeError, ValueError):
+        return None
+    if intensity <= 2:
+        return "easy"
+    return "medium" if intensity == 3 else "hard"
+
+class QuestionBank:
+    """
+    Pre-generated questions indexed by (role, experience, focus, difficulty).
+
+    The whole bank is loaded into memory at startup, so a draw is a dict lookup
+    plus a similarity check. SQLite is only the persistent store that the
+    offline generator (scripts/build_question_bank.py) fills.
+    Each session remembers what it has been served so near-duplicates
+    (by n-gram Jaccard similarity) are never repeated.
+    """
+
+    def __init__(self, path=QUESTION_BANK_PATH, threshold=DUPLICATE_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._buckets = {}  # (role, experience, focus, difficulty) -> [(question, shingles)]
+        self._seen = OrderedDict()  # session_key -> [shingle sets]
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "inserted": 0, "duplicates": 0}
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, role TEXT NOT NULL, experience TEXT NOT NULL, "
+            "focus TEXT NOT NULL, difficulty TEXT NOT NULL, body TEXT NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_questions_bucket "
+            "ON questions (role, experience, focus, difficulty)"
+        )
+        self._db.commit()
+        self._load()
+
+    def _load(self):
+        rows = self._db.execute("SELECT role, experience, focus, difficulty, body FROM questions").fetchall()
+        for role, experience, focus, difficulty, body in rows:
+            question = json.loads(body)
+            self._buckets.setdefault((role, experience, focus, difficulty), []).append(
+                (question, shingles(_question_text(question)))
+            )
+
+    @staticmethod
+    def bucket_key(role, experience, focus, difficulty):
+        return (normalize(role), normalize(experience), normalize(focus), normalize(difficulty))
+
+    def add(self, question, role, experience, focus, difficulty="medium"):
+        """Stores a question unless a near-duplicate already exists in its bucket."""
+        key = self.bucket_key(role, experience, focus, difficulty)
+        signature = shingles(_question_text(question))
+        with self._lock:
+            bucket = self._buckets.setdefault(key, [])
+            if any(jaccard(signature, other) >= self.threshold for _, other in bucket):
+                self._stats["duplicates"] += 1
+                return False
+            bucket.append((question, signature))
+            self._db.execute(
+                "INSERT INTO questions (role, experience, focus, difficulty, body) VALUES (?, ?, ?, ?, ?)",
+                (*key, json.dumps(question)),
+            )
+            self._db.commit()
+            self._stats["inserted"] += 1
+            return True
+
+    def draw(self, role, experience, focus, difficulty=None, session_key=None, exclude=()):
+        """
+        Returns an unseen question for the bucket, or None when it has run dry.
+        `difficulty=None` accepts any difficulty. `exclude` holds titles (e.g.
+        the current question) the session must not get again.
+        """
+        candidates = self._candidates(role, experience, focus, difficulty)
+        random.shuffle(candidates)
+        with self._lock:
+            match = self._first_unseen(candidates, session_key, exclude)
+            if match is None:
+                self._stats["misses"] += 1
+                return None
+            question, signature = match
+            self._stats["hits"] += 1
+            if session_key:
+                self._remember(session_key, signature)
+            return dict(question)
+
+    def has_unseen(self, role, experience, focus, difficulty=None, session_key=None, exclude=()):
+        candidates = self._candidates(role, experience, focus, difficulty)
+        with self._lock:
+            return self._first_unseen(candidates, session_key, exclude) is not None
+
+    def mark_seen(self, session_key, question):
+        """Records a question the session got from elsewhere (e.g. the LLM fallback)."""
+        if session_key:
+            with self._lock:
+                self._remember(session_key, shingles(_question_text(question)))
+
+    def size(self, role=None, experience=None, focus=None, difficulty=None):
+        if role is None:
+            return sum(len(b) for b in self._buckets.values())
+        return len(self._candidates(role, experience, focus, difficulty))
+
+    def stats(self):
+        with self._lock:
+            return {**self._stats, "questions": self.size(), "buckets": len(self._buckets)}
+
+    def _candidates(self, role, experience, focus, difficulty):
+        levels = [difficulty] if difficulty else DIFFICULTIES
+        candidates = []
+        for level in levels:
+            candidates.extend(self._buckets.get(self.bucket_key(role, experience, focus, level), []))
+        return candidates
+
+    def _first_unseen(self, candidates, session_key, exclude):
+        # Caller holds the lock
+        seen = self._seen.get(session_key, []) if session_key else []
+        excluded_titles = {normalize(text) for text in exclude if text}
+        excluded = [shingles(text) for text in exclude if text]
+        for question, signature in candidates:
+            if normalize(question.get("title")) in excluded_titles:
+                continue
+            # Titles are short, so they are matched by containment rather than Jaccard
+            if any(other and len(other & signature) / len(other) >= self.threshold for other in excluded):
+                continue
+            if any(jaccard(signature, other) >= self.threshold for other in seen):
+                continue
+            return question, signature
+        return None
+
+    def _remember(self, session_key, signature):
+        # Caller holds the lock
+        self._seen.setdefault(session_key, []).append(signature)
+        self._seen.move_to_end(session_key)
+        while len(self._seen) > MAX_TRACKED_SESSIONS:
+            self._seen.popitem(last=False)
+
+def _question_text(question):
+    if isinstance(question, str):
+        return question
+    return f"{question.get('title', '')} {question.get('description', '')}"
+
+# Singleton instance for import
+question_bank = QuestionBank()
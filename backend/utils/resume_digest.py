@@ -0,0 +1,216 @@
+import os
+import re
+import math
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.ats_scorer import split_sections, tokenize, STOPWORDS
+
+# --- CONFIGURATION ---
+# Token budget of the digest sent with opening / ATS prompts, and of the
+# shorter one sent with every follow-up question
+RESUME_DIGEST_TOKENS = int(os.getenv("RESUME_DIGEST_TOKENS", "450"))
+RESUME_FOLLOWUP_TOKENS = int(os.getenv("RESUME_FOLLOWUP_TOKENS", "220"))
+RESUME_DIGEST_CACHE_SIZE = int(os.getenv("RESUME_DIGEST_CACHE_SIZE", "2048"))
+
+# Rough size of one token for Mistral / Llama style tokenizers on English text
+CHARS_PER_TOKEN = 4
+MAX_LINE_TOKENS = 60
+NEAR_DUPLICATE = 0.8
+
+# Sections in priority order with their share of the budget; unused budget
+# rolls over to the next section
+SECTION_SHARES = (
+    ("skills", 0.2),
+    ("experience", 0.45),
+    ("projects", 0.15),
+    ("summary", 0.1),
+    ("certifications", 0.05),
+    ("education", 0.05),
+)
+
+# Page furniture and stock phrases carry nothing to ask about
+BOILERPLATE_RE = re.compile(
+    r"^(?:page \d+(?: of \d+)?|resume|curriculum vitae|cv|references? (?:available )?(?:up)?on request)$",
+    re.IGNORECASE,
+)
+# Contact details are stripped from whatever line they sit on
+CONTACT_RE = re.compile(
+    r"\S+@\S+\.\S+|(?:https?://|www\.)\S+|\b(?:linkedin|github)\.com\S*|\+?\d[\d\s().-]{7,}\d",
+    re.IGNORECASE,
+)
+BULLET_RE = re.compile(r"^[\s•·\-*–—▪●○◦>]+")
+SKILL_SPLIT_RE = re.compile(r"[,;|•·/]|\s{2,}")
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def _key(line):
+    return " ".join(tokenize(line))
+
+def _clean_lines(text):
+    lines = []
+    for raw in text.splitlines():
+        line = " ".join(CONTACT_RE.sub(" ", BULLET_RE.sub("", raw)).split()).strip(" |,·")
+        if len(line) < 3 or BOILERPLATE_RE.match(line):
+            continue
+        lines.append(line)
+    return lines
+
+def _skills(body):
+    """Skill items, deduplicated case-insensitively, in resume order."""
+    seen, items = set(), []
+    for line in body.splitlines():
+        # "Languages: Python, Java" -> the label is not a skill
+        if ":" in line:
+            line = line.split(":", 1)[1]
+        for item in SKILL_SPLIT_RE.split(line):
+            item = item.strip(" .")
+            key = item.lower()
+            if 1 < len(item) <= 40 and key not in seen:
+                seen.add(key)
+                items.append(item)
+    return items
+
+def _line_weight(line, skill_keys):
+    tokens = tokenize(line)
+    content = [t for t in tokens if t not in STOPWORDS]
+    weight = len(set(content) & skill_keys) * 2
+    weight += 2 if any(ch.isdigit() for ch in line) else 0  # metrics, years, scale
+    weight += min(len(content), 12) / 6  # prefer substance over fragments
+    return weight
+
+def _clip_tokens(line, limit):
+    max_chars = limit * CHARS_PER_TOKEN
+    return line if len(line) <= max_chars else line[:max_chars - 3].rsplit(" ", 1)[0] + "..."
+
+def _select(lines, budget, skill_keys, kept_keys):
+    """
+    Highest-weight lines that fit `budget`, skipping (near-)duplicates of
+    anything already kept, returned in resume order.
+    """
+    ranked = sorted(range(len(lines)), key=lambda i: -_line_weight(lines[i], skill_keys))
+    chosen, used = [], 0
+    for i in ranked:
+        line = _clip_tokens(lines[i], MAX_LINE_TOKENS)
+        key = _key(line)
+        if not key or key in kept_keys or _near_duplicate(key, kept_keys):
+            continue
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            continue
+        chosen.append((i, line))
+        kept_keys.add(key)
+        used += cost
+    return [line for _, line in sorted(chosen)], used
+
+def _near_duplicate(key, kept_keys):
+    words = set(key.split())
+    for other in kept_keys:
+        other_words = set(other.split())
+        union = words | other_words
+        if union and len(words & other_words) / len(union) >= NEAR_DUPLICATE:
+            return True
+    return False
+
+def condense(text, budget=RESUME_DIGEST_TOKENS):
+    """
+    Token-budgeted digest of a resume: boilerplate and contact details dropped,
+    sections detected, skills deduplicated, and the most informative lines of
+    each section kept (skills and experience first). The digest is itself
+    resume-shaped, so condensing it again to a smaller budget works.
+    """
+    text = text or ""
+    if estimate_tokens(text) <= budget and not CONTACT_RE.search(text):
+        return text.strip()
+
+    sections = split_sections("\n".join(_clean_lines(text)))
+    header = sections.pop("header", "")
+    if not sections:
+        # No recognizable headings: treat the whole body as experience
+        sections = {"experience": header}
+
+    skills = _skills(sections.get("skills", ""))
+    skill_keys = {t for item in skills for t in tokenize(item)}
+    kept_keys = set()
+    parts, carry = [], 0.0
+
+    for name, share in SECTION_SHARES:
+        body = sections.get(name)
+        allowance = budget * share + carry
+        if not body:
+            carry = allowance
+            continue
+        heading = name.capitalize()
+        allowance -= estimate_tokens(heading) + 1
+        if name == "skills":
+            line, used = "", 0
+            for item in skills:
+                candidate = f"{line}, {item}" if line else item
+                if estimate_tokens(candidate) > allowance:
+                    break
+                line, used = candidate, estimate_tokens(candidate)
+            lines = [line] if line else []
+        else:
+            lines, used = _select(body.splitlines(), allowance, skill_keys, kept_keys)
+        if lines:
+            parts.append(heading + "\n" + "\n".join(f"- {l}" if name != "skills" else l for l in lines))
+        carry = max(allowance - used, 0.0)
+
+    return "\n".join(parts)
+
+class ResumeDigestCache:
+    """
+    Digests keyed by a hash of the resume text and budget, so a resume is
+    condensed once (at upload) and every later prompt reuses the result.
+    A digest also maps to itself: condensing it again is a cache hit.
+    """
+
+    def __init__(self, max_entries=RESUME_DIGEST_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "tokens_in": 0, "tokens_out": 0}
+
+    @staticmethod
+    def make_key(text, budget):
+        return hashlib.sha256(f"{budget}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get(self, text, budget=RESUME_DIGEST_TOKENS):
+        if not text:
+            return ""
+        key = self.make_key(text, budget)
+        with self._lock:
+            digest = self._entries.get(key)
+            if digest is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return digest
+            self._stats["misses"] += 1
+
+        digest = condense(text, budget)
+        with self._lock:
+            self._stats["tokens_in"] += estimate_tokens(text)
+            self._stats["tokens_out"] += estimate_tokens(digest)
+            self._remember(key, digest)
+            self._remember(self.make_key(digest, budget), digest)
+        return digest
+
+    def stats(self):
+        with self._lock:
+            saved = self._stats["tokens_in"] - self._stats["tokens_out"]
+            return {**self._stats, "entries": len(self._entries), "tokens_saved": saved}
+
+    def _remember(self, key, digest):
+        # Caller holds the lock
+        self._entries[key] = digest
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+# Singleton instance for import
+resume_digest_cache = ResumeDigestCache()
+
+def condense_resume(text, budget=RESUME_DIGEST_TOKENS):
+    """Cached `condense`; use this from routes."""
+    return resume_digest_cache.get(text, budget)
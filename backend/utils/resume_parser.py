@@ -1,27 +1,90 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
 from PyPDF2 import PdfReader
 # import docx # Uncomment if supporting .docx
 
-def extract_text_from_file(file_path):
+# Documents shorter than this are always parsed in-process
+PARALLEL_MIN_PAGES = 8
+PAGES_PER_TASK = 2
+
+_pool = None
+_pool_workers = 0
+
+def extract_text_from_file(file_path, max_chars=None, workers=None):
     """
     Detects file extension and extracts text accordingly.
     """
     _, file_extension = os.path.splitext(file_path)
-    
+
     if file_extension.lower() == '.pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, max_chars=max_chars, workers=workers)
     # elif file_extension.lower() == '.docx':
     #     return extract_text_from_docx(file_path)
     else:
         return "Unsupported file format"
 
-def extract_text_from_pdf(pdf_path):
-    text = ""
+def extract_text_from_pdf(pdf_path, max_chars=None, workers=None):
+    """
+    Extracts text page by page and stops as soon as `max_chars` is reached,
+    so pages past the budget are never parsed.
+    With `workers` > 1, long documents are split across a process pool.
+    """
     try:
         reader = PdfReader(pdf_path)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+        num_pages = len(reader.pages)
+        if workers and workers > 1 and num_pages >= PARALLEL_MIN_PAGES:
+            pages = _extract_pages_parallel(pdf_path, num_pages, max_chars, workers)
+        else:
+            pages = _extract_pages(reader, 0, num_pages, max_chars)
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return ""
-    return text
\ No newline at end of file
+
+    text = "".join(page + "\n" for page in pages)
+    return text[:max_chars] if max_chars else text
+
+def _extract_pages(reader, start, end, max_chars=None):
+    pages = []
+    total = 0
+    for i in range(start, end):
+        page_text = reader.pages[i].extract_text() or ""
+        pages.append(page_text)
+        total += len(page_text) + 1
+        if max_chars and total >= max_chars:
+            break
+    return pages
+
+def _extract_page_range(pdf_path, start, end):
+    # Runs in a worker process, so it opens its own reader
+    return _extract_pages(PdfReader(pdf_path), start, end)
+
+def _get_pool(workers):
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = ProcessPoolExecutor(max_workers=workers)
+        _pool_workers = workers
+    return _pool
+
+def _extract_pages_parallel(pdf_path, num_pages, max_chars, workers):
+    pool = _get_pool(workers)
+    futures = [
+        pool.submit(_extract_page_range, pdf_path, start, min(start + PAGES_PER_TASK, num_pages))
+        for start in range(0, num_pages, PAGES_PER_TASK)
+    ]
+
+    pages = []
+    total = 0
+    try:
+        # Collect in page order; once the budget is met, queued ranges are dropped
+        for future in futures:
+            for page_text in future.result():
+                pages.append(page_text)
+                total += len(page_text) + 1
+            if max_chars and total >= max_chars:
+                break
+    finally:
+        for future in futures:
+            future.cancel()
+    return pages
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from utils.resume_parser import extract_text_from_file
+from utils.ai_client import chat_complete, chat_complete_async
+from utils.ats_scorer import extract_job_terms, lexical_response, needs_llm, prescore
+from utils.resume_digest import condense_resume
+
+# --- CONFIGURATION ---
+# Extraction only guards against runaway files: the whole resume is returned
+# and lexically scored; prompts get a budgeted slice of it
+RESUME_MAX_CHARS = int(os.getenv('RESUME_MAX_CHARS', '100000'))
+# Hard cap on the resume text in the score prompt. Prompts get the digest
+# (utils/resume_digest.py) of the full extracted text, which RESUME_DIGEST_TOKENS
+# already keeps under this
+RESUME_CHAR_BUDGET = 3000
+# Bulk mode: extraction processes and simultaneous LLM calls
+BULK_EXTRACT_WORKERS = int(os.getenv('BULK_EXTRACT_WORKERS', str(os.cpu_count() or 1)))
+BULK_LLM_CONCURRENCY = int(os.getenv('BULK_LLM_CONCURRENCY', '8'))
+
+def build_score_prompt(resume_text, job_desc):
+    return f"""
+        Act as an ATS. Resume Text: "{condense_resume(resume_text)[:RESUME_CHAR_BUDGET]}". Job: "{job_desc}".
+        Return JSON: {{ "score": 85, "improvement_tips": ["Tip 1"], "summary": "Short summary" }}
+        """
+
+def parse_score(content):
+    content = content.replace('```json', '').replace('```', '')
+    return json.loads(content)
+
+def merge_prescore(response, pre):
+    # The score prompt does not ask for keywords: fill them from the exact lexical match
+    response.setdefault("missing_keywords", pre["missing_keywords"])
+    response["lexical_score"] = pre["score"]
+    response["source"] = "llm"
+    return response
+
+async def score_resume_text(resume_text, job_desc, job_terms=None):
+    """
+    Lexical pre-score first; the model is only asked when the pre-score
+    lands in the ambiguous band (see utils/ats_scorer.py).
+    """
+    pre = prescore(resume_text, job_desc, job_terms)
+    if not needs_llm(pre):
+        return lexical_response(pre)
+    content = await chat_complete_async(build_score_prompt(resume_text, job_desc), endpoint='resume_score')
+    return merge_prescore(parse_score(content), pre)
+
+def _extract(path):
+    # Runs in an extraction worker
+    return extract_text_from_file(path, max_chars=RESUME_MAX_CHARS)
+
+def score_resumes(paths, job_desc, extract_workers=BULK_EXTRACT_WORKERS, concurrency=BULK_LLM_CONCURRENCY,
+                  names=None):
+    """
+    Scores many resumes against one job description.
+
+    Text extraction (CPU-bound) runs in a process pool; each extracted resume
+    is pre-scored lexically and, only when that is ambiguous, scored on a
+    thread pool capped at `concurrency` LLM calls.
+    Yields one result dict per resume as soon as it finishes (completion
+    order, not input order). `names` labels results (defaults to basenames).
+    """
+    names = names or [os.path.basename(path) for path in paths]
+    job_terms = extract_job_terms(job_desc)  # once for the whole batch
+    results = queue.Queue()
+
+    def score(name, started, text):
+        try:
+            if not text.strip():
+                raise ValueError("no extractable text")
+            pre = prescore(text, job_desc, job_terms)
+            if needs_llm(pre):
+                content = chat_complete(build_score_prompt(text, job_desc), endpoint='resume_score')
+                response = merge_prescore(parse_score(content), pre)
+            else:
+                response = lexical_response(pre)
+            result = {"file": name, **response}
+        except Exception as e:
+            result = {"file": name, "error": str(e)}
+        result["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+        results.put(result)
+
+    with ProcessPoolExecutor(max_workers=extract_workers) as extractors, \
+            ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bulk-score") as scorers:
+
+        def extracted(name, started, future):
+            if future.exception() is not None:
+                results.put({"file": name, "error": str(future.exception()),
+                             "elapsed_ms": round((time.perf_counter() - started) * 1000)})
+            else:
+                scorers.submit(score, name, started, future.result())
+
+        for name, path in zip(names, paths):
+            started = time.perf_counter()
+            extractors.submit(_extract, path).add_done_callback(
+                lambda future, name=name, started=started: extracted(name, started, future)
+            )
+
+        for _ in range(len(paths)):
+            yield results.get()
+
+class Throughput:
+    """Resumes-per-minute counter for bulk runs."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.done = 0
+        self.failed = 0
+        self.llm_calls = 0
+
+    def add(self, result):
+        self.done += 1
+        self.failed += "error" in result
+        self.llm_calls += result.get("source") == "llm"
+
+    def per_minute(self):
+        elapsed = time.perf_counter() - self.started
+        return self.done / elapsed * 60 if elapsed else 0.0
+
+    def summary(self):
+        return {"resumes": self.done, "failed": self.failed, "llm_calls": self.llm_calls,
+                "elapsed_s": round(time.perf_counter() - self.started, 1),
+                "resumes_per_minute": round(self.per_minute(), 1)}
@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# --- CONFIGURATION ---
+# Unset keeps sessions in memory only; a path persists them in SQLite
+SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "")
+SESSION_TTL = float(os.getenv("SESSION_TTL", "7200"))
+SESSION_MAX_IN_MEMORY = int(os.getenv("SESSION_MAX_IN_MEMORY", "5000"))
+# Turns kept verbatim in prompts; older ones are folded into the summary
+SESSION_RECENT_TURNS = int(os.getenv("SESSION_RECENT_TURNS", "3"))
+SESSION_SUMMARY_LINES = int(os.getenv("SESSION_SUMMARY_LINES", "8"))
+
+CONFIG_KEYS = ("role", "experience", "focus", "intensity", "difficulty", "resume_context")
+QUESTION_CHARS = 160
+ANSWER_CHARS = 400
+DIGEST_CHARS = 90
+
+def compact_turn(question, answer, verdict=None):
+    turn = {"q": _clip(question, QUESTION_CHARS), "a": _clip(answer, ANSWER_CHARS)}
+    if verdict:
+        turn["v"] = verdict
+    return turn
+
+def digest(turn):
+    """One summary line for a folded turn."""
+    line = f"- {_clip(turn['q'], DIGEST_CHARS)}"
+    return f"{line} ({turn['v']})" if turn.get("v") else line
+
+def fold(summary, recent, recent_turns=SESSION_RECENT_TURNS, summary_lines=SESSION_SUMMARY_LINES):
+    """
+    Moves turns beyond the newest `recent_turns` into the rolling summary.
+    The summary keeps `summary_lines` digests plus a count of older turns,
+    so its size is bounded however long the interview runs.
+    """
+    while len(recent) > recent_turns:
+        summary["lines"].append(digest(recent.pop(0)))
+    while len(summary["lines"]) > summary_lines:
+        summary["lines"].pop(0)
+        summary["dropped"] += 1
+
+def render_context(summary, recent):
+    if not summary["lines"] and not recent:
+        return ""
+    parts = []
+    if summary["lines"]:
+        header = "Earlier questions"
+        if summary["dropped"]:
+            header += f" (plus {summary['dropped']} older ones)"
+        parts.append(header + ":\n" + "\n".join(summary["lines"]))
+    if recent:
+        parts.append("Most recent turns:\n" + "\n".join(f"Q: {t['q']}\nA: {t['a']}" for t in recent))
+    return "\n".join(parts)
+
+def render_history(history, recent_turns=SESSION_RECENT_TURNS, summary_lines=SESSION_SUMMARY_LINES):
+    """Bounded prompt context for a raw `[{'q', 'a'}, ...]` history list."""
+    summary = {"lines": [], "dropped": 0}
+    recent = [compact_turn(h.get("q", ""), h.get("a", "")) for h in history]
+    fold(summary, recent, recent_turns, summary_lines)
+    return render_context(summary, recent)
+
+def _clip(text, limit):
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+class MemorySessionBackend:
+    """No persistence; sessions live only in the SessionStore's memory tier."""
+
+    def load(self, session_id):
+        return None
+
+    def save(self, session_id, session):
+        pass
+
+    def delete(self, session_id):
+        pass
+
+class SQLiteSessionBackend:
+    """Sessions as JSON rows, so they survive restarts and are shared by workers on one host."""
+
+    def __init__(self, path):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, body TEXT NOT NULL, updated REAL NOT NULL)"
+        )
+        self._db.commit()
+        self._lock = threading.Lock()
+
+    def load(self, session_id):
+        with self._lock:
+            row = self._db.execute("SELECT body FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, session_id, session):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (id, body, updated) VALUES (?, ?, ?)",
+                (session_id, json.dumps(session), session["updated"]),
+            )
+            self._db.commit()
+
+    def delete(self, session_id):
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            self._db.commit()
+
+class SessionStore:
+    """
+    Server-side interview sessions.
+
+    Holds each session's config (role, experience, focus, resume_context...)
+    so clients only send `session_id`, plus its turns in compact form: the
+    newest few verbatim and a rolling summary of the rest. Prompts built from
+    `context()` therefore stay the same size on turn 20 as on turn 2.
+    A bounded in-memory LRU sits in front of the (pluggable) backend.
+    """
+
+    def __init__(self, backend=None, ttl=SESSION_TTL, max_in_memory=SESSION_MAX_IN_MEMORY,
+                 recent_turns=SESSION_RECENT_TURNS, summary_lines=SESSION_SUMMARY_LINES):
+        self.backend = backend or MemorySessionBackend()
+        self.ttl = ttl
+        self.max_in_memory = max_in_memory
+        self.recent_turns = recent_turns
+        self.summary_lines = summary_lines
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        backend = SQLiteSessionBackend(SESSION_STORE_PATH) if SESSION_STORE_PATH else None
+        return cls(backend=backend)
+
+    def start(self, data):
+        """Creates (or re-configures) the session for an /initiate payload. Returns its id."""
+        session_id = data.get("session_id") or uuid.uuid4().hex
+        config = {key: data[key] for key in CONFIG_KEYS if data.get(key) is not None}
+        with self._lock:
+            session = self._get(session_id)
+            if session is None:
+                session = {"config": {}, "summary": {"lines": [], "dropped": 0}, "recent": [],
+                           "turns": 0, "current_question": ""}
+            session["config"].update(config)
+            self._put(session_id, session)
+        return session_id
+
+    def resolve(self, data):
+        """
+        Request payload merged over the stored session config, so clients can
+        send just `session_id` (plus what changed) after /initiate.
+        """
+        data = dict(data or {})
+        session_id = data.get("session_id")
+        if not session_id:
+            return data
+        with self._lock:
+            session = self._get(session_id)
+            if session is None:
+                return data
+            merged = {**session["config"], **{k: v for k, v in data.items() if v is not None}}
+            if session["current_question"]:
+                merged.setdefault("current_question", session["current_question"])
+                merged.setdefault("question_title", session["current_question"])
+            merged["history_context"] = render_context(session["summary"], session["recent"])
+        return merged
+
+    def set_current_question(self, session_id, question):
+        self._update(session_id, lambda s: s.update(current_question=question or ""))
+
+    def add_turn(self, session_id, question, answer):
+        def apply(session):
+            session["recent"].append(compact_turn(question, answer))
+            session["turns"] += 1
+            fold(session["summary"], session["recent"], self.recent_turns, self.summary_lines)
+        self._update(session_id, apply)
+
+    def set_verdict(self, session_id, question, verdict):
+        """Attaches the review outcome to the turn for `question` (shown in its summary digest)."""
+        key = _clip(question, QUESTION_CHARS)
+        def apply(session):
+            for turn in reversed(session["recent"]):
+                if turn["q"] == key:
+                    turn["v"] = _clip(verdict, 40)
+                    break
+        self._update(session_id, apply)
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._get(session_id)
+            return json.loads(json.dumps(session)) if session else None
+
+    def stats(self):
+        with self._lock:
+            return {"sessions_in_memory": len(self._sessions), "backend": type(self.backend).__name__}
+
+    def _update(self, session_id, apply):
+        if not session_id:
+            return
+        with self._lock:
+            session = self._get(session_id)
+            if session is not None:
+                apply(session)
+                self._put(session_id, session)
+
+    def _get(self, session_id):
+        # Caller holds the lock
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self.backend.load(session_id)
+        if session is None:
+            return None
+        if session["updated"] + self.ttl <= time.time():
+            self._sessions.pop(session_id, None)
+            self.backend.delete(session_id)
+            return None
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _put(self, session_id, session):
+        # Caller holds the lock
+        session["updated"] = time.time()
+        self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_in_memory:
+            self._sessions.popitem(last=False)
+        self.backend.save(session_id, session)
+
+# Singleton instance for import
+session_store = SessionStore.from_env()
@@ -0,0 +1,131 @@
+import os
+import hmac
+import time
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+from pymongo import ASCENDING, MongoClient
+from pymongo.errors import DuplicateKeyError
+
+# --- CONFIGURATION ---
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+MONGO_MAX_IDLE_MS = int(os.getenv("MONGO_MAX_IDLE_MS", "60000"))
+# Fail fast instead of queueing forever when every pooled connection is busy
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+# Login only needs these two fields
+LOGIN_PROJECTION = {"_id": 0, "email": 1, "password": 1}
+# The login cache holds an HMAC of the stored password under this
+# per-process key, never the password itself
+_VERIFIER_KEY = secrets.token_bytes(32)
+
+def password_verifier(password):
+    return hmac.new(_VERIFIER_KEY, (password or "").encode("utf-8"), hashlib.sha256).digest()
+
+def pool_options():
+    return {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+    }
+
+def connect(uri):
+    """MongoClient with the tuned pool; `mongomock://` gives the in-memory stand-in."""
+    if uri and uri.startswith("mongomock://"):
+        import mongomock
+        return mongomock.MongoClient()
+    return MongoClient(uri, **pool_options())
+
+class _UserCache:
+    """Bounded LRU of login verifiers with a short TTL."""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # email -> (verifier, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, email):
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None or entry[1] <= time.time():
+                self._entries.pop(email, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(email)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, email, verifier):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[email] = (verifier, time.time() + self.ttl)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email):
+        with self._lock:
+            self._entries.pop(email, None)
+
+    def stats(self):
+        with self._lock:
+            return {"cache_entries": len(self._entries), "cache_hits": self.hits, "cache_misses": self.misses}
+
+class UserStore:
+    """
+    Data access for the `users` collection.
+
+    - A unique index on `email` turns every lookup into an index seek and
+      makes signup atomic: the insert itself rejects duplicates, so two
+      concurrent signups cannot both pass a "does it exist" check.
+    - Reads use a projection, and repeated logins are checked against a
+      bounded in-process cache of password verifiers (keyed HMACs, so no
+      credential is kept in memory past the request).
+    """
+
+    def __init__(self, collection, cache_size=USER_CACHE_SIZE, cache_ttl=USER_CACHE_TTL):
+        self.collection = collection
+        self.cache = _UserCache(cache_size, cache_ttl)
+
+    def ensure_indexes(self):
+        """Run once at startup. Fails if existing data already has duplicate emails."""
+        self.collection.create_index([("email", ASCENDING)], unique=True, name="email_unique")
+
+    def create_user(self, email, password, role="candidate"):
+        """Returns False when the email is already registered."""
+        try:
+            self.collection.insert_one({
+                "email": email,
+                "password": password, # In a real app, you should Hash this!
+                "role": role,
+                "createdAt": "today"
+            })
+        except DuplicateKeyError:
+            return False
+        self.cache.invalidate(email)
+        return True
+
+    def verify_login(self, email, password):
+        """True when `password` matches the account's; unknown emails are False."""
+        verifier = self.cache.get(email)
+        if verifier is None:
+            user = self.collection.find_one({"email": email}, LOGIN_PROJECTION)
+            if user is None:
+                return False
+            verifier = password_verifier(user.get("password"))
+            self.cache.set(email, verifier)
+        return hmac.compare_digest(verifier, password_verifier(password))
+
+    def stats(self):
+        return self.cache.stats()
@@ -0,0 +1,197 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+from emotion_detector import analyze_audio_features
+
+# --- CONFIGURATION ---
+AUDIO_WORKERS = int(os.getenv("AUDIO_WORKERS", str(os.cpu_count() or 1)))
+# Submitted but unfinished clips allowed before submit() pushes back
+AUDIO_MAX_PENDING = int(os.getenv("AUDIO_MAX_PENDING", str(4 * AUDIO_WORKERS)))
+AUDIO_TASK_TIMEOUT = float(os.getenv("AUDIO_TASK_TIMEOUT", "30"))
+LATENCY_WINDOW = 500
+
+class AudioServiceBusy(RuntimeError):
+    """Raised when the pending queue stays full for longer than the submit timeout."""
+
+def _analyze_shared(name, shape, dtype, sample_rate, pitch_backend):
+    # Runs in a worker: maps the parent's buffer instead of unpickling the samples
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        audio = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        start = time.perf_counter()
+        scores = analyze_audio_features(audio, sample_rate, pitch_backend)
+        del audio  # the view must go before the mapping can close
+        return scores, time.perf_counter() - start
+    finally:
+        block.close()
+
+class AudioAnalysisService:
+    """
+    Runs `analyze_audio_features` on a pool of worker processes so several
+    candidates' answers are analyzed in parallel, outside the web process GIL.
+
+    PCM is copied once into a `multiprocessing.shared_memory` block, and only
+    its name crosses the process boundary. At most `max_pending` clips are
+    queued or running; past that, `submit()` waits and then raises
+    AudioServiceBusy. Each result is a Future that fails with TimeoutError
+    after `timeout` seconds.
+    """
+
+    def __init__(self, workers=AUDIO_WORKERS, max_pending=AUDIO_MAX_PENDING, timeout=AUDIO_TASK_TIMEOUT,
+                 pitch_backend=None):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pitch_backend = pitch_backend
+        self._executor = None  # started on first submit
+        self._waiters = None  # threads that block on a slot for analyze()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)  # (total, compute) seconds
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "rejected": 0}
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def submit(self, audio_data, sample_rate, wait=1.0):
+        """
+        Queues one clip. Blocks up to `wait` seconds for a free slot.
+        Returns: Future resolving to the scores dict.
+        """
+        self._acquire(wait)
+        return self._start(audio_data, sample_rate)
+
+    def _acquire(self, wait):
+        if not self._slots.acquire(timeout=wait):
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise AudioServiceBusy(f"{self.max_pending} audio clips already pending")
+
+    def _start(self, audio_data, sample_rate):
+        # Caller holds a slot
+        block = None
+        try:
+            audio = np.ascontiguousarray(audio_data)
+            block = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+            np.ndarray(audio.shape, dtype=audio.dtype, buffer=block.buf)[...] = audio
+            task = self._pool().submit(
+                _analyze_shared, block.name, audio.shape, audio.dtype.str, sample_rate, self.pitch_backend
+            )
+        except Exception:
+            if block is not None:
+                block.close()
+                block.unlink()
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._pending += 1
+            self._stats["submitted"] += 1
+
+        result = Future()
+        result.set_running_or_notify_cancel()
+        submitted_at = time.perf_counter()
+        timer = threading.Timer(self.timeout, self._expire, args=(result,))
+        timer.daemon = True
+        timer.start()
+
+        def finished(task):
+            # The slot and the buffer are released only once the worker is done
+            # with them, even if the caller already got a TimeoutError
+            timer.cancel()
+            block.close()
+            block.unlink()
+            self._slots.release()
+            with self._lock:
+                self._pending -= 1
+                error = CancelledError() if task.cancelled() else task.exception()
+                if error is None:
+                    scores, compute = task.result()
+                    self._stats["completed"] += 1
+                    self._latencies.append((time.perf_counter() - submitted_at, compute))
+                else:
+                    self._stats["failed"] += 1
+            if result.done():
+                return
+            try:
+                if error is None:
+                    result.set_result(scores)
+                else:
+                    result.set_exception(error)
+            except Exception:
+                pass  # lost the race against the timeout
+
+        task.add_done_callback(finished)
+        return result
+
+    async def analyze(self, audio_data, sample_rate, wait=1.0):
+        """
+        Awaitable form of `submit` for async Flask / ASGI handlers. When every
+        slot is taken, the wait for one happens on a thread, not on the event loop.
+        """
+        if not self._slots.acquire(blocking=False):
+            acquiring = self._waiter_pool().submit(self._acquire, wait)
+            try:
+                await asyncio.wrap_future(acquiring)
+            except asyncio.CancelledError:
+                # The waiting thread cannot be interrupted: if it still gets a
+                # slot, give it back
+                acquiring.add_done_callback(self._release_unused)
+                raise
+        return await asyncio.wrap_future(self._start(audio_data, sample_rate))
+
+    def _waiter_pool(self):
+        with self._lock:
+            if self._waiters is None:
+                self._waiters = ThreadPoolExecutor(max_workers=self.max_pending, thread_name_prefix="audio-wait")
+            return self._waiters
+
+    def _release_unused(self, acquiring):
+        if not acquiring.cancelled() and acquiring.exception() is None:
+            self._slots.release()
+
+    def _expire(self, result):
+        try:
+            result.set_exception(TimeoutError(f"audio analysis exceeded {self.timeout}s"))
+        except Exception:
+            return  # already resolved
+        with self._lock:
+            self._stats["timeouts"] += 1
+
+    def stats(self):
+        with self._lock:
+            samples = list(self._latencies)
+            stats = {**self._stats, "pending": self._pending, "workers": self.workers,
+                     "max_pending": self.max_pending}
+        if samples:
+            total, compute = np.array(samples).T * 1000
+            stats.update({
+                "latency_p50_ms": round(float(np.percentile(total, 50)), 1),
+                "latency_p95_ms": round(float(np.percentile(total, 95)), 1),
+                "compute_p50_ms": round(float(np.percentile(compute, 50)), 1),
+                # Time spent waiting for a worker rather than analyzing
+                "queue_wait_p50_ms": round(float(np.percentile(total - compute, 50)), 1),
+            })
+        return stats
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            waiters, self._waiters = self._waiters, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+        if waiters is not None:
+            waiters.shutdown(wait=wait, cancel_futures=True)
+
+# Singleton instance for import
+audio_service = AudioAnalysisService()
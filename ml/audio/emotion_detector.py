@@ -1,28 +1,32 @@
+import os
 import numpy as np
 import librosa
 import soundfile as sf
 import io
 
-def analyze_audio_features(audio_data, sample_rate):
+# Pitch tracker feeding the nervousness score: "pyin" (most accurate, slowest),
+# "yin", or "autocorr" (vectorized autocorrelation over the speech range)
+PITCH_BACKEND = os.getenv("PITCH_BACKEND", "pyin")
+
+def analyze_audio_features(audio_data, sample_rate, pitch_backend=None):
     """
     Analyzes raw audio data for confidence, nervousness, and fluency
-    using the Librosa library.
+    using the Librosa library. `pitch_backend` overrides PITCH_BACKEND.
     """
     try:
+        # Frame the clip once; every score below reads the same per-frame arrays
+        features = extract_frame_features(audio_data, sample_rate, pitch_backend or PITCH_BACKEND)
+
         # 1. Confidence (from Vocal Energy)
         # We use Root-Mean-Square (RMS) energy
-        rms_energy = librosa.feature.rms(y=audio_data)[0]
-        avg_energy = np.mean(rms_energy)
+        avg_energy = np.mean(features["rms"])
         # Normalize: A simple threshold - quiet is < 0.01, loud is > 0.1
         confidence_score = (np.clip(avg_energy, 0.01, 0.1) - 0.01) / (0.1 - 0.01)
 
         # 2. Nervousness (from Pitch Variation)
-        # We use the YIN algorithm to detect pitch (f0)
-        f0, voiced_flag, voiced_probs = librosa.pyin(audio_data, fmin=librosa.note_to_hz('C2'), fmax=librosa.note_to_hz('C7'))
-        
         # Get only the pitches where the sound is "voiced"
-        voiced_f0 = f0[voiced_flag]
-        
+        voiced_f0 = features["f0"][features["voiced"]]
+
         if len(voiced_f0) > 0:
             pitch_std_dev = np.std(voiced_f0)
             # Normalize: High variation (>20) might mean nervousness/jitter
@@ -31,17 +35,13 @@ def analyze_audio_features(audio_data, sample_rate):
             nervousness_score = 0.5 # Neutral if no speech detected
 
         # 3. Fluency (from Speech-to-Silence Ratio)
-        # Split the audio into "speech" and "silence" parts
-        # top_db=30 means anything 30dB below the max is considered silence
-        clips = librosa.effects.split(audio_data, top_db=30)
-        
+        # Frames more than top_db=30 below the loudest frame count as silence,
+        # exactly as librosa.effects.split decides it
         total_samples = len(audio_data)
-        speech_samples = 0
-        for (start, end) in clips:
-            speech_samples += (end - start)
-            
+        speech_samples = speech_sample_count(features["db"] > -SILENCE_TOP_DB, total_samples)
+
         fluency_score = (speech_samples / total_samples) if total_samples > 0 else 0.0
-        
+
         # If fluency is very low, it might be an error, set neutral
         if fluency_score < 0.1:
             fluency_score = 0.5 
@@ -56,4 +56,257 @@ def analyze_audio_features(audio_data, sample_rate):
 
     except Exception as e:
         # print(f"Error in audio analysis: {e}")
-        return {"confidence": 0.5, "nervousness": 0.5, "fluency": 0.5}
\ No newline at end of file
+        return {"confidence": 0.5, "nervousness": 0.5, "fluency": 0.5}
+
+# --- STREAMING ANALYSIS (Live Sessions) ---
+# Same three scores as `analyze_audio_features`, but updated chunk by chunk
+# while the candidate is still talking. Every update costs O(chunk) and the
+# analyzer holds a fixed amount of memory however long the answer runs.
+
+FRAME_LENGTH = 2048  # librosa defaults for rms / effects.split
+HOP_LENGTH = 512
+SPEECH_FMIN = 65.0   # ~C2
+SPEECH_FMAX = 500.0  # voiced speech stays well under this
+VOICING_THRESHOLD = 0.6  # normalized autocorrelation peak needed to call a frame voiced
+YIN_VOICED_DB = 12.0
+DB_FLOOR = -100.0
+DB_BIN = 0.25
+
+def estimate_frame_pitch(frames, sample_rate, fmin=SPEECH_FMIN, fmax=SPEECH_FMAX,
+                         voicing_threshold=VOICING_THRESHOLD):
+    """
+    Vectorized autocorrelation pitch for a (n_frames, frame_length) array.
+    Returns: (f0, voiced) arrays; f0 is NaN where the frame is unvoiced.
+    """
+    n_frames, frame_length = frames.shape
+    f0 = np.full(n_frames, np.nan)
+    voiced = np.zeros(n_frames, dtype=bool)
+    if n_frames == 0:
+        return f0, voiced
+
+    centered = frames - frames.mean(axis=1, keepdims=True)
+    spectrum = np.fft.rfft(centered, n=2 * frame_length, axis=1)
+    acf = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, axis=1)[:, :frame_length]
+
+    min_lag = max(int(sample_rate / fmax), 1)
+    max_lag = min(int(sample_rate / fmin), frame_length - 2)
+    energy = acf[:, 0]
+    window = acf[:, min_lag:max_lag + 1]
+    best = np.argmax(window, axis=1)
+    peak = window[np.arange(n_frames), best]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strength = np.where(energy > 0, peak / energy, 0.0)
+    voiced = strength >= voicing_threshold
+
+    # Parabolic interpolation around the peak for sub-sample lag precision
+    lag = best + min_lag
+    left = acf[np.arange(n_frames), lag - 1]
+    right = acf[np.arange(n_frames), lag + 1]
+    denom = left - 2 * peak + right
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(denom != 0, 0.5 * (left - right) / denom, 0.0)
+    f0[voiced] = sample_rate / (lag[voiced] + np.clip(shift[voiced], -1, 1))
+    return f0, voiced
+
+# --- PITCH BACKENDS ---
+# Each backend gets the clip plus the shared frame view and per-frame dB, so
+# it only pays for what it needs on top of the common framing.
+
+def _pyin_pitch(audio_data, sample_rate, frames, db):
+    # pyin runs its own HMM framing (same center/hop layout, so frames line up)
+    f0, voiced_flag, _ = librosa.pyin(
+        audio_data, fmin=librosa.note_to_hz('C2'), fmax=librosa.note_to_hz('C7'), sr=sample_rate
+    )
+    return f0, voiced_flag
+
+def _yin_pitch(audio_data, sample_rate, frames, db):
+    # YIN has no voicing decision of its own: treat frames within YIN_VOICED_DB
+    # of the loudest frame as voiced (a looser gate lets pause onsets through
+    # and they come back as sub-harmonics)
+    f0 = librosa.yin(audio_data, fmin=SPEECH_FMIN, fmax=SPEECH_FMAX, sr=sample_rate,
+                     frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)
+    return f0, db > -YIN_VOICED_DB
+
+def _autocorr_pitch(audio_data, sample_rate, frames, db):
+    f0 = np.full(len(frames), np.nan)
+    voiced = np.zeros(len(frames), dtype=bool)
+    # Blocks bound the FFT scratch space for long answers
+    for start in range(0, len(frames), FEATURE_BLOCK):
+        stop = start + FEATURE_BLOCK
+        f0[start:stop], voiced[start:stop] = estimate_frame_pitch(frames[start:stop], sample_rate)
+    return f0, voiced
+
+PITCH_BACKENDS = {
+    "pyin": _pyin_pitch,
+    "yin": _yin_pitch,
+    "autocorr": _autocorr_pitch,
+}
+
+def estimate_pitch(audio_data, sample_rate, backend="pyin"):
+    """
+    Frame-level pitch with the chosen backend.
+    Returns: (f0, voiced) arrays of equal length.
+    """
+    features = extract_frame_features(audio_data, sample_rate, backend)
+    return features["f0"], features["voiced"]
+
+# --- SHARED FRAME FEATURES ---
+
+SILENCE_TOP_DB = 30
+FEATURE_BLOCK = 256  # frames per block for the blocked passes
+
+def frame_signal(audio_data, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH):
+    """
+    float32 frames in librosa's center=True layout, as a strided view:
+    the padded copy of the clip is the only allocation.
+    """
+    audio = np.asarray(audio_data, dtype=np.float32)
+    padded = np.pad(audio, frame_length // 2)
+    return np.lib.stride_tricks.sliding_window_view(padded, frame_length)[::hop_length]
+
+def frame_rms(frames):
+    # einsum reduces each frame in place, no squared (n_frames, frame_length) temporary
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / frames.shape[1])
+
+def frame_db(rms):
+    """Frame power in dB relative to the loudest frame (what effects.split thresholds)."""
+    power = np.maximum(np.square(rms), 1e-10)
+    return 10.0 * np.log10(power) - 10.0 * np.log10(power.max())
+
+def speech_sample_count(nonsilent, total_samples, hop_length=HOP_LENGTH):
+    """Samples covered by non-silent frames, clipped to the clip like effects.split."""
+    starts = np.flatnonzero(nonsilent) * hop_length
+    return int(np.sum(np.minimum(starts + hop_length, total_samples) - np.minimum(starts, total_samples)))
+
+def extract_frame_features(audio_data, sample_rate, pitch_backend="pyin"):
+    """
+    Frames the clip once and computes every per-frame quantity from that view.
+    Returns: dict of equal-length arrays `rms`, `db`, `f0` and `voiced`.
+    """
+    if pitch_backend not in PITCH_BACKENDS:
+        raise ValueError(f"Unknown pitch backend: {pitch_backend} (expected one of {sorted(PITCH_BACKENDS)})")
+
+    frames = frame_signal(audio_data)
+    rms = np.empty(len(frames), dtype=np.float32)
+    for start in range(0, len(frames), FEATURE_BLOCK):
+        rms[start:start + FEATURE_BLOCK] = frame_rms(frames[start:start + FEATURE_BLOCK])
+    db = frame_db(rms)
+
+    f0, voiced = PITCH_BACKENDS[pitch_backend](audio_data, sample_rate, frames, db)
+    n = min(len(rms), len(f0))
+    return {"rms": rms[:n], "db": db[:n], "f0": f0[:n], "voiced": voiced[:n]}
+
+class StreamingAudioAnalyzer:
+    """
+    Incremental confidence / nervousness / fluency for a live answer.
+
+    Feed PCM chunks (float in [-1, 1] or int16) with `push()`; read the
+    current scores at any time with `scores()`. Incoming samples go into a
+    fixed ring buffer that is cut into `frame_length` frames every
+    `hop_length` samples. Per-frame results only update running statistics:
+      - energy: running mean of frame RMS
+      - pitch: Welford mean/variance of voiced-frame f0
+      - speech ratio: a fixed dB histogram of frame RMS, so "within top_db
+        of the loudest frame" (what `librosa.effects.split` uses) can be
+        counted at any moment
+    """
+
+    def __init__(self, sample_rate, chunk_size=4096, frame_length=FRAME_LENGTH,
+                 hop_length=HOP_LENGTH, top_db=30):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.top_db = top_db
+        self._ring = np.zeros(frame_length + chunk_size, dtype=np.float32)
+        self._hist = np.zeros(int(-DB_FLOOR / DB_BIN) + 1, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        self._fill = 0
+        self._hist[:] = 0
+        self.total_samples = 0
+        self.n_frames = 0
+        self._rms_sum = 0.0
+        self._max_db = DB_FLOOR
+        self._voiced = 0
+        self._f0_mean = 0.0
+        self._f0_m2 = 0.0
+
+    def push(self, chunk):
+        """Adds a chunk of PCM samples and updates the running statistics."""
+        chunk = np.asarray(chunk)
+        if chunk.dtype == np.int16:
+            chunk = chunk.astype(np.float32) / 32768.0
+        for start in range(0, len(chunk), self.chunk_size):
+            self._push(chunk[start:start + self.chunk_size])
+
+    def _push(self, chunk):
+        n = len(chunk)
+        self._ring[self._fill:self._fill + n] = chunk
+        self._fill += n
+        self.total_samples += n
+        if self._fill < self.frame_length:
+            return
+
+        n_frames = 1 + (self._fill - self.frame_length) // self.hop_length
+        frames = np.lib.stride_tricks.sliding_window_view(
+            self._ring[:self._fill], self.frame_length
+        )[::self.hop_length][:n_frames]
+        self._update(frames)
+
+        # Keep the samples the next frame still needs at the front of the ring
+        consumed = n_frames * self.hop_length
+        leftover = self._fill - consumed
+        self._ring[:leftover] = self._ring[consumed:self._fill]
+        self._fill = leftover
+
+    def _update(self, frames):
+        rms = frame_rms(frames)
+        self.n_frames += len(rms)
+        self._rms_sum += float(rms.sum())
+
+        db = np.maximum(20.0 * np.log10(np.maximum(rms, 1e-10)), DB_FLOOR)
+        self._max_db = max(self._max_db, float(db.max()))
+        bins = np.minimum(((db - DB_FLOOR) / DB_BIN).astype(np.int64), len(self._hist) - 1)
+        np.add.at(self._hist, bins, 1)
+
+        f0, voiced = estimate_frame_pitch(frames, self.sample_rate)
+        for value in f0[voiced]:
+            # Welford update: numerically stable running variance
+            self._voiced += 1
+            delta = value - self._f0_mean
+            self._f0_mean += delta / self._voiced
+            self._f0_m2 += delta * (value - self._f0_mean)
+
+    def speech_ratio(self):
+        if self.n_frames == 0:
+            return 0.0
+        cutoff = int((self._max_db - self.top_db - DB_FLOOR) / DB_BIN) + 1
+        return float(self._hist[max(cutoff, 0):].sum() / self.n_frames)
+
+    def scores(self):
+        """Current scores, same scale and fallbacks as `analyze_audio_features`."""
+        if self.n_frames == 0:
+            return {"confidence": 0.5, "nervousness": 0.5, "fluency": 0.5}
+
+        avg_energy = self._rms_sum / self.n_frames
+        confidence_score = (np.clip(avg_energy, 0.01, 0.1) - 0.01) / (0.1 - 0.01)
+
+        if self._voiced > 0:
+            pitch_std_dev = np.sqrt(self._f0_m2 / self._voiced)
+            nervousness_score = np.clip(pitch_std_dev / 20.0, 0.0, 1.0)
+        else:
+            nervousness_score = 0.5
+
+        fluency_score = self.speech_ratio()
+        if fluency_score < 0.1:
+            fluency_score = 0.5
+            nervousness_score = 0.5
+            confidence_score = 0.5
+
+        return {
+            "confidence": float(confidence_score),
+            "nervousness": float(nervousness_score),
+            "fluency": float(fluency_score)
+        }
@@ -0,0 +1,25 @@
+import os
+import sys
+import asyncio
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audio_service import AudioAnalysisService
+
+def test_cancelled_analyze_gives_back_a_late_slot():
+    service = AudioAnalysisService(workers=1, max_pending=1)
+    service._slots.acquire()  # every slot taken
+
+    async def cancel_while_waiting():
+        task = asyncio.create_task(service.analyze([0.0], 16000, wait=5))
+        await asyncio.sleep(0.1)  # analyze() is now blocked on the waiter thread
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        service._slots.release()  # the waiter takes it after its caller is gone...
+
+    asyncio.run(cancel_while_waiting())
+    service.shutdown()  # joins the waiter thread
+    assert service._slots.acquire(blocking=False), "slot leaked"  # ...and must have handed it back
@@ -1,5 +1,6 @@
 import cv2
 import numpy as np
+from functools import lru_cache
 
 # --- Landmark constants for MediaPipe Face Mesh ---
 LEFT_EYE = [362, 382, 381, 380, 373, 374, 390, 249, 263, 466, 388, 387, 386, 385, 384, 398]
@@ -14,81 +15,258 @@ MOUTH_RIGHT = 291
 EAR_THRESHOLD = 0.2 # Eye Aspect Ratio threshold for blink
 MOUTH_OPEN_THRESHOLD = 15.0 # Threshold to detect if talking
 
-def get_head_pose(frame, landmarks):
+# --- Vectorized geometry ---
+# Every metric below reads only a handful of the 468 Face Mesh points, so each
+# frame is converted once into a compact (K, 2) array holding just those.
+# EAR uses 6 of the 16 contour points per eye:
+# [top outer, top inner, bottom outer, bottom inner, left corner, right corner]
+_EAR_SLOTS = [1, 2, 14, 13, 0, 8]
+_LEFT_EAR = [LEFT_EYE[i] for i in _EAR_SLOTS]
+_RIGHT_EAR = [RIGHT_EYE[i] for i in _EAR_SLOTS]
+_MOUTH = [MOUTH_TOP, MOUTH_BOTTOM, MOUTH_LEFT, MOUTH_RIGHT]
+# Nose tip, chin, left eye corner, right eye corner, left mouth corner, right mouth corner
+_POSE = [1, 152, 33, 263, 61, 291]
+
+FRAME_LANDMARKS = sorted(set(_LEFT_EAR + _RIGHT_EAR + _MOUTH + _POSE))
+_SLOT = {landmark: i for i, landmark in enumerate(FRAME_LANDMARKS)}
+POSE_SLOTS = np.array([_SLOT[i] for i in _POSE])
+
+# Segments measured per frame: left EAR (v1, v2, h), right EAR (v1, v2, h), mouth (v, h)
+_SEGMENTS = [
+    (_LEFT_EAR[0], _LEFT_EAR[2]), (_LEFT_EAR[1], _LEFT_EAR[3]), (_LEFT_EAR[4], _LEFT_EAR[5]),
+    (_RIGHT_EAR[0], _RIGHT_EAR[2]), (_RIGHT_EAR[1], _RIGHT_EAR[3]), (_RIGHT_EAR[4], _RIGHT_EAR[5]),
+    (MOUTH_TOP, MOUTH_BOTTOM), (MOUTH_LEFT, MOUTH_RIGHT),
+]
+_SEG_A = np.array([_SLOT[a] for a, _ in _SEGMENTS])
+_SEG_B = np.array([_SLOT[b] for _, b in _SEGMENTS])
+
+def landmarks_to_array(landmarks, w, h, indices=FRAME_LANDMARKS, with_z=False):
     """
-    Calculates the 3D head pose from 2D facial landmarks.
-    Returns: (x, y, z) rotation angles.
+    Converts Face Mesh landmarks to pixel coordinates in one pass.
+    Accepts a landmark list or a NormalizedLandmarkList (`.landmark`).
+    By default only FRAME_LANDMARKS are kept, which is what every metric in
+    this module reads; pass `indices=None` for all points.
+    Returns: (K, 2) array, or (K, 3) with `with_z` (z scaled like x).
     """
-    frame_h, frame_w, _ = frame.shape
+    if isinstance(landmarks, np.ndarray):
+        if indices is FRAME_LANDMARKS:
+            return _compact(landmarks)
+        if indices is None:
+            return landmarks
+        if landmarks.shape[-2] == len(FRAME_LANDMARKS):
+            indices = [_SLOT[i] for i in indices]
+        return landmarks[..., indices, :]
+    if hasattr(landmarks, "landmark"):
+        landmarks = landmarks.landmark
+    if indices is not None:
+        landmarks = [landmarks[i] for i in indices]
+
+    if with_z:
+        points = np.array([(p.x, p.y, p.z) for p in landmarks], dtype=np.float64)
+        points *= (w, h, w)
+    else:
+        points = np.array([(p.x, p.y) for p in landmarks], dtype=np.float64)
+        points *= (w, h)
+    return points
+
+def _compact(points):
+    # Full 468-point arrays are reduced to the FRAME_LANDMARKS layout
+    if points.shape[-2] != len(FRAME_LANDMARKS):
+        points = points[..., FRAME_LANDMARKS, :]
+    return points
+
+def segment_lengths(points):
+    """Lengths of the 8 EAR/mouth segments for a (..., K, 2) array. Returns (..., 8)."""
+    points = _compact(points)
+    d = points[..., _SEG_A, :2] - points[..., _SEG_B, :2]
+    return np.sqrt((d * d).sum(axis=-1))
+
+def eye_aspect_ratios(points):
+    """EAR for both eyes. Returns (..., 2) of [left, right]; works on one frame or a stack."""
+    lengths = segment_lengths(points)
+    return _ears(lengths)
+
+def mouth_openness(points):
+    """Mouth openness (vertical / horizontal * 100). Returns (...,)."""
+    return _mouth(segment_lengths(points))
+
+def batch_frame_metrics(points):
+    """
+    Per-frame metrics for a (frames, N, 2) landmark stack in one vectorized pass.
+    N may be the full 468-point mesh or the compact FRAME_LANDMARKS layout.
+    Returns: dict of (frames,) arrays.
+    """
+    lengths = segment_lengths(points)
+    ears = _ears(lengths)
+    mouth = _mouth(lengths)
+    avg_ear = ears.mean(axis=-1)
+    return {
+        "left_ear": ears[:, 0],
+        "right_ear": ears[:, 1],
+        "avg_ear": avg_ear,
+        "mouth_openness": mouth,
+        "is_blinking": (mouth <= MOUTH_OPEN_THRESHOLD) & (avg_ear < EAR_THRESHOLD),
+    }
+
+def _ears(lengths):
+    vertical = np.stack([lengths[..., 0] + lengths[..., 1], lengths[..., 3] + lengths[..., 4]], axis=-1)
+    horizontal = np.stack([lengths[..., 2], lengths[..., 5]], axis=-1)
+    return vertical / (2.0 * horizontal)
+
+def _mouth(lengths):
+    vert, hor = lengths[..., 6], lengths[..., 7]
+    return np.divide(vert, hor, out=np.zeros_like(vert), where=hor != 0) * 100.0
+
+# --- HEAD POSE ---
+# Standard 3D face model points
+MODEL_POINTS = np.array([
+    (0.0, 0.0, 0.0),      # Nose tip
+    (0.0, -330.0, -65.0), # Chin
+    (-225.0, 170.0, -135.0), # Left eye left corner
+    (225.0, 170.0, -135.0),  # Right eye right corner
+    (-150.0, -150.0, -125.0), # Left mouth corner
+    (150.0, -150.0, -125.0),  # Right mouth corner
+])
+DIST_COEFFS = np.zeros((4, 1), dtype=np.float64)
+
+@lru_cache(maxsize=8)
+def camera_matrix(frame_w, frame_h):
+    """Pinhole intrinsics (focal length = frame width), cached per resolution."""
     focal_length = frame_w
     center = (frame_w / 2, frame_h / 2)
-    cam_matrix = np.array([[focal_length, 0, center[0]], [0, focal_length, center[1]], [0, 0, 1]], dtype=np.float64)
-    dist_coeffs = np.zeros((4, 1), dtype=np.float64)
-
-    # Standard 3D face model points
-    model_points = np.array([
-        (0.0, 0.0, 0.0),      # Nose tip
-        (0.0, -330.0, -65.0), # Chin
-        (-225.0, 170.0, -135.0), # Left eye left corner
-        (225.0, 170.0, -135.0),  # Right eye right corner
-        (-150.0, -150.0, -125.0), # Left mouth corner
-        (150.0, -150.0, -125.0),  # Right mouth corner
-    ])
+    matrix = np.array([[focal_length, 0, center[0]], [0, focal_length, center[1]], [0, 0, 1]], dtype=np.float64)
+    matrix.flags.writeable = False
+    return matrix
 
+def _pose_image_points(landmarks, frame_w, frame_h):
     # 2D image points from MediaPipe
-    image_points = np.array([
-        (landmarks[1].x * frame_w, landmarks[1].y * frame_h),
-        (landmarks[152].x * frame_w, landmarks[152].y * frame_h),
-        (landmarks[33].x * frame_w, landmarks[33].y * frame_h),
-        (landmarks[263].x * frame_w, landmarks[263].y * frame_h),
-        (landmarks[61].x * frame_w, landmarks[61].y * frame_h),
-        (landmarks[291].x * frame_w, landmarks[291].y * frame_h),
-    ], dtype=np.float64)
+    points = _compact(landmarks_to_array(landmarks, frame_w, frame_h))
+    return np.ascontiguousarray(points[POSE_SLOTS, :2])
+
+def rotation_to_angles(rot_vec):
+    """Rodrigues rotation vector -> (x, y, z) Euler angles in degrees."""
+    rot_mat, _ = cv2.Rodrigues(rot_vec)
+    sy = np.sqrt(rot_mat[0, 0] * rot_mat[0, 0] + rot_mat[1, 0] * rot_mat[1, 0])
+    singular = sy < 1e-6
+    if not singular:
+        x = np.arctan2(rot_mat[2, 1], rot_mat[2, 2])
+        y = np.arctan2(-rot_mat[2, 0], sy)
+        z = np.arctan2(rot_mat[1, 0], rot_mat[0, 0])
+    else:
+        x = np.arctan2(-rot_mat[1, 2], rot_mat[1, 1])
+        y = np.arctan2(-rot_mat[2, 0], sy)
+        z = 0
+    return np.degrees([x, y, z])
+
+def get_head_pose(frame, landmarks):
+    """
+    Calculates the 3D head pose from 2D facial landmarks.
+    `landmarks` may be Face Mesh landmarks or a precomputed (N, 2) pixel array.
+    Stateless; for video use `HeadPoseTracker`.
+    Returns: (x, y, z) rotation angles.
+    """
+    frame_h, frame_w = frame.shape[:2]
+    image_points = _pose_image_points(landmarks, frame_w, frame_h)
 
     try:
-        _, rot_vec, _ = cv2.solvePnP(model_points, image_points, cam_matrix, dist_coeffs, flags=cv2.SOLVEPNP_ITERATIVE)
-        rot_mat, _ = cv2.Rodrigues(rot_vec)
-        sy = np.sqrt(rot_mat[0, 0] * rot_mat[0, 0] + rot_mat[1, 0] * rot_mat[1, 0])
-        singular = sy < 1e-6
-        if not singular:
-            x = np.arctan2(rot_mat[2, 1], rot_mat[2, 2])
-            y = np.arctan2(-rot_mat[2, 0], sy)
-            z = np.arctan2(rot_mat[1, 0], rot_mat[0, 0])
-        else:
-            x = np.arctan2(-rot_mat[1, 2], rot_mat[1, 1])
-            y = np.arctan2(-rot_mat[2, 0], sy)
-            z = 0
-        return np.degrees([x, y, z])
+        _, rot_vec, _ = cv2.solvePnP(MODEL_POINTS, image_points, camera_matrix(frame_w, frame_h), DIST_COEFFS, flags=cv2.SOLVEPNP_ITERATIVE)
+        return rotation_to_angles(rot_vec)
     except:
         return 0, 0, 0
 
+class HeadPoseTracker:
+    """
+    Head pose for a video stream (one tracker per session).
+
+    - Camera intrinsics are cached per resolution.
+    - solvePnP is warm-started from the previous frame's rotation and
+      translation (`useExtrinsicGuess`), so it converges in a few iterations.
+    - Angles are smoothed with an EMA, and `is_looking_at_camera` applies
+      hysteresis so the gaze flag does not flicker around the threshold.
+    """
+
+    def __init__(self, smoothing=0.5, threshold=15, hysteresis=3.0):
+        self.smoothing = smoothing
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.reset()
+
+    def reset(self):
+        """Call when the face is lost so the next frame starts cold."""
+        self._rvec = None
+        self._tvec = None
+        self.angles = None
+        self._looking = False
+
+    def update(self, frame_shape, landmarks):
+        """
+        Estimates pose for one frame. `frame_shape` is `frame.shape`.
+        Returns: smoothed (x, y, z) angles in degrees.
+        """
+        frame_h, frame_w = frame_shape[:2]
+        image_points = _pose_image_points(landmarks, frame_w, frame_h)
+        cam_matrix = camera_matrix(frame_w, frame_h)
+
+        try:
+            if self._rvec is None:
+                ok, rvec, tvec = cv2.solvePnP(MODEL_POINTS, image_points, cam_matrix, DIST_COEFFS, flags=cv2.SOLVEPNP_ITERATIVE)
+            else:
+                ok, rvec, tvec = cv2.solvePnP(
+                    MODEL_POINTS, image_points, cam_matrix, DIST_COEFFS,
+                    self._rvec, self._tvec, useExtrinsicGuess=True, flags=cv2.SOLVEPNP_ITERATIVE
+                )
+        except cv2.error:
+            ok = False
+
+        if not ok:
+            # Start the next solve cold, but report the last good estimate for this frame
+            previous = self.angles
+            self.reset()
+            return previous if previous is not None else np.zeros(3)
+
+        self._rvec, self._tvec = rvec, tvec
+        raw = rotation_to_angles(rvec)
+        if self.angles is None:
+            self.angles = raw
+        else:
+            # Blend along the shortest arc so +179 / -179 do not average to 0
+            delta = (raw - self.angles + 180.0) % 360.0 - 180.0
+            self.angles = (self.angles + self.smoothing * delta + 180.0) % 360.0 - 180.0
+        return self.angles
+
+    def is_looking_at_camera(self):
+        if self.angles is None:
+            return False
+        x_angle, y_angle = self.angles[0], self.angles[1]
+        # Once looking, stay looking until the angles clear the threshold by `hysteresis`
+        threshold = self.threshold + (self.hysteresis if self._looking else 0.0)
+        self._looking = is_looking_at_camera(x_angle, y_angle, threshold)
+        return self._looking
+
 def is_looking_at_camera(x_angle, y_angle, threshold=15):
     return abs(y_angle) < threshold and abs(x_angle) < (threshold + 5)
 
 # --- IMPROVED BLINK LOGIC (With Talking Suppression) ---
+# These accept Face Mesh landmarks or a precomputed array from
+# `landmarks_to_array`; convert once per frame and pass the array around.
 
 def get_eye_aspect_ratio(eye_landmarks, landmarks, w, h):
     """Calculates EAR for one eye."""
-    # Convert normalized landmarks to pixel coordinates
-    coords = np.array([(landmarks[i].x * w, landmarks[i].y * h) for i in eye_landmarks])
+    coords = landmarks_to_array(landmarks, w, h, [eye_landmarks[i] for i in _EAR_SLOTS])
     
     # Vertical distances
-    A = np.linalg.norm(coords[1] - coords[14]) # Top-Bottom outer
-    B = np.linalg.norm(coords[2] - coords[13]) # Top-Bottom inner
+    A = np.linalg.norm(coords[0] - coords[2]) # Top-Bottom outer
+    B = np.linalg.norm(coords[1] - coords[3]) # Top-Bottom inner
     # Horizontal distance
-    C = np.linalg.norm(coords[0] - coords[8])  # Left-Right
+    C = np.linalg.norm(coords[4] - coords[5])  # Left-Right
     
     return (A + B) / (2.0 * C)
 
 def get_mouth_openness(landmarks, w, h):
     """Calculates how open the mouth is to detect talking."""
-    top = np.array([landmarks[MOUTH_TOP].x * w, landmarks[MOUTH_TOP].y * h])
-    bottom = np.array([landmarks[MOUTH_BOTTOM].x * w, landmarks[MOUTH_BOTTOM].y * h])
-    left = np.array([landmarks[MOUTH_LEFT].x * w, landmarks[MOUTH_LEFT].y * h])
-    right = np.array([landmarks[MOUTH_RIGHT].x * w, landmarks[MOUTH_RIGHT].y * h])
-
-    vert = np.linalg.norm(top - bottom)
-    hor = np.linalg.norm(left - right)
+    mouth = landmarks_to_array(landmarks, w, h, _MOUTH)
+    vert = np.linalg.norm(mouth[0] - mouth[1])
+    hor = np.linalg.norm(mouth[2] - mouth[3])
     
     if hor == 0: return 0
     return (vert / hor) * 100.0
@@ -99,19 +277,19 @@ def is_blinking(landmarks, frame_shape):
     """
     h, w, _ = frame_shape
     try:
+        lengths = segment_lengths(landmarks_to_array(landmarks, w, h)).tolist()
+
         # 1. Check if Talking (Mouth is moving/open)
-        mouth_open_score = get_mouth_openness(landmarks, w, h)
-        
         # If mouth is open significantly, assume talking -> Don't count blinks
-        if mouth_open_score > MOUTH_OPEN_THRESHOLD:
+        if lengths[7] and lengths[6] / lengths[7] * 100.0 > MOUTH_OPEN_THRESHOLD:
             return False
 
         # 2. If NOT talking, check for blinks
-        left_ear = get_eye_aspect_ratio(LEFT_EYE, landmarks, w, h)
-        right_ear = get_eye_aspect_ratio(RIGHT_EYE, landmarks, w, h)
+        left_ear = (lengths[0] + lengths[1]) / (2.0 * lengths[2])
+        right_ear = (lengths[3] + lengths[4]) / (2.0 * lengths[5])
         avg_ear = (left_ear + right_ear) / 2.0
         
         return avg_ear < EAR_THRESHOLD
         
     except Exception:
-        return False
\ No newline at end of file
+        return False
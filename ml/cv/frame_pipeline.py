@@ -0,0 +1,156 @@
+import os
+import time
+from collections import deque
+import cv2
+import numpy as np
+
+from .eye_tracking import MOUTH_OPEN_THRESHOLD, HeadPoseTracker, batch_frame_metrics, landmarks_to_array
+from .posture_analysis import calculate_posture_score
+
+# --- CONFIGURATION ---
+# Posture changes slowly, so pose runs at most this often (seconds)
+POSTURE_INTERVAL = float(os.getenv("CV_POSTURE_INTERVAL", "0.5"))
+# Frames older than this (behind real time) are dropped instead of processed
+CV_MAX_LAG = float(os.getenv("CV_MAX_LAG", "0.25"))
+FPS_WINDOW = 2.0  # seconds of history behind `achieved_fps`
+
+class FramePipeline:
+    """
+    One pass per video frame for every CV metric (one pipeline per session).
+
+    Each frame is decoded and converted to RGB once, then shared by:
+      - Face Mesh on every frame (blinks last ~100 ms, so they need full rate)
+        -> blink, mouth openness / talking, head pose and gaze
+      - Pose at most every `posture_interval` seconds -> posture score;
+        frames in between reuse the last score
+    Frames that arrive more than `max_lag` seconds behind real time are
+    dropped before any model runs, so a slow host falls back to a lower
+    frame rate instead of an ever-growing backlog. Lag is measured against
+    the capture timestamp, so callers must pass one for this to work:
+    frames without it are stamped on arrival, never count as late, and are
+    tallied as `untimed` in `stats()`.
+
+    `face_mesh` / `pose` default to MediaPipe solutions; anything with the
+    same `.process(rgb)` interface can be passed in.
+    """
+
+    def __init__(self, face_mesh=None, pose=None, posture_interval=POSTURE_INTERVAL, max_lag=CV_MAX_LAG,
+                 head_pose=None):
+        if face_mesh is None or pose is None:
+            import mediapipe as mp
+            face_mesh = face_mesh or mp.solutions.face_mesh.FaceMesh(
+                max_num_faces=1, refine_landmarks=False, min_detection_confidence=0.5, min_tracking_confidence=0.5
+            )
+            pose = pose or mp.solutions.pose.Pose(model_complexity=0, min_detection_confidence=0.5)
+        self.face_mesh = face_mesh
+        self.pose = pose
+        self.posture_interval = posture_interval
+        self.max_lag = max_lag
+        self.head_pose = head_pose or HeadPoseTracker()
+        self.reset()
+
+    def reset(self):
+        self.head_pose.reset()
+        self._clock = None  # (wall, stream) time of the first frame
+        self._last_pose_at = None
+        self._posture = 0.5
+        self._blinking = False
+        self._recent = deque()  # wall times of processed frames
+        self._busy = 0.0
+        self._stats = {
+            "frames": 0, "processed": 0, "dropped": 0, "corrupt": 0, "untimed": 0, "face_runs": 0, "pose_runs": 0,
+            "no_face": 0, "blinks": 0, "looking": 0,
+        }
+
+    def process(self, frame, timestamp=None):
+        """
+        Runs the models on one frame: a BGR array, or encoded image bytes.
+        `timestamp` is the capture time in seconds, on the client's clock;
+        without it the frame is stamped on arrival and cannot be detected as late.
+        Returns: dict of metrics, or None when the frame was dropped or
+        could not be decoded (counted as `dropped` / `corrupt`).
+        """
+        now = time.monotonic()
+        self._stats["frames"] += 1
+        if timestamp is None:
+            self._stats["untimed"] += 1
+            timestamp = now
+        if self._clock is None:
+            self._clock = (now, timestamp)
+        elif (now - self._clock[0]) - (timestamp - self._clock[1]) > self.max_lag:
+            self._stats["dropped"] += 1
+            return None
+
+        if isinstance(frame, (bytes, bytearray, memoryview)):
+            frame = cv2.imdecode(np.frombuffer(frame, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None or frame.size == 0:
+            self._stats["corrupt"] += 1
+            return None
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb.flags.writeable = False  # lets MediaPipe skip its defensive copy
+
+        result = {"timestamp": timestamp, **self._face_metrics(rgb)}
+        result["posture_fresh"] = self._maybe_update_posture(rgb, timestamp)
+        result["posture"] = self._posture
+
+        finished = time.monotonic()
+        self._busy += finished - now
+        self._recent.append(finished)
+        while self._recent and self._recent[0] < finished - FPS_WINDOW:
+            self._recent.popleft()
+        self._stats["processed"] += 1
+        return result
+
+    def _face_metrics(self, rgb):
+        self._stats["face_runs"] += 1
+        faces = self.face_mesh.process(rgb).multi_face_landmarks
+        if not faces:
+            self._stats["no_face"] += 1
+            self.head_pose.reset()
+            self._blinking = False
+            return {"face": False, "blinking": False, "talking": False, "looking": False,
+                    "avg_ear": None, "mouth_openness": None, "head_pose": None}
+
+        # One conversion feeds blink, mouth and head pose
+        h, w = rgb.shape[:2]
+        points = landmarks_to_array(faces[0], w, h)
+        metrics = batch_frame_metrics(points[None])
+        avg_ear = float(metrics["avg_ear"][0])
+        mouth = float(metrics["mouth_openness"][0])
+        talking = mouth > MOUTH_OPEN_THRESHOLD
+        # Talking suppresses blinks, as in eye_tracking.is_blinking
+        blinking = bool(metrics["is_blinking"][0])
+        if blinking and not self._blinking:
+            self._stats["blinks"] += 1
+        self._blinking = blinking
+
+        angles = self.head_pose.update(rgb.shape, points)
+        looking = bool(self.head_pose.is_looking_at_camera())
+        self._stats["looking"] += looking
+        return {"face": True, "blinking": blinking, "talking": talking, "looking": looking,
+                "avg_ear": avg_ear, "mouth_openness": mouth, "head_pose": [float(a) for a in angles]}
+
+    def _maybe_update_posture(self, rgb, timestamp):
+        if self._last_pose_at is not None and timestamp - self._last_pose_at < self.posture_interval:
+            return False
+        self._last_pose_at = timestamp
+        self._stats["pose_runs"] += 1
+        body = self.pose.process(rgb).pose_landmarks
+        self._posture = float(calculate_posture_score(body.landmark)) if body else 0.5
+        return True
+
+    def stats(self):
+        processed = self._stats["processed"]
+        span = self._recent[-1] - self._recent[0] if len(self._recent) > 1 else 0.0
+        return {
+            **self._stats,
+            "achieved_fps": round((len(self._recent) - 1) / span, 1) if span else 0.0,
+            "drop_rate": round(self._stats["dropped"] / self._stats["frames"], 3) if self._stats["frames"] else 0.0,
+            "avg_process_ms": round(self._busy / processed * 1000, 2) if processed else 0.0,
+            "looking_ratio": round(self._stats["looking"] / processed, 3) if processed else 0.0,
+        }
+
+    def close(self):
+        for model in (self.face_mesh, self.pose):
+            if hasattr(model, "close"):
+                model.close()
@@ -1,34 +1,88 @@
-import spacy
-import PyPDF2
 import re
 import json
 import os
-from spacy.matcher import Matcher
+from functools import lru_cache
 from backend.ollama_client import generate_response # `parse_resume` needs this
+from backend.utils.resume_parser import extract_text_from_pdf as _extract_pdf_text
 
-# Load spaCy NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")
-except IOError:
-    print("Error: 'en_core_web_sm' model not found. ")
-    print("Please run: python -m spacy download en_core_web_sm")
-    nlp = None
+# --- spaCy (loaded lazily, on the first fallback parse) ---
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(__file__), "skill_taxonomy.txt")
+)
+# Only NER and sentence boundaries are used: drop the tagger/parser stack
+# (and the tok2vec only they listen to) and split sentences with the rule-based sentencizer
+SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+EDUCATION_KEYWORDS = {'university', 'college', 'msc', 'bsc'}
+# Skill names that are also ordinary English words. These, spaCy stop words
+# ("make", "less") and terms of one or two characters ("C", "R", "AI") only
+# match in their canonical casing, and only next to other skill evidence
+AMBIGUOUS_SKILLS = {
+    'go', 'rust', 'ruby', 'swift', 'julia', 'assembly', 'scheme', 'apex', 'dart', 'groovy', 'lisp',
+    'less', 'lit', 'sketch', 'remix', 'rollup', 'parcel', 'babel', 'prettier', 'bootstrap', 'recoil',
+    'express', 'spring', 'pyramid', 'tornado', 'rails', 'phoenix', 'gin', 'echo', 'fiber', 'rocket',
+    'apollo', 'rest', 'soap', 'oracle', 'chroma', 'lambda', 'aurora', 'glue', 'athena', 'render',
+    'helm', 'envoy', 'consul', 'vault', 'nomad', 'chef', 'puppet', 'packer', 'bamboo', 'flux',
+    'caddy', 'slack', 'notion', 'lean', 'nose', 'jest', 'mocha', 'chai', 'jasmine', 'karma',
+    'cucumber', 'locust', 'spark', 'hive', 'pig', 'presto', 'stitch', 'arrow', 'ray', 'dash',
+    'excel', 'amplitude', 'search', 'ranking', 'flax', 'feast', 'pillow', 'whisper', 'expo',
+    'capacitor', 'make', 'ant', 'poetry', 'unity', 'metal', 'maya', 'sanity', 'stripe', 'zephyr',
+}
+# A sentence opening with one of these ("Languages: Go, C") is skill evidence by itself
+SKILL_CONTEXT_WORDS = {'skills', 'languages', 'technologies', 'tools', 'stack', 'frameworks', 'tech'}
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+@lru_cache(maxsize=1)
+def get_nlp():
+    """Returns the trimmed spaCy pipeline, or None if the model is not installed."""
+    import spacy
+    try:
+        nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    except IOError:
+        print(f"Error: '{SPACY_MODEL}' model not found. ")
+        print(f"Please run: python -m spacy download {SPACY_MODEL}")
+        return None
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+def load_skill_taxonomy(path=SKILL_TAXONOMY_PATH):
+    """One skill per line; blank lines and '#' comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+def is_ambiguous_skill(term):
+    from spacy.lang.en.stop_words import STOP_WORDS
+    lowered = term.lower()
+    return " " not in term and (len(term) <= 2 or lowered in AMBIGUOUS_SKILLS or lowered in STOP_WORDS)
+
+@lru_cache(maxsize=1)
+def get_skill_matcher():
+    """
+    PhraseMatchers over the taxonomy, compiled once: case-insensitive for
+    distinctive terms, exact-case for ambiguous ones (see AMBIGUOUS_SKILLS).
+    Returns: (matcher, strict matcher, {lowercased term: canonical term}).
     """
-    Extract text from a PDF file.
+    from spacy.matcher import PhraseMatcher
+    nlp = get_nlp()
+    terms = load_skill_taxonomy()
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    strict = PhraseMatcher(nlp.vocab, attr="ORTH")
+    # make_doc only tokenizes, so compiling the ~1,000-term taxonomy (or a larger export) stays cheap
+    matcher.add("SKILL", [nlp.make_doc(term) for term in terms if not is_ambiguous_skill(term)])
+    strict.add("SKILL", [nlp.make_doc(term) for term in terms if is_ambiguous_skill(term)])
+    canonical = {}
+    for term in terms:
+        canonical.setdefault(term.lower(), term)
+    return matcher, strict, canonical
+
+def extract_text_from_pdf(pdf_path: str, max_chars: int = None, workers: int = None) -> str:
+    """
+    Extract text from a PDF file (shared extractor in backend/utils).
     Returns: Extracted text as a string.
     """
     if not os.path.exists(pdf_path):
         raise FileNotFoundError(f"PDF file not found at {pdf_path}")
         
-    text = ""
-    with open(pdf_path, "rb") as file:
-        reader = PyPDF2.PdfReader(file)
-        for page in reader.pages:
-            if page.extract_text():
-                text += page.extract_text()
-    return text
+    return _extract_pdf_text(pdf_path, max_chars=max_chars, workers=workers)
 
 # --- (THIS IS THE FUNCTION WE NEEDED TO ADD BACK) ---
 def parse_resume_with_spacy(text):
@@ -36,32 +90,48 @@ def parse_resume_with_spacy(text):
     Parse resume text using spaCy to extract entities.
     This is a FALLBACK for when the LLM fails.
     """
-    if not nlp:
+    if not get_nlp():
         print("spaCy model not loaded, cannot parse.")
         return {}
-        
-    doc = nlp(text)
-    skill_matcher = Matcher(nlp.vocab)
-    skill_patterns = [
-        [{'LOWER': 'python'}], [{'LOWER': 'java'}], [{'LOWER': 'javascript'}],
-        [{'LOWER': 'react'}], [{'LOWER': 'fastapi'}], [{'LOWER': 'opencv'}],
-        [{'LOWER': 'tensorflow'}], [{'LOWER': 'pytorch'}],
-        [{'LOWER': 'machine'}, {'LOWER': 'learning'}]
-    ]
-    skill_matcher.add("SKILLS", skill_patterns)
-    matches = skill_matcher(doc)
-    skills = [doc[start:end].text for match_id, start, end in matches]
-    experience = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
+
+    return _entities_from_doc(get_nlp()(text))
+
+def parse_resumes_with_spacy(texts, n_process=1, batch_size=32):
+    """
+    Batch form of `parse_resume_with_spacy` built on `nlp.pipe`.
+    `n_process` > 1 spreads the NER work over worker processes.
+    Returns: list of dicts, in input order.
+    """
+    nlp = get_nlp()
+    if not nlp:
+        print("spaCy model not loaded, cannot parse.")
+        return [{} for _ in texts]
+
+    return [_entities_from_doc(doc) for doc in nlp.pipe(texts, n_process=n_process, batch_size=batch_size)]
+
+def _entities_from_doc(doc):
+    matcher, strict, canonical = get_skill_matcher()
+    spans = matcher(doc, as_spans=True)
+    skills = {canonical.get(span.text.lower(), span.text) for span in spans}
+    # Ambiguous terms ("Go", "Spring", "C") count only in a sentence that
+    # names another skill or opens like a skills list
+    evidence = {span.sent.start for span in spans}
+    candidates = strict(doc, as_spans=True)
+    for span in candidates:
+        sent = span.sent
+        if (sent.start in evidence or sent[0].lower_ in SKILL_CONTEXT_WORDS
+                or any(other.sent.start == sent.start and other.start != span.start for other in candidates)):
+            skills.add(canonical.get(span.text.lower(), span.text))
+    experience = {ent.text for ent in doc.ents if ent.label_ == "ORG"}
     education = []
-    for token in doc:
-        if token.text.lower() in ['university', 'college', 'msc', 'bsc']:
-            if token.sent.text not in education:
-                education.append(token.sent.text)
+    for sent in doc.sents:
+        if any(token.lower_ in EDUCATION_KEYWORDS for token in sent) and sent.text not in education:
+            education.append(sent.text)
 
     return {
-        "skills": list(set(skills)),
-        "experience": list(set(experience)),
-        "education": list(set(education)),
+        "skills": list(skills),
+        "experience": list(experience),
+        "education": education,
     }
 
 def parse_resume_with_ollama(text):
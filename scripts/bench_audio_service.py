@@ -0,0 +1,66 @@
+"""
+Audio analysis throughput: in-process loop vs AudioAnalysisService.
+
+    python scripts/bench_audio_service.py --clips 32 --seconds 20 --workers 4
+
+Throughput should scale with --workers up to the number of physical cores.
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ml", "audio"))
+
+from emotion_detector import analyze_audio_features
+from audio_service import AudioAnalysisService
+
+def synthesize(seconds, sample_rate, rng):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    f0 = rng.uniform(100, 220) + rng.uniform(2, 30) * np.sin(2 * np.pi * t)
+    voice = np.sin(2 * np.pi * np.cumsum(f0) / sample_rate)
+    envelope = (np.sin(2 * np.pi * 0.5 * t) > -0.4).astype(float)
+    return (0.08 * voice * envelope + rng.normal(0, 0.002, len(t))).astype(np.float32)
+
+async def run_service(service, corpus, sample_rate):
+    return await asyncio.gather(*(service.analyze(clip, sample_rate, wait=None) for clip in corpus))
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    corpus = [synthesize(args.seconds, args.sample_rate, rng) for _ in range(args.clips)]
+    audio_seconds = args.clips * args.seconds
+
+    start = time.perf_counter()
+    serial = [analyze_audio_features(clip, args.sample_rate, args.backend) for clip in corpus]
+    serial_s = time.perf_counter() - start
+
+    service = AudioAnalysisService(workers=args.workers, max_pending=args.max_pending,
+                                   timeout=args.timeout, pitch_backend=args.backend)
+    asyncio.run(run_service(service, corpus[:args.workers], args.sample_rate))  # spin up workers
+    start = time.perf_counter()
+    pooled = asyncio.run(run_service(service, corpus, args.sample_rate))
+    pooled_s = time.perf_counter() - start
+    stats = service.stats()
+    service.shutdown()
+
+    assert pooled == serial, "pooled scores differ from the in-process scores"
+    print(f"Corpus: {args.clips} clips x {args.seconds}s, backend {args.backend}, {args.workers} workers\n")
+    print(f"{'path':<12}{'wall s':>9}{'audio s / s':>13}")
+    print(f"{'in-process':<12}{serial_s:>9.2f}{audio_seconds / serial_s:>13.1f}")
+    print(f"{'service':<12}{pooled_s:>9.2f}{audio_seconds / pooled_s:>13.1f}")
+    print(f"\nSpeedup: {serial_s / pooled_s:.2f}x")
+    print(f"Service stats: {stats}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the process-pool audio service")
+    parser.add_argument("--clips", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--backend", default="autocorr")
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
@@ -0,0 +1,93 @@
+"""
+Per-frame head-pose cost: stateless `get_head_pose` vs `HeadPoseTracker`.
+
+    python scripts/bench_head_pose.py --frames 3000
+
+Landmarks are synthesized by projecting the 3D face model along a smooth
+head-motion path (yaw swinging across the gaze threshold) plus pixel noise,
+so both paths solve exactly the same frames.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ml", "cv"))
+
+from eye_tracking import (
+    FRAME_LANDMARKS, POSE_SLOTS, MODEL_POINTS, DIST_COEFFS,
+    HeadPoseTracker, camera_matrix, get_head_pose,
+)
+
+def synthesize(frames, width, height, noise_px, seed):
+    rng = np.random.default_rng(seed)
+    cam = camera_matrix(width, height)
+    t = np.arange(frames) / 30.0
+    yaw = np.radians(18 * np.sin(2 * np.pi * 0.2 * t))
+    pitch = np.radians(6 * np.sin(2 * np.pi * 0.13 * t))
+    stack = np.zeros((frames, len(FRAME_LANDMARKS), 2))
+    for i in range(frames):
+        # Model y points up, image y points down: face the camera with a 180 deg turn about x
+        rot, _ = cv2.Rodrigues(np.array([np.pi + pitch[i], 0.0, 0.0]))
+        rot = rot @ cv2.Rodrigues(np.array([0.0, yaw[i], 0.0]))[0]
+        rvec, _ = cv2.Rodrigues(rot)
+        projected, _ = cv2.projectPoints(MODEL_POINTS, rvec, np.array([0.0, 0.0, 1500.0]), cam, DIST_COEFFS)
+        stack[i, POSE_SLOTS] = projected[:, 0, :] + rng.normal(0, noise_px, (len(POSE_SLOTS), 2))
+    return stack
+
+def flips(flags):
+    flags = np.asarray(flags, dtype=int)
+    return int(np.abs(np.diff(flags)).sum())
+
+def hysteresis_flags(yaw, threshold, margin):
+    # Same rule HeadPoseTracker.is_looking_at_camera applies, on yaw alone
+    looking, flags = False, []
+    for value in yaw:
+        looking = abs(value) < threshold + (margin if looking else 0.0)
+        flags.append(looking)
+    return flags
+
+def run(args):
+    shape = (args.height, args.width, 3)
+    frame = np.zeros(shape, dtype=np.uint8)
+    stack = synthesize(args.frames, args.width, args.height, args.noise, args.seed)
+
+    # Warm up both paths (imports, caches)
+    get_head_pose(frame, stack[0])
+    HeadPoseTracker().update(shape, stack[0])
+
+    start = time.perf_counter()
+    cold = np.array([get_head_pose(frame, points) for points in stack])
+    cold_s = time.perf_counter() - start
+
+    tracker = HeadPoseTracker(smoothing=args.smoothing)
+    tracked = []
+    start = time.perf_counter()
+    for points in stack:
+        tracked.append(tracker.update(shape, points).copy())
+    tracked_s = time.perf_counter() - start
+    tracked = np.array(tracked)
+
+    # Jitter = std of frame-to-frame yaw change; flips = yaw-gaze flag toggles
+    cold_jitter = np.std(np.diff(cold[:, 1]))
+    tracked_jitter = np.std(np.diff(tracked[:, 1]))
+    cold_flips = flips(np.abs(cold[:, 1]) < tracker.threshold)
+    tracked_flips = flips(hysteresis_flags(tracked[:, 1], tracker.threshold, tracker.hysteresis))
+
+    print(f"Frames: {args.frames} @ {args.width}x{args.height}, noise {args.noise}px\n")
+    print(f"{'path':<22}{'us/frame':>10}{'yaw jitter':>12}{'gaze flips':>12}")
+    print(f"{'get_head_pose (cold)':<22}{cold_s / args.frames * 1e6:>10.1f}{cold_jitter:>12.3f}{cold_flips:>12}")
+    print(f"{'HeadPoseTracker':<22}{tracked_s / args.frames * 1e6:>10.1f}{tracked_jitter:>12.3f}{tracked_flips:>12}")
+    print(f"\nSpeedup: {cold_s / tracked_s:.2f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark head-pose estimation per frame")
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--noise", type=float, default=1.0, help="landmark noise in pixels")
+    parser.add_argument("--smoothing", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
@@ -0,0 +1,89 @@
+"""
+Judgment model latency and throughput: per-request `predict_proba` (the
+naive way to serve it) vs the micro-batching JudgmentService, with the
+sklearn forest and with the compact export.
+
+    python scripts/bench_judgment.py --requests 2000 --clients 1 16 64
+
+Each client thread sends one feature row at a time and waits for its answer,
+like concurrent web requests do.
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+import warnings
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from utils.judgment import JUDGMENT_MODEL_PATH, CompactForest, JudgmentService
+
+def sample_rows(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(15, 60, count), rng.random(count), rng.random(count)
+    ]).astype(np.float32)
+
+def drive(score_one, rows, clients):
+    """Runs `clients` threads over `rows`; returns (requests/s, p50 ms, p95 ms)."""
+    latencies = [[] for _ in range(clients)]
+    shares = np.array_split(rows, clients)
+
+    def client(i):
+        for row in shares[i]:
+            start = time.perf_counter()
+            score_one(row)
+            latencies[i].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    merged = np.sort(np.concatenate([np.array(l) for l in latencies]))
+    return len(rows) / elapsed, merged[len(merged) // 2] * 1000, merged[int(len(merged) * 0.95)] * 1000
+
+def run(args):
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    forest = joblib.load(args.model)
+    forest.set_params(n_jobs=1)
+    compact = CompactForest.from_sklearn(forest)
+    rows = sample_rows(args.requests)
+
+    services = {}
+    for backend in ("sklearn", "compact"):
+        service = JudgmentService(model_path=args.model, compact_path="", backend=backend,
+                                  window_ms=args.window_ms, max_batch=args.max_batch)
+        service.load()
+        services[backend] = service
+
+    modes = {
+        "per-request predict_proba": lambda row: forest.predict_proba(row[None, :]),
+        "per-request compact": lambda row: compact.predict_proba(row[None, :]),
+        "batched service (sklearn)": lambda row: services["sklearn"].predict(row),
+        "batched service (compact)": lambda row: services["compact"].predict(row),
+    }
+
+    print(f"{'mode':<28}{'clients':>8}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    for clients in args.clients:
+        for name, score_one in modes.items():
+            count = min(len(rows), args.slow_requests) if name == "per-request predict_proba" else len(rows)
+            throughput, p50, p95 = drive(score_one, rows[:count], clients)
+            print(f"{name:<28}{clients:>8}{throughput:>10.0f}{p50:>9.2f}{p95:>9.2f}")
+    for backend, service in services.items():
+        print(f"{backend}: mean batch {service.stats()['mean_batch']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark judgment model serving")
+    parser.add_argument("--model", default=JUDGMENT_MODEL_PATH)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--slow-requests", type=int, default=300, help="sample size for plain predict_proba")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    run(parser.parse_args())
@@ -0,0 +1,63 @@
+"""
+Pitch backends for the nervousness score: cost per second of audio and
+agreement with the pyin baseline and with the known vibrato depth.
+
+    python scripts/bench_pitch.py --clips 12 --seconds 8
+
+The corpus is synthetic speech-like audio: a harmonic voice whose f0 wanders
+by a per-clip vibrato depth (so nervousness spans its whole 0-1 range),
+separated by pauses and mixed with background noise.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ml", "audio"))
+
+from emotion_detector import PITCH_BACKENDS, analyze_audio_features
+
+def synthesize(seconds, sample_rate, base_f0, depth, rng):
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    f0 = base_f0 + depth * np.sin(2 * np.pi * rng.uniform(0.5, 2.0) * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 5))
+    # Syllable-ish bursts: ~65% speech, rest pauses
+    envelope = (np.sin(2 * np.pi * rng.uniform(0.3, 0.8) * t + rng.uniform(0, np.pi)) > -0.5).astype(float)
+    noise = rng.normal(0, 0.003, len(t))
+    return (0.08 * voice * envelope + noise).astype(np.float32)
+
+def run(args):
+    rng = np.random.default_rng(args.seed)
+    depths = np.linspace(2, 40, args.clips)
+    corpus = [synthesize(args.seconds, args.sample_rate, rng.uniform(100, 220), depth, rng) for depth in depths]
+    # Std of a sinusoidal f0 is depth / sqrt(2); nervousness = std / 20
+    truth = np.clip(depths / np.sqrt(2) / 20.0, 0.0, 1.0)
+    audio_seconds = args.clips * args.seconds
+
+    results = {}
+    for backend in args.backends:
+        analyze_audio_features(corpus[0][:args.sample_rate], args.sample_rate, backend)  # warm up
+        start = time.perf_counter()
+        scores = [analyze_audio_features(clip, args.sample_rate, backend)["nervousness"] for clip in corpus]
+        results[backend] = (time.perf_counter() - start, np.array(scores))
+
+    base_time, base_scores = results.get("pyin", next(iter(results.values())))
+    print(f"Corpus: {args.clips} clips x {args.seconds}s @ {args.sample_rate} Hz\n")
+    print("dN = |nervousness - reference|, reference = pyin or the true vibrato depth\n")
+    print(f"{'backend':<10}{'ms / s audio':>14}{'speedup':>10}{'dN pyin':>10}{'dN truth':>10}{'max truth':>11}")
+    for backend, (elapsed, scores) in results.items():
+        vs_pyin = np.abs(scores - base_scores)
+        vs_truth = np.abs(scores - truth)
+        print(f"{backend:<10}{elapsed / audio_seconds * 1000:>14.1f}{base_time / elapsed:>9.1f}x"
+              f"{vs_pyin.mean():>10.3f}{vs_truth.mean():>10.3f}{vs_truth.max():>11.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pitch backends used for nervousness")
+    parser.add_argument("--clips", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--backends", nargs="+", default=list(PITCH_BACKENDS))
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
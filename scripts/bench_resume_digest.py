@@ -0,0 +1,93 @@
+"""
+Resume context per prompt: the old character slices vs the condensed digest.
+
+    python scripts/bench_resume_digest.py --resumes 200
+
+Synthetic resumes put contact details, education and a long summary before
+skills and experience, as many real ones do. "Coverage" is the share of the
+resume's skills and quantified achievements that reach the prompt, a proxy
+for how much the interviewer has to ask about.
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from utils.resume_digest import RESUME_DIGEST_TOKENS, RESUME_FOLLOWUP_TOKENS, ResumeDigestCache, estimate_tokens
+
+SKILLS = ["Python", "Go", "Java", "TypeScript", "SQL", "Django", "Flask", "FastAPI", "React", "Node.js",
+          "Docker", "Kubernetes", "AWS", "GCP", "Terraform", "Kafka", "Redis", "PostgreSQL", "MongoDB",
+          "Spark", "Airflow", "PyTorch", "TensorFlow", "GraphQL", "gRPC", "Jenkins", "Linux", "Elasticsearch"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Scaled", "Shipped"]
+THINGS = ["a billing service", "the search API", "an ETL pipeline", "a recommendation model",
+          "the CI/CD setup", "a real-time chat backend", "the data warehouse", "an internal CLI"]
+FILLER = ["Responsible for various tasks as assigned.", "Attended daily stand-ups and sprint meetings.",
+          "Worked closely with cross-functional stakeholders.", "Team player with a positive attitude."]
+
+def make_resume(rng):
+    skills = rng.sample(SKILLS, 12)
+    achievements = []
+    lines = ["ALEX CANDIDATE", "alex@example.com | +1 (555) 010-2030 | linkedin.com/in/alex", "Page 1 of 2",
+             "SUMMARY"]
+    lines += [f"Motivated engineer who enjoys {rng.choice(THINGS)} and continuous learning." for _ in range(4)]
+    lines += ["EDUCATION", "B.Tech Computer Science, State University, 2018",
+              "Relevant coursework: algorithms, operating systems, networks, databases, compilers"]
+    lines += ["EXPERIENCE"]
+    for job in range(4):
+        lines.append(f"Software Engineer, Company {job} (20{18 + job} - 20{19 + job})")
+        for _ in range(5):
+            line = (f"{rng.choice(VERBS)} {rng.choice(THINGS)} with {rng.choice(skills)} and "
+                    f"{rng.choice(skills)}, improving throughput by {rng.randint(10, 90)}%.")
+            achievements.append(line)
+            lines.append("• " + line)
+        lines += ["• " + rng.choice(FILLER) for _ in range(2)]
+        lines.append("• " + achievements[-1])  # copy-pasted bullet
+    lines += ["PROJECTS"] + [f"• {rng.choice(THINGS).capitalize()} in {rng.choice(skills)}" for _ in range(3)]
+    lines += ["TECHNICAL SKILLS", "Languages: " + ", ".join(skills[:6]), "Tools: " + ", ".join(skills[6:] + skills[:2])]
+    lines += ["References available upon request", "Page 2 of 2"]
+    return "\n".join(lines), skills, achievements
+
+def coverage(context, skills, achievements):
+    facts = skills + [a.split(",")[-1].strip() for a in achievements]  # "improving throughput by N%."
+    lowered = context.lower()
+    return sum(fact.lower() in lowered for fact in facts) / len(facts)
+
+def run(args):
+    rng = random.Random(args.seed)
+    resumes = [make_resume(rng) for _ in range(args.resumes)]
+    cache = ResumeDigestCache()
+
+    rows = {"opening (slice 2500)": [], "opening (digest)": [], "follow-up (slice 1000)": [], "follow-up (digest)": []}
+    start = time.perf_counter()
+    for text, skills, achievements in resumes:
+        digest = cache.get(text, RESUME_DIGEST_TOKENS)
+        followup = cache.get(digest, RESUME_FOLLOWUP_TOKENS)
+        for name, context in (("opening (slice 2500)", text[:2500]), ("opening (digest)", digest),
+                              ("follow-up (slice 1000)", text[:1000]), ("follow-up (digest)", followup)):
+            rows[name].append((estimate_tokens(context), coverage(context, skills, achievements)))
+    condense_ms = (time.perf_counter() - start) * 1000 / len(resumes)
+
+    # Every later turn re-sends the same text: all cache hits
+    start = time.perf_counter()
+    for _ in range(args.turns):
+        for text, _, _ in resumes:
+            cache.get(text, RESUME_DIGEST_TOKENS)
+    hit_us = (time.perf_counter() - start) * 1e6 / (args.turns * len(resumes))
+
+    print(f"{'context':<24}{'tokens':>8}{'coverage':>10}")
+    for name, values in rows.items():
+        tokens = sum(v[0] for v in values) / len(values)
+        cover = sum(v[1] for v in values) / len(values)
+        print(f"{name:<24}{tokens:>8.0f}{cover:>10.2f}")
+    print(f"\ncondense (miss): {condense_ms:.2f} ms/resume | cached lookup: {hit_us:.1f} us")
+    print(cache.stats())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark resume digest size and coverage")
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=10, help="later prompts per resume (cache hits)")
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
@@ -0,0 +1,71 @@
+"""
+Logins per second against a mongomock users collection: the old raw
+`find_one` path vs UserStore.verify_login (projection + bounded cache of
+password verifiers).
+
+    python scripts/bench_user_store.py --users 1000 10000 50000 --logins 5000
+
+Logins follow a Zipf-like distribution (a few accounts log in often), which
+is what makes the cache pay off. mongomock scans the collection on every
+query and ignores indexes, so the index-seek gain on a real server is not
+measured here; the baseline column shows the linear growth it removes.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import mongomock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from utils.user_store import UserStore
+
+def populate(count):
+    collection = mongomock.MongoClient().db.users
+    collection.insert_many([
+        {"email": f"user{i}@example.com", "password": "secret", "role": "candidate", "createdAt": "today"}
+        for i in range(count)
+    ])
+    return collection
+
+def login_sequence(users, logins, skew, seed):
+    rng = np.random.default_rng(seed)
+    ranks = rng.zipf(skew, logins) - 1
+    return [f"user{r % users}@example.com" for r in ranks]
+
+def rate(check, emails):
+    start = time.perf_counter()
+    for email in emails:
+        assert check(email, "secret")
+    return len(emails) / (time.perf_counter() - start)
+
+def run(args):
+    print(f"{'users':>8}{'baseline/s':>13}{'store/s':>11}{'speedup':>10}{'hit rate':>10}")
+    for users in args.users:
+        collection = populate(users)
+        emails = login_sequence(users, args.logins, args.skew, args.seed)
+        baseline_emails = emails[:args.baseline_logins]
+
+        def baseline_check(email, password):
+            user = collection.find_one({"email": email})
+            return user is not None and user["password"] == password
+
+        baseline = rate(baseline_check, baseline_emails)
+
+        store = UserStore(collection, cache_size=args.cache_size)
+        store.ensure_indexes()
+        stored = rate(store.verify_login, emails)
+        stats = store.stats()
+        hit_rate = stats["cache_hits"] / max(stats["cache_hits"] + stats["cache_misses"], 1)
+        print(f"{users:>8}{baseline:>13.0f}{stored:>11.0f}{stored / baseline:>9.1f}x{hit_rate:>10.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark login lookups on the users collection")
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--logins", type=int, default=5000)
+    parser.add_argument("--baseline-logins", type=int, default=300, help="the uncached path is slow; sample fewer")
+    parser.add_argument("--cache-size", type=int, default=10000)
+    parser.add_argument("--skew", type=float, default=1.3, help="Zipf exponent of login frequency")
+    parser.add_argument("--seed", type=int, default=0)
+    run(parser.parse_args())
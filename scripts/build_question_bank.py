@@ -0,0 +1,95 @@
+"""
+Offline batch job that fills the interview question bank.
+
+    cd backend
+    python ../scripts/build_question_bank.py --per-bucket 30 --workers 4
+
+Every (role, experience, focus, difficulty) bucket is asked for questions in
+batches until it holds --per-bucket entries. Near-duplicates are rejected by
+QuestionBank.add, so a bucket that keeps producing repeats stops after --max-rounds.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from utils.ai_client import chat_complete
+from utils.question_bank import question_bank, DIFFICULTIES
+
+ROLES = ["Software Engineer", "Frontend Developer", "Backend Developer", "Data Scientist", "DevOps Engineer"]
+EXPERIENCES = ["0-2 Years", "2-5 Years", "5+ Years"]
+FOCUSES = ["Technical", "Behavioral", "Coding"]
+
+def build_batch_prompt(role, experience, focus, difficulty, count, round_no):
+    if focus == 'Coding':
+        kind = "coding problems with clear Input/Output formats"
+        example = '{"title": "Problem Title", "description": "Problem Description...", "input_format": "e.g. n = 5", "output_format": "e.g. 120"}'
+    else:
+        kind = f"{focus.lower()} verbal interview questions"
+        example = '{"title": "Question Title", "description": "The question text...", "input_format": "N/A", "output_format": "N/A"}'
+
+    return f"""
+        Act as an Interviewer building a question bank (batch {round_no}).
+        Generate {count} DISTINCT {difficulty} {kind} for a {role} with {experience} experience.
+        Each question must test a different concept.
+
+        Return ONLY valid JSON:
+        {{ "questions": [{example}, ...] }}
+        """
+
+def fill_bucket(role, experience, focus, difficulty, per_bucket, batch_size, max_rounds):
+    added = 0
+    for round_no in range(1, max_rounds + 1):
+        missing = per_bucket - question_bank.size(role, experience, focus, difficulty)
+        if missing <= 0:
+            break
+        prompt = build_batch_prompt(role, experience, focus, difficulty, min(batch_size, missing), round_no)
+        try:
+            content = chat_complete(prompt, endpoint='question_bank')
+            content = content.replace('```json', '').replace('```', '')
+            questions = json.loads(content).get("questions", [])
+        except Exception as e:
+            print(f"❌ {role} | {experience} | {focus} | {difficulty}: {e}")
+            continue
+        added += sum(
+            question_bank.add(q, role, experience, focus, difficulty)
+            for q in questions[:missing] if isinstance(q, dict) and q.get("title")
+        )
+    print(f"✅ {role} | {experience} | {focus} | {difficulty}: +{added}")
+    return added
+
+def main(args):
+    buckets = [
+        (role, experience, focus, difficulty)
+        for role in args.roles for experience in args.experiences
+        for focus in args.focuses for difficulty in DIFFICULTIES
+    ]
+    print(f"Filling {len(buckets)} buckets to {args.per_bucket} questions each...")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        added = sum(pool.map(
+            lambda b: fill_bucket(*b, args.per_bucket, args.batch_size, args.max_rounds), buckets
+        ))
+    elapsed = time.perf_counter() - start
+
+    print(f"\nAdded {added} questions in {elapsed:.1f}s")
+    print(json.dumps(question_bank.stats(), indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate the interview question bank")
+    parser.add_argument("--per-bucket", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--max-rounds", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--roles", nargs="+", default=ROLES)
+    parser.add_argument("--experiences", nargs="+", default=EXPERIENCES)
+    parser.add_argument("--focuses", nargs="+", default=FOCUSES)
+    main(parser.parse_args())
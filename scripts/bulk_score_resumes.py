@@ -0,0 +1,79 @@
+"""
+Score a folder of resumes against one job description, streaming JSONL.
+
+    cd backend
+    python ../scripts/bulk_score_resumes.py ../resumes --job-file ../jd.txt --out ../scores.jsonl
+
+One line is appended (and flushed) per resume as it finishes, so the output
+file doubles as the progress checkpoint: re-running with the same --out skips
+every resume that already has a successful line and only retries the rest.
+"""
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from utils.resume_scoring import BULK_EXTRACT_WORKERS, BULK_LLM_CONCURRENCY, Throughput, score_resumes
+
+SUPPORTED = (".pdf",)
+PROGRESS_EVERY = 10
+
+def completed(out_path):
+    """Files that already have a successful result in the output file."""
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if "file" in row and "error" not in row:
+                done.add(row["file"])
+    return done
+
+def main(args):
+    if args.job_file:
+        with open(args.job_file, encoding="utf-8") as f:
+            job_desc = f.read().strip()
+    else:
+        job_desc = args.job_description
+
+    names = sorted(n for n in os.listdir(args.directory) if n.lower().endswith(SUPPORTED))
+    done = completed(args.out)
+    todo = [n for n in names if n not in done]
+    print(f"{len(names)} resumes, {len(done)} already scored, {len(todo)} to go")
+    if not todo:
+        return
+
+    meter = Throughput()
+    paths = [os.path.join(args.directory, n) for n in todo]
+    with open(args.out, "a", encoding="utf-8") as out:
+        for result in score_resumes(paths, job_desc, args.workers, args.concurrency, names=todo):
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            meter.add(result)
+            if "error" in result:
+                print(f"❌ {result['file']}: {result['error']}")
+            if meter.done % PROGRESS_EVERY == 0:
+                print(f"  {meter.done}/{len(todo)} ({meter.per_minute():.1f} resumes/min)")
+
+    print(json.dumps(meter.summary(), indent=2))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-score resumes against a job description")
+    parser.add_argument("directory", help="folder of resume PDFs")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--job-description", help="job description text")
+    group.add_argument("--job-file", help="file holding the job description")
+    parser.add_argument("--out", default="scores.jsonl", help="JSONL output, also the resume checkpoint")
+    parser.add_argument("--workers", type=int, default=BULK_EXTRACT_WORKERS, help="text extraction processes")
+    parser.add_argument("--concurrency", type=int, default=BULK_LLM_CONCURRENCY, help="simultaneous LLM calls")
+    main(parser.parse_args())
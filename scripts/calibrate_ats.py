@@ -0,0 +1,73 @@
+"""
+Calibrates the ATS pre-score band (ATS_AMBIGUOUS_LOW / ATS_AMBIGUOUS_HIGH)
+against LLM scores.
+
+Score a representative folder with the LLM on every resume first, so each
+line carries both scores:
+
+    cd backend
+    ATS_PRESCORE_MODE=off python ../scripts/bulk_score_resumes.py ../resumes --job-file ../jd.txt --out ../llm.jsonl
+    python ../scripts/calibrate_ats.py ../llm.jsonl --pass-mark 60 --agreement 0.95
+
+For each candidate threshold it reports how many resumes would skip the LLM
+and how often the lexical score lands on the same side of --pass-mark as the
+LLM did for them. Use the lowest HIGH / highest LOW that meet --agreement.
+"""
+import sys
+import json
+import argparse
+
+def load_pairs(path):
+    """(lexical score, LLM score) of every LLM-scored line."""
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if result.get("source") == "llm" and "lexical_score" in result and "score" in result:
+                pairs.append((float(result["lexical_score"]), float(result["score"])))
+    return pairs
+
+def agreement(pairs, pass_mark):
+    if not pairs:
+        return None
+    return sum((lexical >= pass_mark) == (llm >= pass_mark) for lexical, llm in pairs) / len(pairs)
+
+def sweep(pairs, pass_mark, thresholds, above):
+    """Rows of (threshold, share skipped, agreement, mean abs error) for one side of the band."""
+    rows = []
+    for threshold in thresholds:
+        skipped = [p for p in pairs if (p[0] > threshold if above else p[0] < threshold)]
+        error = sum(abs(lexical - llm) for lexical, llm in skipped) / len(skipped) if skipped else None
+        rows.append((threshold, len(skipped) / len(pairs), agreement(skipped, pass_mark), error))
+    return rows
+
+def run(args):
+    pairs = load_pairs(args.results)
+    if not pairs:
+        sys.exit("No LLM-scored lines with a lexical_score (run bulk scoring with ATS_PRESCORE_MODE=off).")
+    print(f"{len(pairs)} resumes, pass mark {args.pass_mark}")
+
+    picks = {}
+    for name, thresholds, above in (("HIGH", range(95, 40, -5), True), ("LOW", range(5, 60, 5), False)):
+        print(f"\n{name:<6}{'skipped':>9}{'agree':>8}{'MAE':>7}")
+        for threshold, share, agree, error in sweep(pairs, args.pass_mark, thresholds, above):
+            fmt_agree = f"{agree:.3f}" if agree is not None else "-"
+            fmt_error = f"{error:.1f}" if error is not None else "-"
+            print(f"{threshold:<6}{share:>9.1%}{fmt_agree:>8}{fmt_error:>7}")
+            if agree is not None and agree >= args.agreement:
+                picks[name] = threshold
+            else:
+                break  # a wider skip region only gets worse
+
+    low, high = picks.get("LOW", 0), picks.get("HIGH", 100)
+    print(f"\nSuggested: ATS_AMBIGUOUS_LOW={low} ATS_AMBIGUOUS_HIGH={high}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calibrate the ATS pre-score band against LLM scores")
+    parser.add_argument("results", help="bulk scoring JSONL produced with ATS_PRESCORE_MODE=off")
+    parser.add_argument("--pass-mark", type=float, default=60, help="score that counts as a match")
+    parser.add_argument("--agreement", type=float, default=0.95, help="required pass/fail agreement")
+    run(parser.parse_args())
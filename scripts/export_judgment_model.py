@@ -0,0 +1,45 @@
+"""
+Flattens backend/judgment_model.joblib into the compact numpy export the
+judgment service prefers when present (utils/judgment.py: CompactForest).
+
+    python scripts/export_judgment_model.py [--model PATH] [--output PATH]
+
+The export is checked against the forest's own predict_proba before saving.
+"""
+import os
+import sys
+import argparse
+import joblib
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from utils.judgment import JUDGMENT_COMPACT_PATH, JUDGMENT_MODEL_PATH, CompactForest
+
+def sample_rows(count, seed=0):
+    # Spans the training ranges (training/create_dataset.py)
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.integers(15, 60, count), rng.random(count), rng.random(count)
+    ]).astype(np.float32)
+
+def run(args):
+    forest = joblib.load(args.model)
+    compact = CompactForest.from_sklearn(forest)
+
+    X = sample_rows(args.check_rows)
+    error = np.abs(compact.predict_proba(X) - forest.predict_proba(X)).max()
+    if error > 1e-9:
+        sys.exit(f"Export does not match the forest (max error {error:.2e}); not saved.")
+
+    compact.save(args.output)
+    print(f"Saved {len(compact.roots)} trees / {len(compact.feature)} nodes (depth {compact.depth}) "
+          f"to '{args.output}' ({os.path.getsize(args.output) / 1e6:.2f} MB, "
+          f"joblib: {os.path.getsize(args.model) / 1e6:.2f} MB)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the judgment model for fast scoring")
+    parser.add_argument("--model", default=JUDGMENT_MODEL_PATH)
+    parser.add_argument("--output", default=JUDGMENT_COMPACT_PATH)
+    parser.add_argument("--check-rows", type=int, default=10000)
+    run(parser.parse_args())
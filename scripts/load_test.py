@@ -0,0 +1,152 @@
+"""
+End-to-end load generator for the Prep AI backend.
+
+Start the backend against the local stand-ins first, so only our own code is measured
+(needs `pip install mongomock`):
+
+    cd backend
+    LLM_BACKEND=mock MONGO_URI=mongomock:// MOCK_LLM_LATENCY=lognormal:800,0.4 python app.py
+
+Then drive it:
+
+    python scripts/load_test.py --url http://localhost:5000 --rps 20 --duration 60
+
+Each virtual candidate runs signup -> login -> initiate -> submit -> next-question -> score.
+Candidates are launched open-loop so the request rate matches --rps regardless of latency.
+"""
+import argparse
+import asyncio
+import json
+import time
+import uuid
+import httpx
+
+STEPS = ["signup", "login", "initiate", "submit", "next-question", "score"]
+
+def build_pdf(text):
+    """Tiny single-page PDF so /score exercises the real extractor."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+RESUME_PDF = build_pdf("Jane Doe - Python, Flask, MongoDB, React. Software Engineer at Acme.")
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {step: [] for step in STEPS}
+        self.errors = {step: 0 for step in STEPS}
+
+    def add(self, step, seconds, ok):
+        self.latencies[step].append(seconds)
+        if not ok:
+            self.errors[step] += 1
+
+    def report(self, wall):
+        rows = []
+        total = sum(len(v) for v in self.latencies.values())
+        total_errors = sum(self.errors.values())
+        print(f"\nWall time: {wall:.1f}s | Requests: {total} | "
+              f"Throughput: {total / wall:.1f} req/s | Errors: {total_errors} "
+              f"({(total_errors / total * 100) if total else 0:.1f}%)\n")
+        print(f"{'endpoint':<15}{'count':>7}{'err%':>7}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for step in STEPS:
+            samples = sorted(self.latencies[step])
+            if not samples:
+                continue
+            err = self.errors[step] / len(samples) * 100
+            row = {
+                "endpoint": step, "count": len(samples), "error_pct": round(err, 2),
+                "p50_ms": percentile(samples, 50) * 1000, "p90_ms": percentile(samples, 90) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000, "max_ms": samples[-1] * 1000,
+            }
+            rows.append(row)
+            print(f"{step:<15}{row['count']:>7}{err:>7.1f}{row['p50_ms']:>9.0f}"
+                  f"{row['p90_ms']:>9.0f}{row['p99_ms']:>9.0f}{row['max_ms']:>9.0f}")
+        return {"wall_s": wall, "requests": total, "rps": total / wall, "errors": total_errors, "endpoints": rows}
+
+def percentile(sorted_samples, pct):
+    index = min(int(round(pct / 100 * (len(sorted_samples) - 1))), len(sorted_samples) - 1)
+    return sorted_samples[index]
+
+async def timed(recorder, step, call):
+    start = time.perf_counter()
+    try:
+        response = await call()
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        response, ok = None, False
+    recorder.add(step, time.perf_counter() - start, ok)
+    return response if ok else None
+
+async def run_candidate(http, base, recorder):
+    email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+    creds = {"username": email, "password": "secret"}
+    config = {"role": "Backend Engineer", "experience": "2-4 Years", "focus": "Technical",
+              "resume_context": "Python, Flask, MongoDB"}
+
+    await timed(recorder, "signup", lambda: http.post(f"{base}/api/signup", json=creds))
+    await timed(recorder, "login", lambda: http.post(f"{base}/api/login", json=creds))
+
+    response = await timed(recorder, "initiate", lambda: http.post(f"{base}/api/interview/initiate", json=config))
+    title = response.json().get("title", "Opening question") if response is not None else "Opening question"
+
+    submit = {"code": "I would shard by user id and cache hot reads.", "question_title": title,
+              "mode": "verbal", "metrics": {"wpm": 130, "filler_words": 2}, **config}
+    await timed(recorder, "submit", lambda: http.post(f"{base}/api/interview/submit", json=submit))
+    await timed(recorder, "next-question", lambda: http.post(
+        f"{base}/api/interview/next-question", json={**config, "current_question": title}))
+
+    await timed(recorder, "score", lambda: http.post(
+        f"{base}/api/resume/score",
+        files={"resume": ("resume.pdf", RESUME_PDF, "application/pdf")},
+        data={"job_description": "Backend Engineer"},
+    ))
+
+async def main(args):
+    recorder = Recorder()
+    # One candidate issues len(STEPS) requests, so launch candidates at rps / len(STEPS)
+    interval = len(STEPS) / args.rps
+    limits = httpx.Limits(max_connections=args.max_connections, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as http:
+        tasks = []
+        start = time.perf_counter()
+        next_launch = start
+        while time.perf_counter() - start < args.duration:
+            tasks.append(asyncio.create_task(run_candidate(http, args.url.rstrip("/"), recorder)))
+            next_launch += interval
+            await asyncio.sleep(max(0.0, next_launch - time.perf_counter()))
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - start
+
+    summary = recorder.report(wall)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nSaved summary to {args.json}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Prep AI interview API")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--rps", type=float, default=10.0, help="target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep launching candidates")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-connections", type=int, default=200)
+    parser.add_argument("--json", help="optional path for a JSON summary")
+    asyncio.run(main(parser.parse_args()))
@@ -1,45 +1,207 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedKFold, train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 import joblib # This is for saving the model
 
-print("Loading dataset...")
 try:
-    df = pd.read_csv('fake_interview_data.csv')
-except FileNotFoundError:
-    print("Error: 'fake_interview_data.csv' not found.")
-    print("Please run 'generate_fake_data.py' first!")
-    exit()
-
-# --- 1. Define our Features (X) and Label (y) ---
-# We want to predict "is_nervous_label"
-# using *all* our features.
-features = ['avg_blinks', 'avg_audio_nervousness', 'avg_posture']
-label = 'is_nervous_label'
-
-X = df[features]
-y = df[label]
-
-# --- 2. Split the data for training and testing ---
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-print(f"Training model on {len(X_train)} samples...")
-
-# --- 3. Create and Train the Model ---
-# A RandomForest is a great "judgment" model
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
-
-# --- 4. Test the Model ---
-y_pred = model.predict(X_test)
-acc = accuracy_score(y_test, y_pred)
-print(f"Model trained! Accuracy on test data: {acc * 100:.2f}%")
-
-# --- 5. Save the Trained Model to a File ---
-# This is the "golden" file you will move to your HP laptop.
+    import resource
+except ImportError:  # Windows: memory is not recorded
+    resource = None
+
+# --- CONFIGURATION ---
+DEFAULT_DATA = 'fake_interview_data.parquet'
+LEGACY_DATA = 'fake_interview_data.csv'
 MODEL_FILE_PATH = 'judgment_model.joblib'
-joblib.dump(model, MODEL_FILE_PATH)
+RUN_LOG_PATH = 'training_runs.jsonl'
+
+# We want to predict "is_nervous_label" using *all* our features.
+FEATURES = ['avg_blinks', 'avg_audio_nervousness', 'avg_posture']
+LABEL = 'is_nervous_label'
+
+# Searched with cross-validation on a subsample (--search-rows); the winner
+# is refit on the full training split. `max_samples` bootstraps a fraction of
+# the rows per tree, which is what keeps millions of rows tractable.
+PARAM_GRID = {
+    'n_estimators': [50, 100],
+    'max_depth': [8, 16, None],
+    'min_samples_leaf': [1, 10],
+    'max_samples': [None, 0.3],
+}
+# Candidates within this CV accuracy of the best count as tied; the cheapest
+# one to fit wins, so the full-data refit stays fast
+SEARCH_TOLERANCE = 0.002
+
+def load_dataset(path):
+    """Feature matrix (float32) and labels from Parquet, or the legacy CSV."""
+    if path.endswith('.csv'):
+        df = pd.read_csv(path, usecols=FEATURES + [LABEL])
+    else:
+        df = pd.read_parquet(path, columns=FEATURES + [LABEL])
+    X = df[FEATURES].to_numpy(dtype=np.float32)
+    y = df[LABEL].to_numpy(dtype=np.int8)
+    return X, y
+
+def peak_memory_mb():
+    """Peak resident memory of this process so far."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def param_candidates(grid=PARAM_GRID):
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+
+def evaluate_candidate(params, x_path, y_path, folds, seed):
+    """
+    Runs in a search worker: cross-validates one parameter set.
+    The data is memory-mapped from disk, so workers share the page cache
+    instead of each receiving a pickled copy.
+    """
+    X = np.load(x_path, mmap_mode='r')
+    y = np.load(y_path, mmap_mode='r')
+    scores = []
+    fit_seconds = 0.0
+    for train_idx, test_idx in StratifiedKFold(folds, shuffle=True, random_state=seed).split(X, y):
+        model = RandomForestClassifier(random_state=seed, n_jobs=1, **params)
+        start = time.perf_counter()
+        model.fit(X[train_idx], y[train_idx])
+        fit_seconds += time.perf_counter() - start
+        scores.append(accuracy_score(y[test_idx], model.predict(X[test_idx])))
+    return {
+        'params': params,
+        'cv_accuracy': round(float(np.mean(scores)), 5),
+        'cv_std': round(float(np.std(scores)), 5),
+        'fit_seconds': round(fit_seconds, 2),
+        'peak_memory_mb': peak_memory_mb(),
+    }
+
+def search(X, y, folds, workers, seed, grid=PARAM_GRID):
+    """
+    Cross-validated grid search, one candidate per task in a process pool.
+    Each candidate gets a fresh spawned worker (`max_tasks_per_child=1`), so
+    its peak memory is that run's alone, not the parent's dataset. Before
+    Python 3.11 the pool cannot recycle workers; they are reused, and a
+    candidate's peak_memory_mb may include an earlier, larger run.
+    Returns: results, best first.
+    """
+    candidates = param_candidates(grid)
+    with tempfile.TemporaryDirectory(prefix='judgment_search_') as tmp:
+        x_path, y_path = os.path.join(tmp, 'X.npy'), os.path.join(tmp, 'y.npy')
+        np.save(x_path, X)
+        np.save(y_path, y)
+        results = []
+        context = multiprocessing.get_context('spawn')
+        recycle = {'max_tasks_per_child': 1} if sys.version_info >= (3, 11) else {}
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, **recycle) as pool:
+            futures = [pool.submit(evaluate_candidate, p, x_path, y_path, folds, seed) for p in candidates]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                print(f"  cv={result['cv_accuracy']:.4f}  {result['fit_seconds']:>7.1f}s  {result['params']}")
+    top = max(r['cv_accuracy'] for r in results)
+    return sorted(results, key=lambda r: (r['cv_accuracy'] < top - SEARCH_TOLERANCE, r['fit_seconds']))
+
+def log_run(record, path=RUN_LOG_PATH):
+    with open(path, 'a') as f:
+        f.write(json.dumps(record) + '\n')
+
+def main(args):
+    print("Loading dataset...")
+    data_path = args.data
+    if not os.path.exists(data_path) and os.path.exists(LEGACY_DATA):
+        data_path = LEGACY_DATA
+    if not os.path.exists(data_path):
+        print(f"Error: '{args.data}' not found.")
+        print("Please run 'create_dataset.py' first!")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    X, y = load_dataset(data_path)
+    load_seconds = time.perf_counter() - start
+    print(f"Loaded {len(X)} rows from '{data_path}' in {load_seconds:.2f}s")
+
+    # --- 1. Split the data for training and testing ---
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=args.seed, stratify=y
+    )
+
+    # --- 2. Hyperparameter search on a subsample ---
+    params = dict(n_estimators=100)
+    search_results = None
+    if args.search:
+        rows = min(args.search_rows, len(X_train))
+        if rows < len(X_train):
+            X_search, _, y_search, _ = train_test_split(
+                X_train, y_train, train_size=rows, random_state=args.seed, stratify=y_train
+            )
+        else:
+            X_search, y_search = X_train, y_train
+        print(f"Searching {len(param_candidates())} candidates x {args.folds} folds on {rows} rows "
+              f"({args.search_workers} workers)...")
+        start = time.perf_counter()
+        search_results = search(X_search, y_search, args.folds, args.search_workers, args.seed)
+        params = search_results[0]['params']
+        print(f"Best: {params} (cv={search_results[0]['cv_accuracy']:.4f}) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+    # --- 3. Create and Train the Model ---
+    # A RandomForest is a great "judgment" model; trees are built on every core
+    print(f"Training model on {len(X_train)} samples...")
+    model = RandomForestClassifier(random_state=args.seed, n_jobs=args.n_jobs, **params)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    # --- 4. Test the Model ---
+    acc = accuracy_score(y_test, model.predict(X_test))
+    print(f"Model trained in {fit_seconds:.1f}s! Accuracy on test data: {acc * 100:.2f}%")
+
+    # Single-threaded inference: the backend batches requests itself
+    model.set_params(n_jobs=1)
+
+    # --- 5. Save the Trained Model to a File ---
+    # This is the "golden" file you will move to your HP laptop.
+    joblib.dump(model, args.output)
+    print(f"Model saved successfully to '{args.output}'.")
+    print("You can now move this file to your 'backend/' folder.")
+
+    log_run({
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'data': data_path,
+        'rows': len(X),
+        'params': params,
+        'n_jobs': args.n_jobs,
+        'load_seconds': round(load_seconds, 2),
+        'fit_seconds': round(fit_seconds, 2),
+        'test_accuracy': round(acc, 5),
+        'model_mb': round(os.path.getsize(args.output) / 1e6, 2),
+        'peak_memory_mb': peak_memory_mb(),
+        'search': search_results,
+    }, args.log)
+    print(f"Run recorded in '{args.log}'.")
 
-print(f"Model saved successfully to '{MODEL_FILE_PATH}'.")
-print("You can now move this file to your 'backend/' folder.")
\ No newline at end of file
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the nervousness judgment model')
+    parser.add_argument('--data', default=DEFAULT_DATA)
+    parser.add_argument('--output', default=MODEL_FILE_PATH)
+    parser.add_argument('--log', default=RUN_LOG_PATH)
+    parser.add_argument('--n-jobs', type=int, default=-1, help='cores for the final fit (-1 = all)')
+    parser.add_argument('--search', action='store_true', help='cross-validated hyperparameter search first')
+    parser.add_argument('--search-rows', type=int, default=100_000)
+    parser.add_argument('--search-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--folds', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    main(parser.parse_args())